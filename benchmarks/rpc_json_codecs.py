@@ -0,0 +1,105 @@
+"""benchmark json codecs on synthetic rpc batch responses
+
+run with `python benchmarks/rpc_json_codecs.py`
+"""
+
+from __future__ import annotations
+
+import typing
+
+from ctc.rpc.rpc_protocols.rpc_json_codec import create_json_codec
+from ctc.rpc.rpc_protocols.rpc_json_codec import get_available_json_codecs
+
+
+def create_benchmark_payloads(
+    *, n_blocks: int = 10, n_logs: int = 1000
+) -> dict[str, typing.Any]:
+    """create batch responses resembling eth_getBlockByNumber and eth_getLogs"""
+
+    def _hex(i: int, n_bytes: int) -> str:
+        return '0x' + hex(i)[2:].rjust(n_bytes * 2, '0')[-n_bytes * 2 :]
+
+    blocks = []
+    for b in range(n_blocks):
+        number = 15_000_000 + b
+        block = {
+            'number': hex(number),
+            'hash': _hex(number * 7919, 32),
+            'parentHash': _hex((number - 1) * 7919, 32),
+            'timestamp': hex(1_650_000_000 + 12 * b),
+            'miner': _hex(number, 20),
+            'gasLimit': hex(30_000_000),
+            'gasUsed': hex(15_000_000 + b),
+            'baseFeePerGas': hex(20_000_000_000 + b),
+            'logsBloom': _hex(number, 256),
+            'transactions': [_hex(number * 1000 + t, 32) for t in range(200)],
+        }
+        blocks.append({'jsonrpc': '2.0', 'id': b, 'result': block})
+
+    logs = []
+    for i in range(n_logs):
+        log = {
+            'address': _hex(i % 50, 20),
+            'blockNumber': hex(15_000_000 + i // 100),
+            'blockHash': _hex((15_000_000 + i // 100) * 7919, 32),
+            'transactionHash': _hex(i * 31, 32),
+            'transactionIndex': hex(i % 100),
+            'logIndex': hex(i % 300),
+            'removed': False,
+            'topics': [_hex(0xDDF252AD, 32), _hex(i, 32), _hex(i + 1, 32)],
+            'data': _hex(i * 10**18, 32),
+        }
+        logs.append(log)
+
+    return {
+        'blocks': blocks,
+        'logs': {'jsonrpc': '2.0', 'id': 1, 'result': logs},
+    }
+
+
+def benchmark_json_codecs(
+    payloads: typing.Mapping[str, typing.Any] | None = None,
+    *,
+    n_repeats: int = 20,
+) -> dict[str, dict[str, dict[str, float]]]:
+    """time encoding and decoding of payloads with each installed codec
+
+    returns {codec_name: {payload_name: {'encode': s, 'decode': s}}}, with
+    the mean seconds per operation
+    """
+    import time
+
+    if payloads is None:
+        payloads = create_benchmark_payloads()
+
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for name in get_available_json_codecs():
+        codec = create_json_codec(name)
+        results[name] = {}
+        for payload_name, payload in payloads.items():
+            start = time.perf_counter()
+            for r in range(n_repeats):
+                encoded = codec.encode(payload)
+            encode_time = (time.perf_counter() - start) / n_repeats
+
+            start = time.perf_counter()
+            for r in range(n_repeats):
+                codec.decode(encoded)
+            decode_time = (time.perf_counter() - start) / n_repeats
+
+            results[name][payload_name] = {
+                'encode': encode_time,
+                'decode': decode_time,
+            }
+    return results
+
+
+if __name__ == '__main__':
+    for codec_name, codec_results in benchmark_json_codecs().items():
+        for payload_name, times in codec_results.items():
+            print(
+                codec_name.ljust(8),
+                payload_name.ljust(8),
+                'encode: %.3f ms' % (times['encode'] * 1000),
+                'decode: %.3f ms' % (times['decode'] * 1000),
+            )
@@ -32,6 +32,10 @@ command_index_by_category: dict[str, toolcli.CommandIndex] = {
         ('log',): 'ctc.cli.commands.admin.log_command',
         ('setup',): 'ctc.cli.commands.admin.setup_command',
         ('rechunk-events',): 'ctc.cli.commands.admin.rechunk_command',
+        ('convert-events',): 'ctc.cli.commands.admin.convert_events_command',
+        (
+            'build-timestamp-index',
+        ): 'ctc.cli.commands.admin.build_timestamp_index_command',
         ('chains',): 'ctc.cli.commands.admin.chains_command',
     },
     'compute': {
@@ -18,8 +18,17 @@ class AsyncContextManager:
         exception: BaseException | None,
         traceback: types.TracebackType | None,
     ) -> None:
+        from ctc import evm
         from ctc import rpc
+        from ctc.evm.event_utils.event_backends import node_events
 
         # TODO: close all sessions, not just default session
         # TODO: close pending db connections
         await rpc.async_close_http_session()
+        await rpc.async_close_websocket_connections()
+        await rpc.async_close_ipc_connections()
+        node_events.shutdown_decode_pools()
+
+        # persist blocks added to block timestamp indices during command
+        await evm.async_wait_for_block_timestamp_index_saves()
+        evm.save_block_timestamp_indices()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import toolcli
+
+from ctc import cli
+from ctc import evm
+from ctc import spec
+
+
+def get_command_spec() -> toolcli.CommandSpec:
+    return {
+        'f': async_build_timestamp_index_command,
+        'help': 'build block timestamp index of network from local db',
+        'args': [
+            {
+                'name': '--network',
+                'metavar': 'NAME_OR_ID',
+                'help': 'network to build index of',
+            },
+            {
+                'name': '--chunk-size',
+                'type': int,
+                'help': 'number of blocks to read from db per query',
+            },
+        ],
+        'examples': ['', '--network mainnet'],
+        'hidden': True,
+    }
+
+
+async def async_build_timestamp_index_command(
+    *,
+    network: spec.NetworkReference | None,
+    chunk_size: int | None,
+) -> None:
+
+    index = await evm.async_build_block_timestamp_index(
+        network=network,
+        chunk_size=chunk_size,
+    )
+
+    cli.print_bullet(key='n_blocks', value=len(index))
+    if len(index) > 0:
+        cli.print_bullet(key='min block', value=index.start_block)
+        cli.print_bullet(key='max block', value=index.end_block)
+    cli.print_bullet(key='path', value=index.path)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import toolcli
+
+from ctc import evm
+from ctc.evm.event_utils import event_backends
+from ctc import spec
+
+
+def get_command_spec() -> toolcli.CommandSpec:
+    return {
+        'f': async_convert_events,
+        'help': 'convert saved events to another file format, in place',
+        'args': [
+            {
+                'name': 'contract',
+                'nargs': '?',
+                'help': 'address of contract emitting the event',
+            },
+            {
+                'name': 'event',
+                'nargs': '?',
+                'default': None,
+                'help': 'event name or event hash',
+            },
+            {
+                'name': '--format',
+                'dest': 'file_format',
+                'default': 'parquet',
+                'help': 'file format to convert to, csv, parquet, or arrow',
+            },
+            {
+                'name': '--network',
+                'metavar': 'NAME_OR_ID',
+                'help': 'network to convert events of',
+            },
+            {
+                'name': '--all',
+                'action': 'store_true',
+                'dest': 'all_events',
+                'help': 'whether to convert all events (can take a long time)',
+            },
+            {
+                'name': '--dry',
+                'action': 'store_true',
+                'help': 'perform a dry run where no changes are made',
+            },
+            {
+                'name': ['--verbose', '-v'],
+                'action': 'store_true',
+                'help': 'increase verbosity',
+            },
+        ],
+        'examples': [
+            '0x956f47f50a910163d8bf957cf5846d573e7f87ca 0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef',
+            '--all --format parquet',
+        ],
+        'hidden': True,
+    }
+
+
+async def async_convert_events(
+    *,
+    contract: spec.Address,
+    event: str,
+    file_format: str,
+    network: spec.NetworkReference,
+    all_events: bool,
+    dry: bool,
+    verbose: bool,
+) -> None:
+
+    if file_format not in ['csv', 'parquet', 'arrow']:
+        raise Exception('file format must be csv, parquet, or arrow')
+
+    if network is None:
+        network = 'mainnet'
+
+    if all_events:
+
+        await event_backends.async_convert_all_events_file_format(
+            file_format=file_format,  # type: ignore
+            network=network,
+            dry=dry,
+            verbose=verbose,
+        )
+
+    elif contract is not None and event is not None:
+
+        if evm.is_event_hash(event):
+            event_name = None
+            event_hash = event
+        else:
+            event_name = event
+            event_hash = None
+
+        await event_backends.async_convert_events_file_format(
+            contract_address=contract,
+            event_name=event_name,
+            event_hash=event_hash,
+            file_format=file_format,  # type: ignore
+            network=network,
+            dry=dry,
+            verbose=verbose,
+        )
+
+    else:
+        raise Exception(
+            'usage either `ctc convert-events --all` or `ctc convert-events contract_address event`'
+        )
@@ -41,6 +41,11 @@ def get_command_spec() -> toolcli.CommandSpec:
                 'help': 'specify that output path can be overwritten',
             },
             {'name': '--provider', 'help': 'rpc provider to use'},
+            {
+                'name': '--intake',
+                'action': 'store_true',
+                'help': 'store blocks in local db using bulk upserts',
+            },
         ],
         'examples': {
             '14000000:14000010': 'get blocks 14000000 through 14000010',
@@ -59,6 +64,7 @@ async def async_blocks_command(
     export: str,
     overwrite: bool,
     provider: typing.Optional[str],
+    intake: bool,
 ) -> None:
     import pandas as pd
 
@@ -94,6 +100,18 @@ async def async_blocks_command(
         provider=provider,
     )
 
+    if intake:
+        from ctc import db
+
+        stats = await db.async_bulk_intake_blocks(
+            blocks_data,
+            network=rpc.get_provider_network(provider),
+        )
+        cli.print_bullet(key='db rows written', value=stats['n_rows'])
+        cli.print_bullet(
+            key='db rows per second', value='%.1f' % stats['rows_per_second']
+        )
+
     if export == 'stdout':
         cli.print_bullet(key='attributes', value='')
         for attribute in attributes:
@@ -30,6 +30,7 @@ def get_default_config(use_env_variables: bool = True) -> spec.Config:
         #
         # providers
         'providers': {},
+        'provider_pools': {},
         'default_providers': {},
         #
         # db
@@ -14,6 +14,7 @@ def get_config_validators() -> typing.Mapping[
         'data_dir': validate_data_dir,
         'networks': validate_networks,
         'providers': validate_providers,
+        'provider_pools': validate_provider_pools,
         'default_network': validate_default_network,
         'default_providers': validate_default_providers,
         'db_configs': validate_db_configs,
@@ -30,6 +31,7 @@ def get_config_base_types() -> typing.Mapping[
         'data_dir': str,
         'networks': dict,
         'providers': dict,
+        'provider_pools': dict,
         'default_network': (int, type(None)),
         'default_providers': dict,
         'db_configs': dict,
@@ -46,7 +48,7 @@ def validate_config(config: typing.Mapping[typing.Any, typing.Any]) -> None:
 
     # check that all required keys are present
     for key in spec.config_keys:
-        if key not in config:
+        if key not in config and key not in spec.optional_config_keys:
             raise spec.ConfigInvalid('config does not specify key: ' + str(key))
 
     # check that each entry is valid
@@ -160,17 +162,62 @@ def validate_providers(
             )
         if network not in config['networks']:
             raise spec.ConfigInvalid('provider network not in network entries')
-        if protocol != 'http':
-            raise spec.ConfigInvalid('only http supported')
+        if protocol not in ('http', 'wss', 'ipc'):
+            raise spec.ConfigInvalid('only http, wss, and ipc supported')
         if not isinstance(session_kwargs, dict):
             raise spec.ConfigInvalid('session_kwargs must be a dict')
         if chunk_size is not None and not isinstance(chunk_size, int):
             raise spec.ConfigInvalid('chunk_size is not int')
 
-        if not url.startswith('http'):
+        if protocol == 'http' and not url.startswith('http'):
             raise spec.ConfigInvalid(
                 'http provider url must start with "http://" or "https://"'
             )
+        if protocol == 'wss' and not url.startswith('ws'):
+            raise spec.ConfigInvalid(
+                'wss provider url must start with "ws://" or "wss://"'
+            )
+
+
+def validate_provider_pools(
+    value: typing.Any, config: typing.Mapping[typing.Any, typing.Any]
+) -> None:
+
+    provider_pool_keys = set(spec.provider_pool_keys)
+    providers = config['providers']
+    for pool_name, pool in value.items():
+        if not isinstance(pool_name, str):
+            raise spec.ConfigInvalid('provider pool name should be a str')
+        if set(pool.keys()) != provider_pool_keys:
+            raise spec.ConfigInvalid(
+                'provider pool should have keys: ' + str(provider_pool_keys)
+            )
+        if pool['name'] != pool_name:
+            raise spec.ConfigInvalid('provider pool name does not match')
+        if pool_name in providers:
+            raise spec.ConfigInvalid(
+                'provider pool name conflicts with provider name'
+            )
+        if not isinstance(pool['network'], int):
+            raise spec.ConfigInvalid(
+                'provider pool network should be an int chain_id'
+            )
+        if (
+            not isinstance(pool['providers'], list)
+            or len(pool['providers']) == 0
+        ):
+            raise spec.ConfigInvalid(
+                'provider pool should have a nonempty list of providers'
+            )
+        for provider_name in pool['providers']:
+            if provider_name not in providers:
+                raise spec.ConfigInvalid(
+                    'provider in provider pool not present in provider entries'
+                )
+            if providers[provider_name]['network'] != pool['network']:
+                raise spec.ConfigInvalid(
+                    'providers in provider pool must use the pool network'
+                )
 
 
 def validate_default_network(
@@ -197,7 +244,9 @@ def validate_default_providers(
             raise spec.ConfigInvalid(
                 'chain_id in default_providers not present in network entries'
             )
-        if provider_name not in providers:
+        if provider_name not in providers and provider_name not in config.get(
+            'provider_pools', {}
+        ):
             raise spec.ConfigInvalid(
                 'provider in default_providers not present in provider entries'
             )
@@ -88,6 +88,33 @@ def get_providers() -> typing.Mapping[spec.NetworkName, spec.Provider]:
     return config_read.get_config()['providers']
 
 
+def get_provider_pools() -> typing.Mapping[str, spec.ProviderPool]:
+    return config_read.get_config().get('provider_pools', {})
+
+
+def get_provider_pool_members(pool_name: str) -> list[spec.Provider]:
+    """get member providers of provider pool"""
+    providers = get_providers()
+    pool = get_provider_pools()[pool_name]
+    return [providers[provider_name] for provider_name in pool['providers']]
+
+
+def get_pool_provider(pool_name: str) -> spec.Provider:
+    """get provider that sends its requests through provider pool
+
+    the provider has the name of the pool and the settings of the first
+    member. its url names the pool, so that the pool has a provider key of its
+    own instead of sharing the key of its first member
+    """
+    import copy
+
+    members = get_provider_pool_members(pool_name)
+    provider = copy.copy(members[0])
+    provider['name'] = pool_name
+    provider['url'] = 'pool://' + pool_name
+    return provider
+
+
 def has_provider(
     *,
     name: str | None = None,
@@ -111,6 +138,9 @@ def get_provider(
 
     from ctc.toolbox import search_utils
 
+    if name is not None and name in get_provider_pools():
+        return get_pool_provider(name)
+
     providers = list(get_providers().values())
 
     # build query
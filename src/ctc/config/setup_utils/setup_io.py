@@ -96,6 +96,7 @@ def write_new_config(
         'data_dir': data_dir_data['data_dir'],
         'networks': networks,
         'providers': network_data['providers'],
+        'provider_pools': network_data.get('provider_pools', {}),
         'default_network': network_data['default_network'],
         'default_providers': default_providers,
         'db_configs': db_data['db_configs'],
@@ -39,6 +39,7 @@ async def async_setup_networks(
 
         return {
             'providers': providers,
+            'provider_pools': old_config.get('provider_pools', {}),
             'networks': networks,
             'default_network': default_network,
             'default_providers': default_providers,
@@ -82,12 +83,20 @@ async def async_setup_networks(
         headless=headless,
     )
 
+    # keep provider pools whose members are still present
+    provider_pools = {
+        pool_name: pool
+        for pool_name, pool in old_config.get('provider_pools', {}).items()
+        if all(name in providers for name in pool['providers'])
+    }
+
     print()
     print('Network setup complete')
 
     # return results
     data: spec.PartialConfig = {
         'providers': providers,
+        'provider_pools': provider_pools,
         'networks': networks,
         'default_network': default_network,
         'default_providers': default_providers,
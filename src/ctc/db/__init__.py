@@ -1,6 +1,7 @@
 from .management import *
 from .schemas import *
 
+from .bulk_utils import *
 from .connect_utils import *
 from .intake_utils import *
 from .query_utils import *
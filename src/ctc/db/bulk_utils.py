@@ -0,0 +1,286 @@
+"""bulk upserts of many rows
+
+rows are written using the fastest path of each database:
+- postgresql: COPY into a temporary staging table, then one merge statement,
+  or one executemany statement for drivers without a COPY api
+- sqlite: one executemany statement, with pragmas tuned for bulk writes
+- other databases: toolsql.insert()
+
+rows are given as tuples in the order of columns. rows with the same primary
+key are deduplicated, keeping the last row
+"""
+
+from __future__ import annotations
+
+import typing
+
+import toolsql
+
+
+# pragmas applied to sqlite connections for the duration of a bulk upsert,
+# synchronous is not included since it cannot change inside a transaction
+sqlite_bulk_pragmas = {
+    'cache_size': '-262144',
+    'temp_store': 'MEMORY',
+}
+
+
+def bulk_upsert_rows(
+    conn: toolsql.SAConnection,
+    *,
+    table: str,
+    columns: typing.Sequence[str],
+    rows: typing.Sequence[typing.Sequence[typing.Any]],
+    primary_key: typing.Sequence[str],
+) -> int:
+    """upsert rows into table, returning number of rows written"""
+
+    rows = _deduplicate_rows(rows, columns=columns, primary_key=primary_key)
+    if len(rows) == 0:
+        return 0
+
+    dialect = conn.dialect.name
+    if dialect == 'postgresql':
+        _copy_upsert_rows_postgresql(
+            conn,
+            table=table,
+            columns=columns,
+            rows=rows,
+            primary_key=primary_key,
+        )
+    elif dialect == 'sqlite':
+        _executemany_upsert_rows_sqlite(
+            conn,
+            table=table,
+            columns=columns,
+            rows=rows,
+            primary_key=primary_key,
+        )
+    else:
+        toolsql.insert(
+            conn=conn,
+            table=table,
+            rows=[dict(zip(columns, row)) for row in rows],
+            upsert='do_update',
+        )
+    return len(rows)
+
+
+def _deduplicate_rows(
+    rows: typing.Sequence[typing.Sequence[typing.Any]],
+    *,
+    columns: typing.Sequence[str],
+    primary_key: typing.Sequence[str],
+) -> typing.Sequence[typing.Sequence[typing.Any]]:
+    indices = [columns.index(column) for column in primary_key]
+    by_key = {tuple(row[index] for index in indices): row for row in rows}
+    if len(by_key) == len(rows):
+        return rows
+    return list(by_key.values())
+
+
+def _get_update_clause(
+    columns: typing.Sequence[str], primary_key: typing.Sequence[str]
+) -> str:
+    updates = [
+        column + ' = EXCLUDED.' + column
+        for column in columns
+        if column not in primary_key
+    ]
+    if len(updates) == 0:
+        return 'DO NOTHING'
+    return 'DO UPDATE SET ' + ', '.join(updates)
+
+
+def _executemany_upsert_rows_sqlite(
+    conn: toolsql.SAConnection,
+    *,
+    table: str,
+    columns: typing.Sequence[str],
+    rows: typing.Sequence[typing.Sequence[typing.Any]],
+    primary_key: typing.Sequence[str],
+) -> None:
+
+    # tune pragmas, restoring previous values afterwards
+    previous: dict[str, typing.Any] = {}
+    for pragma, value in sqlite_bulk_pragmas.items():
+        previous[pragma] = conn.exec_driver_sql('PRAGMA ' + pragma).scalar()
+        conn.exec_driver_sql('PRAGMA ' + pragma + ' = ' + value)
+
+    try:
+        sql = (
+            'INSERT INTO '
+            + table
+            + ' ('
+            + ', '.join(columns)
+            + ') VALUES ('
+            + ', '.join('?' for column in columns)
+            + ') ON CONFLICT ('
+            + ', '.join(primary_key)
+            + ') '
+            + _get_update_clause(columns, primary_key)
+        )
+        conn.exec_driver_sql(sql, [tuple(row) for row in rows])
+    finally:
+        for pragma, value in previous.items():
+            conn.exec_driver_sql('PRAGMA ' + pragma + ' = ' + str(value))
+
+
+def _copy_upsert_rows_postgresql(
+    conn: toolsql.SAConnection,
+    *,
+    table: str,
+    columns: typing.Sequence[str],
+    rows: typing.Sequence[typing.Sequence[typing.Any]],
+    primary_key: typing.Sequence[str],
+) -> None:
+    driver_connection = _get_driver_connection(conn)
+    if hasattr(driver_connection, 'copy_records_to_table'):
+        copy_rows: typing.Callable[..., None] = _copy_rows_asyncpg
+    elif _has_copy_expert(driver_connection):
+        copy_rows = _copy_rows_psycopg2
+    else:
+        _executemany_upsert_rows(
+            conn,
+            table=table,
+            columns=columns,
+            rows=rows,
+            primary_key=primary_key,
+        )
+        return
+
+    column_list = ', '.join(columns)
+    staging = table + '__staging'
+
+    # staging table lasts until end of transaction
+    conn.exec_driver_sql(
+        'CREATE TEMPORARY TABLE IF NOT EXISTS '
+        + staging
+        + ' (LIKE '
+        + table
+        + ' INCLUDING DEFAULTS) ON COMMIT DROP'
+    )
+    conn.exec_driver_sql('TRUNCATE ' + staging)
+
+    # copy rows into staging table
+    copy_rows(driver_connection, table=staging, columns=columns, rows=rows)
+
+    # merge staging table into table
+    conn.exec_driver_sql(
+        'INSERT INTO '
+        + table
+        + ' ('
+        + column_list
+        + ') SELECT '
+        + column_list
+        + ' FROM '
+        + staging
+        + ' ON CONFLICT ('
+        + ', '.join(primary_key)
+        + ') '
+        + _get_update_clause(columns, primary_key)
+    )
+
+
+def _get_driver_connection(conn: toolsql.SAConnection) -> typing.Any:
+    """get connection object of the underlying db driver"""
+    dbapi_connection = conn.connection
+    driver_connection = getattr(dbapi_connection, 'driver_connection', None)
+    if driver_connection is not None:
+        return driver_connection
+    return dbapi_connection
+
+
+def _has_copy_expert(driver_connection: typing.Any) -> bool:
+    if not hasattr(driver_connection, 'cursor'):
+        return False
+    cursor = driver_connection.cursor()
+    try:
+        return hasattr(cursor, 'copy_expert')
+    finally:
+        cursor.close()
+
+
+def _copy_rows_psycopg2(
+    driver_connection: typing.Any,
+    *,
+    table: str,
+    columns: typing.Sequence[str],
+    rows: typing.Sequence[typing.Sequence[typing.Any]],
+) -> None:
+    import io
+
+    text = ''.join(
+        '\t'.join(_format_copy_value(value) for value in row) + '\n'
+        for row in rows
+    )
+    cursor = driver_connection.cursor()
+    try:
+        cursor.copy_expert(
+            'COPY ' + table + ' (' + ', '.join(columns) + ') FROM STDIN',
+            io.StringIO(text),
+        )
+    finally:
+        cursor.close()
+
+
+def _copy_rows_asyncpg(
+    driver_connection: typing.Any,
+    *,
+    table: str,
+    columns: typing.Sequence[str],
+    rows: typing.Sequence[typing.Sequence[typing.Any]],
+) -> None:
+    # statements are run inside of run_sync(), so the driver coroutine is
+    # awaited through sqlalchemy's greenlet bridge
+    from sqlalchemy.util import await_only
+
+    await_only(
+        driver_connection.copy_records_to_table(
+            table,
+            records=[tuple(row) for row in rows],
+            columns=list(columns),
+        )
+    )
+
+
+def _executemany_upsert_rows(
+    conn: toolsql.SAConnection,
+    *,
+    table: str,
+    columns: typing.Sequence[str],
+    rows: typing.Sequence[typing.Sequence[typing.Any]],
+    primary_key: typing.Sequence[str],
+) -> None:
+    """upsert rows with one executemany statement of any driver"""
+    import sqlalchemy
+
+    names = ['p' + str(c) for c in range(len(columns))]
+    sql = (
+        'INSERT INTO '
+        + table
+        + ' ('
+        + ', '.join(columns)
+        + ') VALUES ('
+        + ', '.join(':' + name for name in names)
+        + ') ON CONFLICT ('
+        + ', '.join(primary_key)
+        + ') '
+        + _get_update_clause(columns, primary_key)
+    )
+    conn.execute(sqlalchemy.text(sql), [dict(zip(names, row)) for row in rows])
+
+
+def _format_copy_value(value: typing.Any) -> str:
+    """format value in postgresql COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import threading
 import typing
 
 import toolsql
@@ -12,6 +13,14 @@ from . import schema_utils
 from .management import dba_utils
 from .management import version_utils
 
+# engines are shared by every schema of a database, and each schema is
+# verified once per process
+_engine_registry: dict[str, typing.Any] = {
+    'engines': {},
+    'verified_schemas': set(),
+    'lock': threading.Lock(),
+}
+
 
 def create_engine(
     schema_name: schema_utils.SchemaName,
@@ -19,7 +28,10 @@ def create_engine(
     network: spec.NetworkReference | None,
     create_missing_schema: bool = True,
 ) -> toolsql.SAEngine | None:
-    """create sqlalchemy engine object"""
+    """get sqlalchemy engine object of schema's database
+
+    engines are created once per database and reused by later calls
+    """
 
     # get db config
     data_source: config.DataSource | config.LeafDataSource = (
@@ -35,34 +47,68 @@ def create_engine(
     if db_config is None:
         raise Exception('invalid db_config')
 
-    # create directory if need be
-    if db_config['dbms'] == 'sqlite':
-        pathdir = os.path.dirname(os.path.abspath(db_config['path']))
-        os.makedirs(pathdir, exist_ok=True)
+    db_key = tuple(sorted((k, str(v)) for k, v in db_config.items()))
+    schema_key = (schema_name, network, db_key)
+    engines: dict[tuple[tuple[str, str], ...], toolsql.SAEngine]
+    engines = _engine_registry['engines']
+    verified_schemas: set[typing.Any] = _engine_registry['verified_schemas']
+    lock = typing.cast(threading.Lock, _engine_registry['lock'])
 
-    # create engine
-    engine = toolsql.create_engine(db_config=db_config)
+    with lock:
+        engine = engines.get(db_key)
+        if engine is None:
 
-    # create missing tables
-    if create_missing_schema:
-        with engine.begin() as conn:
+            # create directory if need be
+            if db_config['dbms'] == 'sqlite':
+                pathdir = os.path.dirname(os.path.abspath(db_config['path']))
+                os.makedirs(pathdir, exist_ok=True)
 
-            # check that schema versions being tracked
-            if not version_utils.is_schema_versions_initialized(engine=engine):
-                dba_utils.initialize_schema_versions(conn=conn)
+            # create engine
+            engine = toolsql.create_engine(db_config=db_config)
+            engines[db_key] = engine
 
-            # check if schema in database
-            schema_version = version_utils.get_schema_version(
-                schema_name=schema_name,
-                network=network,
+        # create missing tables
+        if create_missing_schema and schema_key not in verified_schemas:
+            _initialize_missing_schema(
+                schema_name=schema_name, network=network, engine=engine
             )
-
-            # create schema if missing
-            if schema_version is None:
-                dba_utils.initialize_schema(
-                    schema_name=schema_name,
-                    network=network,
-                    conn=conn,
-                )
+            verified_schemas.add(schema_key)
 
     return engine
+
+
+def clear_engine_registry() -> None:
+    """dispose of shared engines and forget which schemas were verified"""
+    lock = typing.cast(threading.Lock, _engine_registry['lock'])
+    with lock:
+        for engine in _engine_registry['engines'].values():
+            engine.dispose()
+        _engine_registry['engines'].clear()
+        _engine_registry['verified_schemas'].clear()
+
+
+def _initialize_missing_schema(
+    *,
+    schema_name: schema_utils.SchemaName,
+    network: spec.NetworkReference | None,
+    engine: toolsql.SAEngine,
+) -> None:
+    with engine.begin() as conn:
+
+        # check that schema versions being tracked
+        if not version_utils.is_schema_versions_initialized(engine=engine):
+            dba_utils.initialize_schema_versions(conn=conn)
+
+        # check if schema in database
+        schema_version = version_utils.get_schema_version(
+            schema_name=schema_name,
+            network=network,
+        )
+
+        # create schema if missing
+        if schema_version is None:
+            dba_utils.initialize_schema(
+                schema_name=schema_name,
+                network=network,
+                conn=conn,
+            )
@@ -9,6 +9,7 @@ from ctc import spec
 
 from . import connect_utils
 from . import management
+from . import query_utils
 from . import schemas
 
 
@@ -97,7 +98,9 @@ async def _async_get_max_block_number_in_db(
     )
     if engine is None:
         raise Exception('could not connect to database')
-    with engine.begin() as conn:
-        return await schemas.async_select_max_block_number(
-            network=network, conn=conn
-        )
+    return await query_utils.async_run_with_connection(
+        schemas.select_max_block_number,
+        engine=engine,
+        begin=True,
+        network=network,
+    )
@@ -100,3 +100,228 @@ def load_compressed_block_times(
 
     blocks = range(start_block, end_block + 1)
     return dict(zip(blocks, timestamps))
+
+
+#
+# # memory-mappable archives
+#
+
+# an archive is a directory holding two uncompressed .npy files:
+# - timestamp_diffs.npy: diff of each block's timestamp from previous block,
+#   stored as 0 at checkpoints
+# - checkpoints.npy: [block offset, timestamp] of each checkpoint, placed
+#   every checkpoint_interval blocks and wherever a diff overflows its dtype
+block_timestamp_archive_template = (
+    'block_timestamps__{start_block}_to_{end_block}'
+)
+
+default_checkpoint_interval = 4096
+
+
+def parse_block_timestamp_archive_name(name: str) -> tuple[int, int] | None:
+    """get (start_block, end_block) of archive name, or None if not archive"""
+    import re
+
+    match = re.fullmatch(r'block_timestamps__(\d+)_to_(\d+)', name)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def save_block_timestamp_archive(
+    timestamps: typing.Sequence[int] | spec.NumpyArray,
+    *,
+    start_block: int,
+    dirname: str | None = None,
+    path: str | None = None,
+    checkpoint_interval: int = default_checkpoint_interval,
+) -> str:
+    """save timestamps of contiguous blocks as memory-mappable archive"""
+    import shutil
+    import tempfile
+
+    import numpy as np
+
+    timestamps_array = np.asarray(timestamps, dtype=np.int64)
+    if len(timestamps_array) == 0:
+        raise Exception('no timestamps given')
+    if (np.diff(timestamps_array) < 0).any():
+        raise Exception('timestamps must be monotonic')
+
+    # diffs use int16 unless they exceed it frequently
+    diffs = np.diff(timestamps_array, prepend=timestamps_array[0])
+    dtype: type = np.int16
+    overflows = diffs > np.iinfo(dtype).max
+    if overflows.sum() * checkpoint_interval > len(diffs):
+        dtype = np.int32
+        overflows = diffs > np.iinfo(dtype).max
+
+    # place checkpoints
+    is_checkpoint = overflows
+    is_checkpoint[::checkpoint_interval] = True
+    offsets = np.nonzero(is_checkpoint)[0]
+    checkpoints = np.stack([offsets, timestamps_array[offsets]], axis=1)
+    diffs[is_checkpoint] = 0
+
+    if path is None:
+        name = block_timestamp_archive_template.format(
+            start_block=start_block,
+            end_block=start_block + len(timestamps_array) - 1,
+        )
+        if dirname is not None:
+            path = os.path.join(dirname, name)
+        else:
+            path = name
+
+    # write to a temporary directory and move it into place, so that files
+    # memory-mapped by other processes are never truncated
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=parent, prefix='.tmp__')
+    try:
+        np.save(
+            os.path.join(tmp_path, 'timestamp_diffs.npy'), diffs.astype(dtype)
+        )
+        np.save(os.path.join(tmp_path, 'checkpoints.npy'), checkpoints)
+        if os.path.exists(path):
+            old_path = tempfile.mkdtemp(dir=parent, prefix='.old__')
+            os.replace(path, old_path)
+            os.replace(tmp_path, path)
+            shutil.rmtree(old_path)
+        else:
+            os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+
+    return path
+
+
+def load_block_timestamp_archive(path: str) -> BlockTimestampArchive:
+    """load archive, memory-mapping its arrays"""
+    import numpy as np
+
+    name = os.path.basename(os.path.normpath(path))
+    block_range = parse_block_timestamp_archive_name(name)
+    if block_range is None:
+        raise Exception('not a block timestamp archive: ' + str(path))
+    return BlockTimestampArchive(
+        start_block=block_range[0],
+        timestamp_diffs=np.load(
+            os.path.join(path, 'timestamp_diffs.npy'), mmap_mode='r'
+        ),
+        checkpoints=np.load(
+            os.path.join(path, 'checkpoints.npy'), mmap_mode='r'
+        ),
+    )
+
+
+class BlockTimestampArchive:
+    """timestamps of contiguous blocks, decoded one checkpoint at a time"""
+
+    def __init__(
+        self,
+        *,
+        start_block: int,
+        timestamp_diffs: spec.NumpyArray,
+        checkpoints: spec.NumpyArray,
+    ) -> None:
+        self.start_block = start_block
+        self.timestamp_diffs = timestamp_diffs
+        self.checkpoint_offsets = checkpoints[:, 0]
+        self.checkpoint_timestamps = checkpoints[:, 1]
+
+    @property
+    def end_block(self) -> int:
+        return self.start_block + len(self.timestamp_diffs) - 1
+
+    def __len__(self) -> int:
+        return len(self.timestamp_diffs)
+
+    def _decode_segment(self, segment: int) -> spec.NumpyArray:
+        """decode timestamps of blocks from checkpoint to next checkpoint"""
+        import numpy as np
+
+        start = self.checkpoint_offsets[segment]
+        if segment + 1 < len(self.checkpoint_offsets):
+            end = self.checkpoint_offsets[segment + 1]
+        else:
+            end = len(self.timestamp_diffs)
+        diffs = self.timestamp_diffs[start:end]
+        decoded: spec.NumpyArray = self.checkpoint_timestamps[
+            segment
+        ] + np.cumsum(diffs, dtype=np.int64)
+        return decoded
+
+    def get_timestamps(
+        self, block_numbers: typing.Sequence[int] | spec.NumpyArray
+    ) -> spec.NumpyArray:
+        """get timestamps of blocks, -1 for blocks outside of archive"""
+        import numpy as np
+
+        offsets = np.asarray(block_numbers, dtype=np.int64) - self.start_block
+        found = (offsets >= 0) & (offsets < len(self))
+        output = np.full(len(offsets), -1, dtype=np.int64)
+        segments = (
+            np.searchsorted(self.checkpoint_offsets, offsets, side='right') - 1
+        )
+        for segment in np.unique(segments[found]):
+            mask = found & (segments == segment)
+            decoded = self._decode_segment(segment)
+            relative = offsets[mask] - self.checkpoint_offsets[segment]
+            output[mask] = decoded[relative]
+        return output
+
+    def _count_timestamps(
+        self,
+        timestamps: spec.NumpyArray,
+        *,
+        side: typing.Literal['left', 'right'],
+    ) -> spec.NumpyArray:
+        """count blocks with timestamp < (side='left') or <= (side='right')"""
+        import numpy as np
+
+        counts = np.zeros(len(timestamps), dtype=np.int64)
+        segments = (
+            np.searchsorted(self.checkpoint_timestamps, timestamps, side=side)
+            - 1
+        )
+        for segment in np.unique(segments[segments >= 0]):
+            mask = segments == segment
+            decoded = self._decode_segment(segment)
+            counts[mask] = self.checkpoint_offsets[segment] + np.searchsorted(
+                decoded, timestamps[mask], side=side
+            )
+        return counts
+
+    def search(
+        self,
+        timestamps: typing.Sequence[int] | spec.NumpyArray,
+        *,
+        mode: typing.Literal['<=', '>=', '=='] = '>=',
+    ) -> spec.NumpyArray:
+        """get blocks of timestamps, -1 where archive cannot determine block
+
+        a block is only returned if its neighbor needed to rule out other
+        blocks is also in the archive
+        """
+        import numpy as np
+
+        query = np.asarray(timestamps, dtype=np.int64)
+        n = len(self)
+        if mode == '>=' or mode == '==':
+            offsets = self._count_timestamps(query, side='left')
+            found = offsets < n
+            if self.start_block > 0:
+                found &= offsets > 0
+            if mode == '==':
+                found[found] &= (
+                    self.get_timestamps(offsets[found] + self.start_block)
+                    == query[found]
+                )
+        elif mode == '<=':
+            offsets = self._count_timestamps(query, side='right') - 1
+            found = (offsets >= 0) & (offsets < n - 1)
+        else:
+            raise Exception('unknown mode: ' + str(mode))
+        return np.where(found, offsets + self.start_block, -1)
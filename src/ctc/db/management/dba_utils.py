@@ -289,3 +289,6 @@ def drop_schema(
                     confirm_delete_row=True,
                     confirm_delete_schema=True,
                 )
+
+    # dropped schemas must be verified again before use
+    connect_utils.clear_engine_registry()
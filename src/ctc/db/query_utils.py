@@ -1,21 +1,47 @@
 from __future__ import annotations
 
 import functools
+import typing
 from typing import Callable, Coroutine, Any, TypeVar
 
-import sqlalchemy  # type: ignore
+import sqlalchemy
 import toolsql
 
 from ctc import spec
 from . import connect_utils
 from . import schema_utils
 
+if typing.TYPE_CHECKING:
+    from typing_extensions import Literal, ParamSpec
+
+    _P = ParamSpec('_P')
+
+    DBExecutionMode = Literal['auto', 'thread', 'blocking']
+
 
 R = TypeVar('R')
 
 
+def create_async_statement(
+    f: Callable[_P, R]
+) -> Callable[_P, Coroutine[Any, Any, R]]:
+    """create coroutine version of statement function
+
+    the statement runs on the given conn inside the event loop, use
+    async_run_with_connection to keep it from blocking the event loop
+    """
+
+    @functools.wraps(f)
+    async def async_f(*args: _P.args, **kwargs: _P.kwargs) -> R:
+        return f(*args, **kwargs)
+
+    async_f.__name__ = 'async_' + f.__name__
+    async_f.__qualname__ = 'async_' + f.__qualname__
+    return async_f
+
+
 def wrap_selector_with_connection(
-    async_f: Callable[..., Coroutine[Any, Any, R | None]],
+    f: Callable[..., R | None],
     schema_name: schema_utils.SchemaName
     | Callable[..., schema_utils.SchemaName | None],
     *,
@@ -23,18 +49,24 @@ def wrap_selector_with_connection(
 ) -> Callable[..., Coroutine[Any, Any, R | None]]:
 
     # define new function
-    @functools.wraps(async_f)
+    @functools.wraps(f)
     async def async_connected_f(
         *args: Any,
         network: spec.NetworkReference | None = None,
         engine: toolsql.SAEngine | None = None,
+        conn: toolsql.SAConnection | None = None,
         **kwargs: Any,
     ) -> R | None:
-        # TODO: allow this function to accept a conn that already exists
 
         if network is None and require_network:
             raise Exception('must specify network')
 
+        # reuse connection of enclosing query
+        if conn is not None:
+            if require_network:
+                kwargs['network'] = network
+            return f(*args, conn=conn, **kwargs)
+
         if not isinstance(schema_name, str) and hasattr(
             schema_name, '__call__'
         ):
@@ -61,9 +93,128 @@ def wrap_selector_with_connection(
         if require_network:
             kwargs['network'] = network
         try:
-            with engine.connect() as conn:
-                return await async_f(*args, conn=conn, **kwargs)
+            return await async_run_with_connection(
+                f, *args, engine=engine, **kwargs
+            )
         except sqlalchemy.exc.OperationalError:
             return None
 
     return async_connected_f
+
+
+#
+# # non-blocking execution
+#
+
+# async sqlalchemy driver of each dbms
+async_drivers = {
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+}
+
+_db_execution_state: dict[str, DBExecutionMode] = {
+    'mode': 'auto',
+}
+
+# url of sync engine -> async engine
+_async_engines: dict[str, typing.Any] = {}
+
+
+def set_db_execution_mode(mode: DBExecutionMode) -> None:
+    """set how statements are kept from blocking the event loop
+
+    - 'auto': use async driver if installed, otherwise a worker thread
+    - 'thread': always use a worker thread
+    - 'blocking': run statements directly in the event loop
+    """
+    if mode not in ('auto', 'thread', 'blocking'):
+        raise Exception('unknown db execution mode: ' + str(mode))
+    _db_execution_state['mode'] = mode
+
+
+def get_db_execution_mode() -> DBExecutionMode:
+    return _db_execution_state['mode']
+
+
+def get_async_engine(engine: toolsql.SAEngine) -> typing.Any | None:
+    """get async engine of engine's database, None if no async driver"""
+
+    import importlib
+
+    url = engine.url
+    backend = url.get_backend_name()
+    driver = async_drivers.get(backend)
+    if driver is None:
+        return None
+    try:
+        importlib.import_module(driver)
+        importlib.import_module('greenlet')
+        from sqlalchemy.ext import asyncio as sa_asyncio
+    except ImportError:
+        return None
+
+    key = url.render_as_string(hide_password=False)
+    async_engine = _async_engines.get(key)
+    if async_engine is None:
+        async_engine = sa_asyncio.create_async_engine(
+            url.set(drivername=backend + '+' + driver),
+        )
+        _async_engines[key] = async_engine
+    return async_engine
+
+
+async def async_run_with_connection(
+    f: Callable[..., R],
+    *args: Any,
+    engine: toolsql.SAEngine,
+    begin: bool = False,
+    **kwargs: Any,
+) -> R:
+    """call statement function with a connection of engine as conn
+
+    the statement is run through an async driver or in a worker thread, so
+    that it does not block the event loop. if begin is True, the statement
+    runs in a transaction that is committed when it completes
+    """
+    import asyncio
+
+    mode = get_db_execution_mode()
+
+    def statement(conn: toolsql.SAConnection) -> R:
+        return f(*args, conn=conn, **kwargs)
+
+    if mode == 'auto':
+        async_engine = get_async_engine(engine)
+        if async_engine is not None:
+            if begin:
+                context = async_engine.begin()
+            else:
+                context = async_engine.connect()
+            async with context as async_conn:
+                result: R = await async_conn.run_sync(statement)
+                return result
+
+    if mode == 'blocking':
+        return _run_with_sync_connection(statement, engine=engine, begin=begin)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None,
+        functools.partial(
+            _run_with_sync_connection, statement, engine=engine, begin=begin
+        ),
+    )
+
+
+def _run_with_sync_connection(
+    statement: Callable[[toolsql.SAConnection], R],
+    *,
+    engine: toolsql.SAEngine,
+    begin: bool,
+) -> R:
+    if begin:
+        with engine.begin() as conn:
+            return statement(conn)
+    else:
+        with engine.connect() as conn:
+            return statement(conn)
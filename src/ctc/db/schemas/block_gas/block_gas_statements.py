@@ -5,6 +5,7 @@ import typing
 import toolsql
 
 from ctc import spec
+from ... import query_utils
 from ... import schema_utils
 
 if typing.TYPE_CHECKING:
@@ -16,7 +17,7 @@ if typing.TYPE_CHECKING:
         timestamp: int
 
 
-async def async_upsert_median_block_gas_fee(
+def upsert_median_block_gas_fee(
     block_number: int,
     *,
     median_gas_fee: int | float | None,
@@ -40,7 +41,7 @@ async def async_upsert_median_block_gas_fee(
     )
 
 
-async def async_upsert_median_blocks_gas_fees(
+def upsert_median_blocks_gas_fees(
     block_gas_data: typing.Sequence[BlockGasRow],
     *,
     conn: toolsql.SAConnection,
@@ -57,7 +58,7 @@ async def async_upsert_median_blocks_gas_fees(
     )
 
 
-async def async_select_median_block_gas_fee(
+def select_median_block_gas_fee(
     block_number: int,
     *,
     conn: toolsql.SAConnection,
@@ -76,7 +77,7 @@ async def async_select_median_block_gas_fee(
     return result
 
 
-async def async_select_median_blocks_gas_fees(
+def select_median_blocks_gas_fees(
     block_numbers: typing.Sequence[int],
     *,
     conn: toolsql.SAConnection,
@@ -97,7 +98,7 @@ async def async_select_median_blocks_gas_fees(
         return {result['block_number']: result for result in results}
 
 
-async def async_delete_block_gas(
+def delete_block_gas(
     block_number: int,
     *,
     conn: toolsql.SAConnection,
@@ -113,7 +114,7 @@ async def async_delete_block_gas(
     )
 
 
-async def async_delete_blocks_gasses(
+def delete_blocks_gasses(
     block_numbers: typing.Sequence[int],
     *,
     conn: toolsql.SAConnection,
@@ -127,3 +128,25 @@ async def async_delete_blocks_gasses(
         table=table,
         where_in={'block_number': block_numbers},
     )
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_upsert_median_block_gas_fee = query_utils.create_async_statement(
+    upsert_median_block_gas_fee
+)
+async_upsert_median_blocks_gas_fees = query_utils.create_async_statement(
+    upsert_median_blocks_gas_fees
+)
+async_select_median_block_gas_fee = query_utils.create_async_statement(
+    select_median_block_gas_fee
+)
+async_select_median_blocks_gas_fees = query_utils.create_async_statement(
+    select_median_blocks_gas_fees
+)
+async_delete_block_gas = query_utils.create_async_statement(delete_block_gas)
+async_delete_blocks_gasses = query_utils.create_async_statement(
+    delete_blocks_gasses
+)
@@ -5,10 +5,11 @@ import typing
 import toolsql
 
 from ctc import spec
+from ... import query_utils
 from ... import schema_utils
 
 
-async def async_upsert_block_timestamp(
+def upsert_block_timestamp(
     *,
     conn: toolsql.SAConnection,
     block_number: int,
@@ -25,7 +26,7 @@ async def async_upsert_block_timestamp(
     )
 
 
-async def async_upsert_block_timestamps(
+def upsert_block_timestamps(
     *,
     conn: toolsql.SAConnection,
     block_timestamps: typing.Mapping[int, int] | None = None,
@@ -53,7 +54,7 @@ async def async_upsert_block_timestamps(
     )
 
 
-async def async_delete_block_timestamp(
+def delete_block_timestamp(
     *,
     conn: toolsql.SAConnection,
     block_number: typing.Sequence[int],
@@ -69,7 +70,7 @@ async def async_delete_block_timestamp(
     )
 
 
-async def async_delete_block_timestamps(
+def delete_block_timestamps(
     *,
     conn: toolsql.SAConnection,
     block_numbers: typing.Sequence[int],
@@ -90,7 +91,7 @@ async def async_delete_block_timestamps(
 #
 
 
-async def async_select_block_timestamp(
+def select_block_timestamp(
     block_number: int,
     *,
     conn: toolsql.SAConnection,
@@ -113,7 +114,7 @@ async def async_select_block_timestamp(
     return result
 
 
-async def async_select_block_timestamps(
+def select_block_timestamps(
     block_numbers: typing.Sequence[typing.SupportsInt],
     *,
     conn: toolsql.SAConnection,
@@ -143,7 +144,7 @@ async def async_select_block_timestamps(
     ]
 
 
-async def async_select_max_block_number(
+def select_max_block_number(
     *,
     conn: toolsql.SAConnection,
     network: spec.NetworkReference | None = None,
@@ -167,7 +168,7 @@ async def async_select_max_block_number(
     return subresult
 
 
-async def async_select_max_block_timestamp(
+def select_max_block_timestamp(
     *,
     conn: toolsql.SAConnection,
     network: spec.NetworkReference | None = None,
@@ -192,7 +193,34 @@ async def async_select_max_block_timestamp(
     return subresult
 
 
-async def async_select_timestamp_block_range(
+def select_block_timestamp_rows(
+    *,
+    conn: toolsql.SAConnection,
+    network: spec.NetworkReference | None = None,
+    start_block: int | None = None,
+    end_block: int | None = None,
+) -> list[list[int]] | None:
+    """select [block_number, timestamp] of blocks in range, ordered by block"""
+
+    table = schema_utils.get_table_name('block_timestamps', network=network)
+    query: dict[str, typing.Any] = {}
+    if start_block is not None:
+        query['where_gte'] = {'block_number': start_block}
+    if end_block is not None:
+        query['where_lte'] = {'block_number': end_block}
+    rows: list[list[int]] | None = toolsql.select(
+        conn=conn,
+        table=table,
+        only_columns=['block_number', 'timestamp'],
+        order_by={'column': 'block_number'},
+        row_format='list',
+        raise_if_table_dne=False,
+        **query,
+    )
+    return rows
+
+
+def select_timestamp_block_range(
     timestamp: int,
     *,
     conn: toolsql.SAConnection,
@@ -232,7 +260,47 @@ async def async_select_timestamp_block_range(
     return lower_bound['max__block_number'], upper_bound['min__block_number']
 
 
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_upsert_block_timestamp = query_utils.create_async_statement(
+    upsert_block_timestamp
+)
+async_upsert_block_timestamps = query_utils.create_async_statement(
+    upsert_block_timestamps
+)
+async_delete_block_timestamp = query_utils.create_async_statement(
+    delete_block_timestamp
+)
+async_delete_block_timestamps = query_utils.create_async_statement(
+    delete_block_timestamps
+)
+async_select_block_timestamp = query_utils.create_async_statement(
+    select_block_timestamp
+)
+async_select_block_timestamps = query_utils.create_async_statement(
+    select_block_timestamps
+)
+async_select_max_block_number = query_utils.create_async_statement(
+    select_max_block_number
+)
+async_select_max_block_timestamp = query_utils.create_async_statement(
+    select_max_block_timestamp
+)
+async_select_block_timestamp_rows = query_utils.create_async_statement(
+    select_block_timestamp_rows
+)
+async_select_timestamp_block_range = query_utils.create_async_statement(
+    select_timestamp_block_range
+)
+
+
 __all__ = (
+    'upsert_block_timestamp',
+    'upsert_block_timestamps',
+    'delete_block_timestamp',
+    'delete_block_timestamps',
     'async_upsert_block_timestamp',
     'async_upsert_block_timestamps',
     'async_delete_block_timestamp',
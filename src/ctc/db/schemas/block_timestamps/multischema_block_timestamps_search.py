@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import typing
 from typing_extensions import Literal
 
@@ -8,15 +7,16 @@ import toolsql
 
 from ctc import spec
 from ... import management
+from ... import query_utils
 from ... import schema_utils
 from . import block_timestamps_statements
 
 from .multischema_block_timestamps_statements import (
-    async_select_block_timestamp,
+    select_block_timestamp,
 )
 
 
-async def async_select_timestamp_block(
+def select_timestamp_block(
     timestamp: int,
     *,
     conn: toolsql.SAConnection,
@@ -71,7 +71,7 @@ async def async_select_timestamp_block(
             pass
         elif mode == '<=':
             # assert block after is in db
-            next_timestamp = await async_select_block_timestamp(
+            next_timestamp = select_block_timestamp(
                 conn=conn,
                 block_number=block_number + 1,
             )
@@ -79,7 +79,7 @@ async def async_select_timestamp_block(
                 return None
         elif mode == '>=':
             # assert block before is in db
-            previous_timestamp = await async_select_block_timestamp(
+            previous_timestamp = select_block_timestamp(
                 conn=conn,
                 block_number=block_number - 1,
             )
@@ -91,7 +91,7 @@ async def async_select_timestamp_block(
     return block_number
 
 
-async def async_select_timestamps_blocks(
+def select_timestamps_blocks(
     timestamps: typing.Sequence[int],
     *,
     conn: toolsql.SAConnection,
@@ -102,8 +102,8 @@ async def async_select_timestamps_blocks(
     timestamp_schema = management.get_active_timestamp_schema()
 
     if timestamp_schema == 'block_timestamps':
-        coroutines = [
-            async_select_timestamp_block(
+        return [
+            select_timestamp_block(
                 conn=conn,
                 timestamp=timestamp,
                 network=network,
@@ -111,7 +111,6 @@ async def async_select_timestamps_blocks(
             )
             for timestamp in timestamps
         ]
-        return await asyncio.gather(*coroutines)
 
     elif timestamp_schema == 'blocks':
         raise NotImplementedError()
@@ -120,7 +119,7 @@ async def async_select_timestamps_blocks(
         raise Exception('unknown schema: ' + str(timestamp_schema))
 
 
-async def async_select_timestamp_block_range(
+def select_timestamp_block_range(
     timestamp: int,
     *,
     conn: toolsql.SAConnection,
@@ -130,7 +129,7 @@ async def async_select_timestamp_block_range(
     timestamp_schema = management.get_active_timestamp_schema()
 
     if timestamp_schema == 'block_timestamps':
-        return await block_timestamps_statements.async_select_timestamp_block_range(
+        return block_timestamps_statements.select_timestamp_block_range(
             timestamp=timestamp,
             conn=conn,
             network=network,
@@ -139,3 +138,18 @@ async def async_select_timestamp_block_range(
         raise NotImplementedError()
     else:
         raise Exception('unknown schema: ' + str(timestamp_schema))
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_select_timestamp_block = query_utils.create_async_statement(
+    select_timestamp_block
+)
+async_select_timestamps_blocks = query_utils.create_async_statement(
+    select_timestamps_blocks
+)
+async_select_timestamp_block_range = query_utils.create_async_statement(
+    select_timestamp_block_range
+)
@@ -6,11 +6,12 @@ import toolsql
 
 from ctc import spec
 from ... import management
+from ... import query_utils
 from . import block_timestamps_statements
 from ..blocks import blocks_statements
 
 
-async def async_select_block_timestamp(
+def select_block_timestamp(
     block_number: int,
     *,
     conn: toolsql.SAConnection,
@@ -20,14 +21,14 @@ async def async_select_block_timestamp(
     timestamp_schema = management.get_active_timestamp_schema()
 
     if timestamp_schema == 'block_timestamps':
-        return await block_timestamps_statements.async_select_block_timestamp(
+        return block_timestamps_statements.select_block_timestamp(
             conn=conn,
             block_number=block_number,
             network=network,
         )
 
     elif timestamp_schema == 'blocks':
-        return await blocks_statements.async_select_block_timestamp(
+        return blocks_statements.select_block_timestamp(
             conn=conn,
             block_number=block_number,
             network=network,
@@ -37,7 +38,7 @@ async def async_select_block_timestamp(
         raise Exception('unknown schema: ' + str(timestamp_schema))
 
 
-async def async_select_block_timestamps(
+def select_block_timestamps(
     block_numbers: typing.Sequence[typing.SupportsInt],
     *,
     conn: toolsql.SAConnection,
@@ -47,14 +48,14 @@ async def async_select_block_timestamps(
     timestamp_schema = management.get_active_timestamp_schema()
 
     if timestamp_schema == 'block_timestamps':
-        return await block_timestamps_statements.async_select_block_timestamps(
+        return block_timestamps_statements.select_block_timestamps(
             conn=conn,
             block_numbers=block_numbers,
             network=network,
         )
 
     elif timestamp_schema == 'blocks':
-        return await blocks_statements.async_select_block_timestamps(
+        return blocks_statements.select_block_timestamps(
             conn=conn,
             block_numbers=block_numbers,
             network=network,
@@ -64,7 +65,7 @@ async def async_select_block_timestamps(
         raise Exception('unknown schema: ' + str(timestamp_schema))
 
 
-async def async_select_max_block_number(
+def select_max_block_number(
     *,
     conn: toolsql.SAConnection,
     network: spec.NetworkReference | None = None,
@@ -73,13 +74,13 @@ async def async_select_max_block_number(
     timestamp_schema = management.get_active_timestamp_schema()
 
     if timestamp_schema == 'block_timestamps':
-        return await block_timestamps_statements.async_select_max_block_number(
+        return block_timestamps_statements.select_max_block_number(
             conn=conn,
             network=network,
         )
 
     elif timestamp_schema == 'blocks':
-        return await blocks_statements.async_select_max_block_number(
+        return blocks_statements.select_max_block_number(
             conn=conn,
             network=network,
         )
@@ -88,7 +89,7 @@ async def async_select_max_block_number(
         raise Exception('unknown schema: ' + str(timestamp_schema))
 
 
-async def async_select_max_block_timestamp(
+def select_max_block_timestamp(
     *,
     conn: toolsql.SAConnection,
     network: spec.NetworkReference | None = None,
@@ -96,18 +97,67 @@ async def async_select_max_block_timestamp(
     timestamp_schema = management.get_active_timestamp_schema()
 
     if timestamp_schema == 'block_timestamps':
-        return (
-            await block_timestamps_statements.async_select_max_block_timestamp(
-                conn=conn,
-                network=network,
-            )
+        return block_timestamps_statements.select_max_block_timestamp(
+            conn=conn,
+            network=network,
+        )
+
+    elif timestamp_schema == 'blocks':
+        return blocks_statements.select_max_block_timestamp(
+            conn=conn,
+            network=network,
+        )
+
+    else:
+        raise Exception('unknown schema: ' + str(timestamp_schema))
+
+
+def select_block_timestamp_rows(
+    *,
+    conn: toolsql.SAConnection,
+    network: spec.NetworkReference | None = None,
+    start_block: int | None = None,
+    end_block: int | None = None,
+) -> list[list[int]] | None:
+
+    timestamp_schema = management.get_active_timestamp_schema()
+
+    if timestamp_schema == 'block_timestamps':
+        return block_timestamps_statements.select_block_timestamp_rows(
+            conn=conn,
+            network=network,
+            start_block=start_block,
+            end_block=end_block,
         )
 
     elif timestamp_schema == 'blocks':
-        return await blocks_statements.async_select_max_block_timestamp(
+        return blocks_statements.select_block_timestamp_rows(
             conn=conn,
             network=network,
+            start_block=start_block,
+            end_block=end_block,
         )
 
     else:
         raise Exception('unknown schema: ' + str(timestamp_schema))
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_select_block_timestamp = query_utils.create_async_statement(
+    select_block_timestamp
+)
+async_select_block_timestamps = query_utils.create_async_statement(
+    select_block_timestamps
+)
+async_select_max_block_number = query_utils.create_async_statement(
+    select_max_block_number
+)
+async_select_max_block_timestamp = query_utils.create_async_statement(
+    select_max_block_timestamp
+)
+async_select_block_timestamp_rows = query_utils.create_async_statement(
+    select_block_timestamp_rows
+)
@@ -6,16 +6,26 @@ from ctc import evm
 from ctc import spec
 
 from ... import management
+from ... import bulk_utils
 from ... import connect_utils
 from ... import intake_utils
+from ... import query_utils
 from . import blocks_statements
 from ..block_timestamps import block_timestamps_statements
 from ..block_gas import block_gas_statements
 from .. import block_gas
 
 if typing.TYPE_CHECKING:
+    from typing_extensions import TypedDict
+
     import toolsql
 
+    class BulkIntakeStats(TypedDict):
+        n_blocks: int
+        n_rows: int
+        seconds: float
+        rows_per_second: float
+
 
 #
 # # singular
@@ -54,40 +64,50 @@ async def async_intake_block(
         if engine is None:
             return
 
-        with engine.begin() as conn:
+        def intake(*, conn: toolsql.SAConnection) -> None:
             # do not perform these concurrently to prevent deadlocks
-            await _async_intake_block_object(
+            _intake_block_object(
                 block=block,
                 conn=conn,
                 network=network,
             )
-            await _async_intake_block_timestamp(
+            _intake_block_timestamp(
                 block=block,
                 conn=conn,
                 network=network,
             )
-            await _async_intake_block_gas(
+            _intake_block_gas(
                 block=block,
                 conn=conn,
                 network=network,
             )
 
+        await query_utils.async_run_with_connection(
+            intake, engine=engine, begin=True
+        )
+
+        # add committed block to in-memory timestamp index
+        if intake_block_object or intake_block_timestamp:
+            evm.extend_block_timestamp_index(
+                {block['number']: block['timestamp']}, network=network
+            )
+
 
-async def _async_intake_block_object(
+def _intake_block_object(
     block: spec.Block,
     *,
     network: spec.NetworkReference,
     conn: toolsql.SAConnection,
 ) -> None:
 
-    await blocks_statements.async_upsert_block(
+    blocks_statements.upsert_block(
         block=block,
         conn=conn,
         network=network,
     )
 
 
-async def _async_intake_block_timestamp(
+def _intake_block_timestamp(
     block: spec.Block | None,
     *,
     network: spec.NetworkReference,
@@ -104,7 +124,7 @@ async def _async_intake_block_timestamp(
         timestamp = block['timestamp']
 
     # store in db
-    await block_timestamps_statements.async_upsert_block_timestamp(
+    block_timestamps_statements.upsert_block_timestamp(
         conn=conn,
         block_number=block_number,
         timestamp=timestamp,
@@ -112,7 +132,7 @@ async def _async_intake_block_timestamp(
     )
 
 
-async def _async_intake_block_gas(
+def _intake_block_gas(
     block: spec.Block,
     *,
     conn: toolsql.SAConnection,
@@ -122,7 +142,7 @@ async def _async_intake_block_gas(
     if len(block['transactions']) == 0 or isinstance(
         block['transactions'][0], dict
     ):
-        await block_gas_statements.async_upsert_median_block_gas_fee(
+        block_gas_statements.upsert_median_block_gas_fee(
             block_number=block['number'],
             median_gas_fee=evm.compute_median_block_gas_fee(
                 block,
@@ -170,26 +190,40 @@ async def async_intake_blocks(
         if engine is None:
             return
 
-        with engine.begin() as conn:
+        def intake(*, conn: toolsql.SAConnection) -> None:
             # do not perform these concurrently to prevent deadlocks
-            await _async_intake_block_objects(
+            _intake_block_objects(
                 confirmed_blocks=confirmed_blocks,
                 network=network,
                 conn=conn,
             )
-            await _async_intake_block_timestamps(
+            _intake_block_timestamps(
                 confirmed_blocks=confirmed_blocks,
                 network=network,
                 conn=conn,
             )
-            await _async_intake_blocks_gas(
+            _intake_blocks_gas(
                 blocks=blocks,
                 conn=conn,
                 network=network,
             )
 
+        await query_utils.async_run_with_connection(
+            intake, engine=engine, begin=True
+        )
 
-async def _async_intake_block_objects(
+        # add committed blocks to in-memory timestamp index
+        if intake_block_objects or intake_block_timestamps:
+            evm.extend_block_timestamp_index(
+                {
+                    block['number']: block['timestamp']
+                    for block in confirmed_blocks
+                },
+                network=network,
+            )
+
+
+def _intake_block_objects(
     confirmed_blocks: typing.Sequence[spec.Block],
     *,
     network: spec.NetworkReference,
@@ -197,14 +231,14 @@ async def _async_intake_block_objects(
 ) -> None:
 
     if len(confirmed_blocks) > 0:
-        await blocks_statements.async_upsert_blocks(
+        blocks_statements.upsert_blocks(
             conn=conn,
             blocks=confirmed_blocks,
             network=network,
         )
 
 
-async def _async_intake_block_timestamps(
+def _intake_block_timestamps(
     confirmed_blocks: typing.Sequence[spec.Block] | None = None,
     *,
     confirmed_block_timestamps: typing.Mapping[int, int] | None = None,
@@ -225,13 +259,13 @@ async def _async_intake_block_timestamps(
 
     # store in database
     if len(confirmed_block_timestamps) > 0:
-        await block_timestamps_statements.async_upsert_block_timestamps(
+        block_timestamps_statements.upsert_block_timestamps(
             conn=conn,
             block_timestamps=confirmed_block_timestamps,
         )
 
 
-async def _async_intake_blocks_gas(
+def _intake_blocks_gas(
     blocks: typing.Sequence[spec.Block],
     *,
     conn: toolsql.SAConnection,
@@ -257,8 +291,216 @@ async def _async_intake_blocks_gas(
 
     # insert into db
     if len(blocks_gas_data) > 0:
-        await block_gas_statements.async_upsert_median_blocks_gas_fees(
+        block_gas_statements.upsert_median_blocks_gas_fees(
             block_gas_data=blocks_gas_data,
             conn=conn,
             network=network,
         )
+
+
+#
+# # bulk
+#
+
+
+async def async_bulk_intake_blocks(
+    blocks: typing.Iterable[spec.Block] | typing.AsyncIterable[spec.Block],
+    network: spec.NetworkReference,
+    *,
+    batch_size: int = 10_000,
+    latest_block_number: int | None = None,
+    verbose: bool = False,
+) -> BulkIntakeStats:
+    """intake a large stream of blocks using bulk upserts
+
+    blocks are written in batches of batch_size, each batch in a single
+    transaction. returns number of rows written and rows per second
+    """
+    import time
+
+    from ctc import rpc
+
+    stats: BulkIntakeStats = {
+        'n_blocks': 0,
+        'n_rows': 0,
+        'seconds': 0.0,
+        'rows_per_second': 0.0,
+    }
+
+    # check whether schemas are active
+    active_schemas = management.get_active_schemas()
+    intake_block_objects = bool(active_schemas.get('blocks'))
+    intake_block_timestamps = bool(active_schemas.get('block_timestamps'))
+    intake_block_gases = bool(active_schemas.get('block_gas'))
+    if not (
+        intake_block_objects or intake_block_timestamps or intake_block_gases
+    ):
+        return stats
+
+    engine = connect_utils.create_engine(
+        schema_name='block_timestamps',
+        network=network,
+    )
+    if engine is None:
+        return stats
+
+    # fetch latest block once for confirming every batch
+    if latest_block_number is None:
+        network_name = evm.get_network_name(network)
+        latest_block_number = await rpc.async_eth_block_number(
+            provider={'network': network_name}
+        )
+
+    start_time = time.time()
+    async for batch in _iterate_block_batches(blocks, batch_size=batch_size):
+        confirmed_blocks = (
+            await intake_utils.async_filter_fully_confirmed_blocks(
+                blocks=batch,
+                network=network,
+                latest_block_number=latest_block_number,
+            )
+        )
+        tables = _get_bulk_block_rows(
+            blocks=batch,
+            confirmed_blocks=confirmed_blocks,
+            network=network,
+            intake_block_objects=intake_block_objects,
+            intake_block_timestamps=intake_block_timestamps,
+            intake_block_gases=intake_block_gases,
+        )
+
+        def intake(*, conn: toolsql.SAConnection) -> int:
+            n_rows = 0
+            for table, (columns, primary_key, rows) in tables.items():
+                n_rows += bulk_utils.bulk_upsert_rows(
+                    conn,
+                    table=table,
+                    columns=columns,
+                    rows=rows,
+                    primary_key=primary_key,
+                )
+            return n_rows
+
+        stats['n_rows'] += await query_utils.async_run_with_connection(
+            intake, engine=engine, begin=True
+        )
+        if intake_block_objects or intake_block_timestamps:
+            evm.extend_block_timestamp_index(
+                {
+                    block['number']: block['timestamp']
+                    for block in confirmed_blocks
+                },
+                network=network,
+            )
+        stats['n_blocks'] += len(batch)
+        stats['seconds'] = time.time() - start_time
+        if stats['seconds'] > 0:
+            stats['rows_per_second'] = stats['n_rows'] / stats['seconds']
+        if verbose:
+            print(
+                'intook',
+                stats['n_blocks'],
+                'blocks,',
+                stats['n_rows'],
+                'rows,',
+                '%.1f' % stats['rows_per_second'],
+                'rows per second',
+            )
+
+    return stats
+
+
+async def _iterate_block_batches(
+    blocks: typing.Iterable[spec.Block] | typing.AsyncIterable[spec.Block],
+    *,
+    batch_size: int,
+) -> typing.AsyncIterator[list[spec.Block]]:
+
+    batch: list[spec.Block] = []
+    if isinstance(blocks, typing.AsyncIterable):
+        async for block in blocks:
+            batch.append(block)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    else:
+        for block in blocks:
+            batch.append(block)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if len(batch) > 0:
+        yield batch
+
+
+def _get_bulk_block_rows(
+    *,
+    blocks: typing.Sequence[spec.Block],
+    confirmed_blocks: typing.Sequence[spec.Block],
+    network: spec.NetworkReference,
+    intake_block_objects: bool,
+    intake_block_timestamps: bool,
+    intake_block_gases: bool,
+) -> dict[str, tuple[list[str], list[str], list[tuple[typing.Any, ...]]]]:
+    """build rows of each table, as {table: (columns, primary_key, rows)}"""
+    import json
+
+    from ... import schema_utils
+
+    tables: dict[
+        str, tuple[list[str], list[str], list[tuple[typing.Any, ...]]]
+    ] = {}
+
+    if intake_block_objects and len(confirmed_blocks) > 0:
+        table = schema_utils.get_table_name('blocks', network=network)
+        schema = schema_utils.get_raw_schema('blocks')
+        columns = []
+        text_columns = []
+        json_columns = []
+        for column in schema['tables']['blocks']['columns']:
+            columns.append(column['name'])
+            if column['type'] == 'Text':
+                text_columns.append(column['name'])
+            elif column['type'] == 'JSON':
+                json_columns.append(column['name'])
+        block_rows: list[tuple[typing.Any, ...]] = []
+        for block in confirmed_blocks:
+            row = dict(blocks_statements.remove_block_transactions(block))
+            for name in json_columns:
+                if name in row:
+                    row[name] = json.dumps(row[name])
+            for name in text_columns:
+                if isinstance(row.get(name), int):
+                    row[name] = str(row[name])
+            block_rows.append(tuple(row.get(name) for name in columns))
+        tables[table] = (columns, ['number'], block_rows)
+
+    if intake_block_timestamps and len(confirmed_blocks) > 0:
+        table = schema_utils.get_table_name('block_timestamps', network=network)
+        timestamp_rows: list[tuple[typing.Any, ...]] = [
+            (block['number'], block['timestamp']) for block in confirmed_blocks
+        ]
+        tables[table] = (
+            ['block_number', 'timestamp'],
+            ['block_number'],
+            timestamp_rows,
+        )
+
+    if intake_block_gases:
+        # only performed on blocks that have full transactions included
+        gas_rows: list[tuple[typing.Any, ...]] = []
+        for block in blocks:
+            if len(block['transactions']) == 0 or isinstance(
+                block['transactions'][0], dict
+            ):
+                fee = evm.compute_median_block_gas_fee(block, normalize=False)
+                gas_rows.append((block['number'], block['timestamp'], fee))
+        if len(gas_rows) > 0:
+            table = schema_utils.get_table_name('block_gas', network=network)
+            tables[table] = (
+                ['block_number', 'timestamp', 'median_gas_fee'],
+                ['block_number'],
+                gas_rows,
+            )
+
+    return tables
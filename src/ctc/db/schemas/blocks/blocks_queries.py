@@ -5,11 +5,11 @@ from . import blocks_statements
 
 
 async_query_block = query_utils.wrap_selector_with_connection(
-    blocks_statements.async_select_block,
+    blocks_statements.select_block,
     'blocks',
 )
 
 async_query_blocks = query_utils.wrap_selector_with_connection(
-    blocks_statements.async_select_blocks,
+    blocks_statements.select_blocks,
     'blocks',
 )
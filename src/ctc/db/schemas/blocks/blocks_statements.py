@@ -5,10 +5,12 @@ import typing
 import toolsql
 
 from ctc import spec
+from ... import query_utils
 from ... import schema_utils
 
 
-def _remove_block_transactions(block: spec.Block) -> spec.Block:
+def remove_block_transactions(block: spec.Block) -> spec.Block:
+    """replace full transactions of block with transaction hashes"""
     txs = block['transactions']
     if len(txs) > 0 and isinstance(txs[0], dict):
         if typing.TYPE_CHECKING:
@@ -21,7 +23,7 @@ def _remove_block_transactions(block: spec.Block) -> spec.Block:
         return block
 
 
-async def async_upsert_block(
+def upsert_block(
     *,
     block: spec.Block,
     conn: toolsql.SAConnection,
@@ -29,7 +31,7 @@ async def async_upsert_block(
 ) -> None:
 
     table = schema_utils.get_table_name('blocks', network=network)
-    block = _remove_block_transactions(block)
+    block = remove_block_transactions(block)
     toolsql.insert(
         conn=conn,
         table=table,
@@ -38,7 +40,7 @@ async def async_upsert_block(
     )
 
 
-async def async_upsert_blocks(
+def upsert_blocks(
     *,
     blocks: typing.Sequence[spec.Block],
     conn: toolsql.SAConnection,
@@ -46,7 +48,7 @@ async def async_upsert_blocks(
 ) -> None:
 
     table = schema_utils.get_table_name('blocks', network=network)
-    blocks = [_remove_block_transactions(block) for block in blocks]
+    blocks = [remove_block_transactions(block) for block in blocks]
     toolsql.insert(
         conn=conn,
         table=table,
@@ -55,7 +57,7 @@ async def async_upsert_blocks(
     )
 
 
-async def async_select_block(
+def select_block(
     block_number: int | str,
     *,
     conn: toolsql.SAConnection,
@@ -81,7 +83,7 @@ async def async_select_block(
     return block
 
 
-async def async_select_blocks(
+def select_blocks(
     block_numbers: typing.Sequence[int | str] | None = None,
     *,
     start_block: int | None = None,
@@ -131,7 +133,7 @@ async def async_select_blocks(
     return [blocks_by_number.get(number) for number in block_numbers]
 
 
-async def async_delete_block(
+def delete_block(
     block_number: int | str,
     *,
     conn: toolsql.SAConnection,
@@ -147,7 +149,7 @@ async def async_delete_block(
     )
 
 
-async def async_delete_blocks(
+def delete_blocks(
     block_numbers: typing.Sequence[int | str] | None = None,
     *,
     start_block: int | None = None,
@@ -182,7 +184,7 @@ async def async_delete_blocks(
 #
 
 
-async def async_select_block_timestamp(
+def select_block_timestamp(
     block_number: int,
     *,
     conn: toolsql.SAConnection,
@@ -205,7 +207,7 @@ async def async_select_block_timestamp(
     return result
 
 
-async def async_select_block_timestamps(
+def select_block_timestamps(
     block_numbers: typing.Sequence[typing.SupportsInt],
     *,
     conn: toolsql.SAConnection,
@@ -235,7 +237,7 @@ async def async_select_block_timestamps(
     ]
 
 
-async def async_select_max_block_number(
+def select_max_block_number(
     *,
     conn: toolsql.SAConnection,
     network: spec.NetworkReference | None = None,
@@ -260,7 +262,7 @@ async def async_select_max_block_number(
         return None
 
 
-async def async_select_max_block_timestamp(
+def select_max_block_timestamp(
     *,
     conn: toolsql.SAConnection,
     network: spec.NetworkReference | None = None,
@@ -285,7 +287,66 @@ async def async_select_max_block_timestamp(
         return max_timestamp
 
 
+def select_block_timestamp_rows(
+    *,
+    conn: toolsql.SAConnection,
+    network: spec.NetworkReference | None = None,
+    start_block: int | None = None,
+    end_block: int | None = None,
+) -> list[list[int]] | None:
+
+    table = schema_utils.get_table_name('blocks', network=network)
+    query: dict[str, typing.Any] = {}
+    if start_block is not None:
+        query['where_gte'] = {'number': start_block}
+    if end_block is not None:
+        query['where_lte'] = {'number': end_block}
+    rows: list[list[int]] | None = toolsql.select(
+        conn=conn,
+        table=table,
+        only_columns=['number', 'timestamp'],
+        order_by={'column': 'number'},
+        row_format='list',
+        raise_if_table_dne=False,
+        **query,
+    )
+    return rows
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_upsert_block = query_utils.create_async_statement(upsert_block)
+async_upsert_blocks = query_utils.create_async_statement(upsert_blocks)
+async_select_block = query_utils.create_async_statement(select_block)
+async_select_blocks = query_utils.create_async_statement(select_blocks)
+async_delete_block = query_utils.create_async_statement(delete_block)
+async_delete_blocks = query_utils.create_async_statement(delete_blocks)
+async_select_block_timestamp = query_utils.create_async_statement(
+    select_block_timestamp
+)
+async_select_block_timestamps = query_utils.create_async_statement(
+    select_block_timestamps
+)
+async_select_max_block_number = query_utils.create_async_statement(
+    select_max_block_number
+)
+async_select_max_block_timestamp = query_utils.create_async_statement(
+    select_max_block_timestamp
+)
+async_select_block_timestamp_rows = query_utils.create_async_statement(
+    select_block_timestamp_rows
+)
+
+
 __all__ = (
+    'upsert_block',
+    'upsert_blocks',
+    'select_block',
+    'select_blocks',
+    'delete_block',
+    'delete_blocks',
     'async_upsert_block',
     'async_upsert_blocks',
     'async_select_block',
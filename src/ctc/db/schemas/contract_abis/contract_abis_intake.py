@@ -3,6 +3,7 @@ from __future__ import annotations
 from ctc import spec
 from ... import connect_utils
 from ... import management
+from ... import query_utils
 
 from . import contract_abis_statements
 
@@ -31,11 +32,12 @@ async def async_intake_contract_abi(
         network=network,
     )
     if engine is not None:
-        with engine.begin() as conn:
-            await contract_abis_statements.async_upsert_contract_abi(
-                address=contract_address,
-                abi=abi,
-                includes_proxy=includes_proxy,
-                conn=conn,
-                network=network,
-            )
+        await query_utils.async_run_with_connection(
+            contract_abis_statements.upsert_contract_abi,
+            engine=engine,
+            begin=True,
+            address=contract_address,
+            abi=abi,
+            includes_proxy=includes_proxy,
+            network=network,
+        )
@@ -5,11 +5,11 @@ from . import contract_abis_statements
 
 
 async_query_contract_abi = query_utils.wrap_selector_with_connection(
-    contract_abis_statements.async_select_contract_abi,
+    contract_abis_statements.select_contract_abi,
     'contract_abis',
 )
 
 async_query_contract_abis = query_utils.wrap_selector_with_connection(
-    contract_abis_statements.async_select_contract_abis,
+    contract_abis_statements.select_contract_abis,
     'contract_abis',
 )
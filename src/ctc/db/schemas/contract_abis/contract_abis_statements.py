@@ -6,10 +6,11 @@ import typing
 import toolsql
 
 from ctc import spec
+from ... import query_utils
 from ... import schema_utils
 
 
-async def async_upsert_contract_abi(
+def upsert_contract_abi(
     *,
     address: spec.Address,
     abi: spec.ContractABI,
@@ -33,7 +34,7 @@ async def async_upsert_contract_abi(
     )
 
 
-async def async_select_contract_abi(
+def select_contract_abi(
     address: spec.Address,
     *,
     network: spec.NetworkReference | None = None,
@@ -60,7 +61,7 @@ async def async_select_contract_abi(
         return None
 
 
-async def async_select_contract_abis(
+def select_contract_abis(
     addresses: typing.Sequence[spec.Address] | None = None,
     *,
     network: spec.NetworkReference | None = None,
@@ -91,7 +92,7 @@ async def async_select_contract_abis(
     }
 
 
-async def async_delete_contract_abi(
+def delete_contract_abi(
     address: spec.Address,
     *,
     conn: toolsql.SAConnection,
@@ -106,3 +107,21 @@ async def async_delete_contract_abi(
         table=table,
         row_id=address.lower(),
     )
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_upsert_contract_abi = query_utils.create_async_statement(
+    upsert_contract_abi
+)
+async_select_contract_abi = query_utils.create_async_statement(
+    select_contract_abi
+)
+async_select_contract_abis = query_utils.create_async_statement(
+    select_contract_abis
+)
+async_delete_contract_abi = query_utils.create_async_statement(
+    delete_contract_abi
+)
@@ -4,6 +4,7 @@ from ctc import spec
 from ... import connect_utils
 from ... import intake_utils
 from ... import management
+from ... import query_utils
 
 from . import contract_creation_blocks_statements
 
@@ -28,10 +29,11 @@ async def async_intake_contract_creation_block(
         network=network,
     )
     if engine is not None:
-        with engine.begin() as conn:
-            await contract_creation_blocks_statements.async_upsert_contract_creation_block(
-                conn=conn,
-                block_number=block,
-                address=contract_address,
-                network=network,
-            )
+        await query_utils.async_run_with_connection(
+            contract_creation_blocks_statements.upsert_contract_creation_block,
+            engine=engine,
+            begin=True,
+            block_number=block,
+            address=contract_address,
+            network=network,
+        )
@@ -5,10 +5,11 @@ import typing
 import toolsql
 
 from ctc import spec
+from ... import query_utils
 from ... import schema_utils
 
 
-async def async_upsert_contract_creation_block(
+def upsert_contract_creation_block(
     *,
     address: spec.Address,
     block_number: int,
@@ -30,7 +31,7 @@ async def async_upsert_contract_creation_block(
     )
 
 
-async def async_select_contract_creation_block(
+def select_contract_creation_block(
     address: spec.Address,
     *,
     network: spec.NetworkReference | None = None,
@@ -57,7 +58,7 @@ async def async_select_contract_creation_block(
     return result
 
 
-async def async_select_contract_creation_blocks(
+def select_contract_creation_blocks(
     *,
     network: spec.NetworkReference | None = None,
     conn: toolsql.SAConnection,
@@ -76,7 +77,7 @@ async def async_select_contract_creation_blocks(
     return result
 
 
-async def async_delete_contract_creation_block(
+def delete_contract_creation_block(
     address: spec.Address,
     *,
     network: spec.NetworkReference | None = None,
@@ -91,3 +92,21 @@ async def async_delete_contract_creation_block(
         table=table,
         row_id=address.lower(),
     )
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_upsert_contract_creation_block = query_utils.create_async_statement(
+    upsert_contract_creation_block
+)
+async_select_contract_creation_block = query_utils.create_async_statement(
+    select_contract_creation_block
+)
+async_select_contract_creation_blocks = query_utils.create_async_statement(
+    select_contract_creation_blocks
+)
+async_delete_contract_creation_block = query_utils.create_async_statement(
+    delete_contract_creation_block
+)
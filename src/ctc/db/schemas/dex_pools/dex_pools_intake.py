@@ -4,8 +4,12 @@ import typing
 
 from ctc import spec
 from ... import connect_utils
+from ... import query_utils
 from . import dex_pools_statements
 
+if typing.TYPE_CHECKING:
+    import toolsql
+
 
 async def async_intake_dex_pools(
     *,
@@ -40,15 +44,20 @@ async def async_intake_dex_pools(
     )
     if engine is None:
         return None
-    with engine.begin() as conn:
-        await dex_pools_statements.async_upsert_dex_pools(
+
+    def upsert(*, conn: toolsql.SAConnection) -> None:
+        dex_pools_statements.upsert_dex_pools(
             dex_pools=dex_pools,
             conn=conn,
             network=network,
         )
-        await dex_pools_statements.async_upsert_dex_pool_factory_query(
+        dex_pools_statements.upsert_dex_pool_factory_query(
             factory=factory,
             last_scanned_block=last_scanned_block,
             conn=conn,
             network=network,
         )
+
+    await query_utils.async_run_with_connection(
+        upsert, engine=engine, begin=True
+    )
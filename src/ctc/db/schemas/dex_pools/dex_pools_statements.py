@@ -6,6 +6,7 @@ import typing
 import toolsql
 
 from ctc import spec
+from ... import query_utils
 from ... import schema_utils
 
 
@@ -14,7 +15,7 @@ def _format_dex_pool(dex_pool: spec.DexPool) -> spec.DexPool:
     return formatted
 
 
-async def async_upsert_dex_pool(
+def upsert_dex_pool(
     *,
     dex_pool: spec.DexPool,
     conn: toolsql.SAConnection,
@@ -30,7 +31,7 @@ async def async_upsert_dex_pool(
     )
 
 
-async def async_upsert_dex_pools(
+def upsert_dex_pools(
     *,
     dex_pools: typing.Sequence[spec.DexPool],
     conn: toolsql.SAConnection,
@@ -48,7 +49,7 @@ async def async_upsert_dex_pools(
     )
 
 
-async def async_upsert_dex_pool_factory_query(
+def upsert_dex_pool_factory_query(
     *,
     factory: spec.Address,
     last_scanned_block: int,
@@ -70,7 +71,7 @@ async def async_upsert_dex_pool_factory_query(
     )
 
 
-async def async_delete_dex_pool(
+def delete_dex_pool(
     *,
     conn: toolsql.SAConnection,
     dex_pool: spec.Address,
@@ -86,7 +87,7 @@ async def async_delete_dex_pool(
     )
 
 
-async def async_delete_dex_pools(
+def delete_dex_pools(
     *,
     conn: toolsql.SAConnection,
     dex_pools: typing.Sequence[spec.Address],
@@ -102,7 +103,7 @@ async def async_delete_dex_pools(
     )
 
 
-async def async_delete_dex_pool_factory_query(
+def delete_dex_pool_factory_query(
     *,
     conn: toolsql.SAConnection,
     factory: spec.Address,
@@ -120,7 +121,7 @@ async def async_delete_dex_pool_factory_query(
     )
 
 
-async def async_select_dex_pool(
+def select_dex_pool(
     address: spec.Address,
     *,
     conn: toolsql.SAConnection,
@@ -141,7 +142,7 @@ async def async_select_dex_pool(
     return result  # type: ignore
 
 
-async def async_select_dex_pools_by_id(
+def select_dex_pools_by_id(
     addresses: typing.Sequence[spec.Address],
     *,
     conn: toolsql.SAConnection,
@@ -154,7 +155,7 @@ async def async_select_dex_pools_by_id(
 
     table = schema_utils.get_table_name('dex_pools', network=network)
 
-    results = await toolsql.select(
+    results = toolsql.select(
         conn=conn,
         table=table,
         raise_if_table_dne=False,
@@ -168,7 +169,7 @@ async def async_select_dex_pools_by_id(
     return {address: results_by_address.get(address) for address in addresses}
 
 
-async def async_select_dex_pools(
+def select_dex_pools(
     *,
     factory: spec.Address | None = None,
     factories: typing.Sequence[spec.Address] | None = None,
@@ -189,7 +190,7 @@ async def async_select_dex_pools(
         query.setdefault('where_in', {})
         query['where_in']['factory'] = factories
     if assets is not None:
-        import sqlalchemy  # type: ignore
+        import sqlalchemy
 
         # get table object
         try:
@@ -222,7 +223,7 @@ async def async_select_dex_pools(
     )
 
 
-async def async_select_dex_pool_factory_last_scanned_block(
+def select_dex_pool_factory_last_scanned_block(
     factory: spec.Address,
     *,
     conn: toolsql.SAConnection,
@@ -247,3 +248,29 @@ async def async_select_dex_pool_factory_last_scanned_block(
         return result
     else:
         raise Exception('bad data format received from db')
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_upsert_dex_pool = query_utils.create_async_statement(upsert_dex_pool)
+async_upsert_dex_pools = query_utils.create_async_statement(upsert_dex_pools)
+async_upsert_dex_pool_factory_query = query_utils.create_async_statement(
+    upsert_dex_pool_factory_query
+)
+async_delete_dex_pool = query_utils.create_async_statement(delete_dex_pool)
+async_delete_dex_pools = query_utils.create_async_statement(delete_dex_pools)
+async_delete_dex_pool_factory_query = query_utils.create_async_statement(
+    delete_dex_pool_factory_query
+)
+async_select_dex_pool = query_utils.create_async_statement(select_dex_pool)
+async_select_dex_pools_by_id = query_utils.create_async_statement(
+    select_dex_pools_by_id
+)
+async_select_dex_pools = query_utils.create_async_statement(select_dex_pools)
+async_select_dex_pool_factory_last_scanned_block = (
+    query_utils.create_async_statement(
+        select_dex_pool_factory_last_scanned_block
+    )
+)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from ctc import spec
-from .. import connect_utils
+from ... import connect_utils
+from ... import query_utils
 from . import erc20_metadata_statements
 
 
@@ -20,12 +21,13 @@ async def async_intake_erc20_metadata(
     )
     if engine is None:
         return
-    with engine.begin() as conn:
-        await erc20_metadata_statements.async_upsert_erc20_metadata(
-            conn=conn,
-            network=network,
-            address=address,
-            decimals=decimals,
-            symbol=symbol,
-            name=name,
-        )
+    await query_utils.async_run_with_connection(
+        erc20_metadata_statements.upsert_erc20_metadata,
+        engine=engine,
+        begin=True,
+        network=network,
+        address=address,
+        decimals=decimals,
+        symbol=symbol,
+        name=name,
+    )
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
-import asyncio
 import typing
 
 import toolsql
 
 from ctc import config
 from ctc import spec
+from ... import query_utils
 from ... import schema_utils
 
 
-async def async_upsert_erc20_metadata(
+def upsert_erc20_metadata(
     *,
     address: spec.Address,
     network: spec.NetworkReference,
@@ -48,20 +48,17 @@ async def async_upsert_erc20_metadata(
     )
 
 
-async def async_upsert_erc20s_metadata(
+def upsert_erc20s_metadata(
     *,
     erc20s_metadata: typing.Sequence[spec.ERC20Metadata],
     network: spec.NetworkReference,
     conn: toolsql.SAConnection,
 ) -> None:
-    coroutines = [
-        async_upsert_erc20_metadata(conn=conn, network=network, **metadata)
-        for metadata in erc20s_metadata
-    ]
-    await asyncio.gather(*coroutines)
+    for metadata in erc20s_metadata:
+        upsert_erc20_metadata(conn=conn, network=network, **metadata)
 
 
-async def async_select_erc20_metadata(
+def select_erc20_metadata(
     address: spec.Address | None = None,
     *,
     symbol: str | None = None,
@@ -98,7 +95,7 @@ async def async_select_erc20_metadata(
     return erc20_metadata
 
 
-async def async_select_erc20s_metadata(
+def select_erc20s_metadata(
     addresses: typing.Sequence[spec.Address],
     *,
     network: spec.NetworkReference | None = None,
@@ -125,7 +122,7 @@ async def async_select_erc20s_metadata(
     return [results_by_address.get(address) for address in addresses]
 
 
-async def async_delete_erc20_metadata(
+def delete_erc20_metadata(
     address: spec.Address,
     *,
     network: spec.NetworkReference,
@@ -135,7 +132,7 @@ async def async_delete_erc20_metadata(
     toolsql.delete(table=table, conn=conn, row_id=address.lower())
 
 
-async def async_delete_erc20s_metadata(
+def delete_erc20s_metadata(
     addresses: typing.Sequence[spec.Address],
     *,
     network: spec.NetworkReference,
@@ -147,3 +144,27 @@ async def async_delete_erc20s_metadata(
         conn=conn,
         row_ids=[address.lower() for address in addresses],
     )
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_upsert_erc20_metadata = query_utils.create_async_statement(
+    upsert_erc20_metadata
+)
+async_upsert_erc20s_metadata = query_utils.create_async_statement(
+    upsert_erc20s_metadata
+)
+async_select_erc20_metadata = query_utils.create_async_statement(
+    select_erc20_metadata
+)
+async_select_erc20s_metadata = query_utils.create_async_statement(
+    select_erc20s_metadata
+)
+async_delete_erc20_metadata = query_utils.create_async_statement(
+    delete_erc20_metadata
+)
+async_delete_erc20s_metadata = query_utils.create_async_statement(
+    delete_erc20s_metadata
+)
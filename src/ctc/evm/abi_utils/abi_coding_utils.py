@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import functools
 import typing
 
 from ctc import spec
 from .. import binary_utils
 
+if typing.TYPE_CHECKING:
+    ABITypes = typing.Union[
+        spec.ABIDatatypeStr, typing.Tuple[spec.ABIDatatypeStr, ...]
+    ]
+    ABIDecoder = typing.Callable[[bytes], typing.Any]
+    ABIEncoder = typing.Callable[[typing.Any], bytes]
+
+
+# number of compiled encoders and decoders kept, each per type signature
+abi_codec_cache_size = 4096
+
 
 def abi_decode(
     data: spec.GenericBinaryData,
@@ -12,14 +24,11 @@ def abi_decode(
 ) -> typing.Any:
     """decode ABI-encoded data, similar to solidity's abi.decode()"""
 
-    import eth_abi_lite
-
     data = binary_utils.binary_convert(data, 'binary')
 
-    if isinstance(types, str):
-        return eth_abi_lite.decode_single(types, data)
-    else:
-        return eth_abi_lite.decode_abi(types, data)
+    if not isinstance(types, str):
+        types = tuple(types)
+    return get_abi_decoder(types)(data)
 
 
 def abi_encode(
@@ -28,12 +37,9 @@ def abi_encode(
 ) -> bytes:
     """encode data in ABI format, similar to solidity's abi.encode()"""
 
-    import eth_abi_lite
-
-    if isinstance(types, str):
-        return eth_abi_lite.encode_single(types, data)
-    else:
-        return eth_abi_lite.encode_abi(types, data)
+    if not isinstance(types, str):
+        types = tuple(types)
+    return get_abi_encoder(types)(data)
 
 
 def abi_encode_packed(
@@ -48,3 +54,69 @@ def abi_encode_packed(
         return packed.encode_single_packed(types, data)
     else:
         return packed.encode_abi_packed(types, data)
+
+
+#
+# # compiled codecs
+#
+
+
+@functools.lru_cache(maxsize=abi_codec_cache_size)
+def get_abi_decoder(types: ABITypes) -> ABIDecoder:
+    """get decoder compiled for type or tuple of types
+
+    a tuple of types is decoded like solidity's abi.decode() of many values,
+    which is equivalent to decoding a single tuple type
+    """
+    from eth_abi_lite import decoding
+    from eth_abi_lite.registry import registry
+
+    # eth_abi_lite is untyped, so its decoders are annotated here
+    decoder: typing.Callable[[typing.Any], typing.Any]
+    if isinstance(types, str):
+        decoder = registry.get_decoder(types)
+    else:
+        tuple_decoder_factory: typing.Callable[
+            ..., typing.Callable[[typing.Any], typing.Any]
+        ] = decoding.TupleDecoder
+        decoder = tuple_decoder_factory(
+            decoders=[registry.get_decoder(item) for item in types]
+        )
+    stream_class: typing.Callable[
+        [bytes], typing.Any
+    ] = decoding.ContextFramesBytesIO
+
+    def decode(data: bytes) -> typing.Any:
+        if not isinstance(data, (bytes, bytearray)):
+            raise TypeError(
+                'data must be of bytes type, got ' + str(type(data))
+            )
+        return decoder(stream_class(data))
+
+    return decode
+
+
+@functools.lru_cache(maxsize=abi_codec_cache_size)
+def get_abi_encoder(types: ABITypes) -> ABIEncoder:
+    """get encoder compiled for type or tuple of types"""
+    from eth_abi_lite import encoding
+    from eth_abi_lite.registry import registry
+
+    # eth_abi_lite is untyped, so its encoders are annotated here
+    encoder: ABIEncoder
+    if isinstance(types, str):
+        encoder = registry.get_encoder(types)
+    else:
+        tuple_encoder_factory: typing.Callable[
+            ..., ABIEncoder
+        ] = encoding.TupleEncoder
+        encoder = tuple_encoder_factory(
+            encoders=[registry.get_encoder(item) for item in types]
+        )
+    return encoder
+
+
+def clear_abi_codec_cache() -> None:
+    """clear compiled encoders and decoders"""
+    get_abi_decoder.cache_clear()
+    get_abi_encoder.cache_clear()
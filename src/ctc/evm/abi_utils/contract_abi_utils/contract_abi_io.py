@@ -28,10 +28,48 @@ async def async_get_contract_abi(
     if db_intake is None:
         db_intake = use_db
 
+    from ctc import rpc
+
     if network is None:
-        from ctc import rpc
         network = rpc.get_provider_network(provider)
 
+    # concurrent lookups of the same abi share one lookup
+    key = (
+        network,
+        contract_address.lower(),
+        block,
+        proxy_implementation,
+        db_query,
+        db_intake,
+    )
+    return await rpc.async_coalesce(
+        key,
+        lambda: _async_get_contract_abi_uncoalesced(
+            contract_address,
+            network=network,
+            provider=provider,
+            db_query=db_query,
+            db_intake=db_intake,
+            block=block,
+            proxy_implementation=proxy_implementation,
+            verbose=verbose,
+        ),
+        namespace='abi',
+    )
+
+
+async def _async_get_contract_abi_uncoalesced(
+    contract_address: spec.Address,
+    *,
+    network: spec.NetworkReference,
+    provider: spec.ProviderReference,
+    db_query: bool,
+    db_intake: bool,
+    block: spec.BlockNumberReference | None,
+    proxy_implementation: spec.Address | None,
+    verbose: bool,
+) -> spec.ContractABI:
+
     # load from db
     if db_query:
         from ctc import db
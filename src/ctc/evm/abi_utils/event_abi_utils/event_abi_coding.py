@@ -72,7 +72,9 @@ def decode_event_topics(
             decoded_topics.append(topic)  # type: ignore
         else:
             topic = binary_utils.binary_convert(topic, 'binary')
-            decoded_topic = abi_coding_utils.abi_decode(topic, indexed_type)
+            decoded_topic = abi_coding_utils.get_abi_decoder(indexed_type)(
+                topic
+            )
             decoded_topics.append(decoded_topic)
 
     # package output
@@ -140,9 +142,8 @@ def decode_event_unindexed_data(
 
     # decode data
     data = binary_utils.binary_convert(data, 'binary')
-    decoded = abi_coding_utils.abi_decode(
-        data, '(' + ','.join(unindexed_types) + ')'
-    )
+    decoder = abi_coding_utils.get_abi_decoder(tuple(unindexed_types))
+    decoded = decoder(data)
 
     # package outputs
     if not use_names:
@@ -204,6 +205,167 @@ def normalize_event(
     return normalized
 
 
+#
+# # columnar normalization
+#
+
+# output names of raw log keys, for logs in raw or snake case format
+_log_columns = {
+    'address': 'address',
+    'blockHash': 'block_hash',
+    'block_hash': 'block_hash',
+    'blockNumber': 'block_number',
+    'block_number': 'block_number',
+    'logIndex': 'log_index',
+    'log_index': 'log_index',
+    'transactionHash': 'transaction_hash',
+    'transaction_hash': 'transaction_hash',
+    'transactionIndex': 'transaction_index',
+    'transaction_index': 'transaction_index',
+}
+_log_quantity_columns = {'block_number', 'log_index', 'transaction_index'}
+
+
+def normalize_events(
+    events: typing.Sequence[spec.RawLog],
+    event_abi: spec.EventABI,
+    *,
+    arg_prefix: str = 'arg__',
+) -> dict[str, typing.Any]:
+    """normalize raw logs of one event into columns of decoded event data
+
+    produces the same fields as normalize_event(), as one column per field.
+    logs can be raw rpc logs or logs with decoded quantities and snake case
+    keys. columns of integers of up to 64 bits and bools are numpy arrays
+    """
+    return normalize_log_columns(
+        compact_logs(events), event_abi, arg_prefix=arg_prefix
+    )
+
+
+def compact_logs(
+    events: typing.Sequence[spec.RawLog],
+) -> dict[str, list[typing.Any]]:
+    """convert raw logs into one list per log key, omitting removed flags"""
+    if len(events) == 0:
+        return {'topics': [], 'data': []}
+    return {
+        key: [event[key] for event in events]  # type: ignore
+        for key in events[0].keys()
+        if key != 'removed'
+    }
+
+
+def normalize_log_columns(
+    log_columns: typing.Mapping[str, typing.Sequence[typing.Any]],
+    event_abi: spec.EventABI,
+    *,
+    arg_prefix: str = 'arg__',
+) -> dict[str, typing.Any]:
+    """normalize logs compacted by compact_logs(), see normalize_events()"""
+    from ..function_abi_utils import function_abi_coding
+
+    topics = log_columns['topics']
+    n_events = len(topics)
+
+    # log metadata
+    columns: dict[str, typing.Any] = {}
+    for key, values in log_columns.items():
+        if key in ('data', 'topics'):
+            continue
+        name = _log_columns.get(key, key)
+        if name in _log_quantity_columns:
+            values = _parse_hex_quantities(values)
+        columns[name] = values
+    if 'address' in columns:
+        columns['contract_address'] = columns['address']
+    columns['event_name'] = [event_abi['name']] * n_events
+    columns['event_hash'] = [event_topics[0] for event_topics in topics]
+
+    def add_column(name: str, values: typing.Any) -> None:
+        key = arg_prefix + name
+        if key in columns:
+            raise Exception('event key collision: ' + str(key))
+        columns[key] = values
+
+    # indexed args, decoded from fixed width topic words
+    indexed_types = event_abi_parsing.get_event_indexed_types(event_abi)
+    indexed_names = event_abi_parsing.get_event_indexed_names(event_abi)
+    for t, (name, indexed_type) in enumerate(zip(indexed_names, indexed_types)):
+        words = [
+            binary_utils.binary_convert(event_topics[t + 1], 'prefix_hex')
+            for event_topics in topics
+        ]
+        if function_abi_coding.is_static_output_type(indexed_type):
+            values = function_abi_coding.decode_function_outputs(
+                encoded_outputs=words,
+                output_types=[indexed_type],
+                as_arrays=True,
+            )
+            values = _standardize_event_column(values, indexed_type)
+        else:
+            # hashes of dynamic values cannot be decoded
+            values = words
+        add_column(name, values)
+
+    # unindexed args, decoded from data words in bulk
+    unindexed_types = event_abi_parsing.get_event_unindexed_types(event_abi)
+    unindexed_names = event_abi_parsing.get_event_unindexed_names(event_abi)
+    if len(unindexed_types) > 0:
+        data_columns = function_abi_coding.decode_function_outputs(
+            encoded_outputs=log_columns['data'],
+            output_types=unindexed_types,
+            delist_single_outputs=False,
+            as_arrays=True,
+        )
+        for name, unindexed_type, values in zip(
+            unindexed_names, unindexed_types, data_columns
+        ):
+            add_column(name, _standardize_event_column(values, unindexed_type))
+
+    return columns
+
+
+def _parse_hex_quantities(values: typing.Sequence[typing.Any]) -> typing.Any:
+    """parse hex quantities of up to 64 bits into int64 array"""
+    import numpy as np
+
+    if all(isinstance(value, int) for value in values):
+        return np.array(values, dtype=np.int64)
+    padded = ''.join([value[2:].rjust(16, '0') for value in values])
+    if len(padded) == 16 * len(values):
+        try:
+            as_bytes = bytes.fromhex(padded)
+        except ValueError:
+            pass
+        else:
+            return np.frombuffer(as_bytes, dtype='>u8').astype(np.int64)
+    return np.array([int(value, 16) for value in values], dtype=np.int64)
+
+
+def _standardize_event_column(
+    values: typing.Any, abi_type: spec.ABIDatumType
+) -> typing.Any:
+    """convert decoded output column to the values of normalize_event()"""
+    import numpy as np
+
+    if abi_type == 'bytes32':
+        # function outputs convert bytes32 to hex, event args keep bytes
+        return [
+            bytes.fromhex(value[2:]) if isinstance(value, str) else value
+            for value in values
+        ]
+    elif (
+        isinstance(values, np.ndarray)
+        and values.dtype == np.uint64
+        and abi_type != 'uint64'
+    ):
+        # unsigned ints of less than 64 bits fit in int64
+        return values.astype(np.int64)
+    else:
+        return values
+
+
 #
 # # dataframes
 #
@@ -159,9 +159,8 @@ def encode_function_parameters(
         raise Exception(
             'improper number of arguments for function, cannot encode'
         )
-    encoded_bytes = abi_coding_utils.abi_encode(
-        parameters, '(' + ','.join(parameter_types) + ')'
-    )
+    encoder = abi_coding_utils.get_abi_encoder(tuple(parameter_types))
+    encoded_bytes = encoder(parameters)
 
     # convert to output format
     return encoded_bytes
@@ -173,13 +172,11 @@ def decode_function_parameters(
 ) -> list[typing.Any]:
     """decode function parameters using solidity-style ABI decoding"""
 
-    parameter_types_str = '(' + ','.join(parameter_types) + ')'
     encoded_parameters = binary_utils.binary_convert(
         encoded_parameters, 'binary'
     )
-    parameters = abi_coding_utils.abi_decode(
-        encoded_parameters, parameter_types_str
-    )
+    decoder = abi_coding_utils.get_abi_decoder(tuple(parameter_types))
+    parameters = decoder(encoded_parameters)
 
     return list(parameters)
 
@@ -233,13 +230,11 @@ def decode_function_output(
         output_types = function_abi_parsing.get_function_output_types(
             function_abi
         )
-    output_types_str = '(' + ','.join(output_types) + ')'
 
     # decode
     encoded_output = binary_utils.binary_convert(encoded_output, 'binary')
-    decoded_output = abi_coding_utils.abi_decode(
-        encoded_output, output_types_str
-    )
+    decoder = abi_coding_utils.get_abi_decoder(tuple(output_types))
+    decoded_output = decoder(encoded_output)
 
     # decode strings
     new_decoded_output = []
@@ -265,3 +260,177 @@ def decode_function_output(
             decoded_output = dict(zip(names, decoded_output))
 
     return decoded_output
+
+
+#
+# # batch output decoding
+#
+
+
+def is_static_output_type(output_type: spec.ABIDatumType) -> bool:
+    """whether output type occupies exactly one 32 byte word"""
+    import re
+
+    if output_type in ('address', 'bool'):
+        return True
+    match = re.fullmatch(r'u?int(\d*)', output_type)
+    if match is not None:
+        bits = match.group(1)
+        return bits == '' or (int(bits) % 8 == 0 and 8 <= int(bits) <= 256)
+    match = re.fullmatch(r'bytes(\d+)', output_type)
+    if match is not None:
+        return 1 <= int(match.group(1)) <= 32
+    return False
+
+
+def decode_function_outputs(
+    *,
+    encoded_outputs: typing.Sequence[spec.BinaryData],
+    output_types: typing.Optional[list[spec.ABIDatumType]] = None,
+    function_abi: spec.FunctionABI | None = None,
+    delist_single_outputs: bool = True,
+    package_named_outputs: bool = False,
+    as_arrays: bool = False,
+) -> typing.Any:
+    """decode outputs of many calls of the same function
+
+    if every output type is static, the outputs are decoded together as one
+    buffer of 32 byte words, otherwise each output is decoded on its own
+
+    if as_arrays is False, returns list of outputs like those returned by
+    decode_function_output(). if as_arrays is True, returns one column per
+    output type, delisted if there is a single output, where integers of up
+    to 64 bits and bools are numpy arrays
+    """
+    import numpy as np
+
+    # get output types
+    if output_types is None:
+        if function_abi is None:
+            raise Exception('must specify function_abi')
+        output_types = function_abi_parsing.get_function_output_types(
+            function_abi
+        )
+    n_types = len(output_types)
+    n_outputs = len(encoded_outputs)
+
+    # decode static outputs together, from hex if outputs are hex
+    columns: list[typing.Any] | None = None
+    if n_types > 0 and all(
+        is_static_output_type(output_type) for output_type in output_types
+    ):
+        buffer = _join_static_outputs(encoded_outputs, n_bytes=32 * n_types)
+        if buffer is not None:
+            words = np.frombuffer(buffer, dtype=np.uint8).reshape(
+                n_outputs, n_types, 32
+            )
+            columns = [
+                _decode_static_column(words[:, t, :], output_type)
+                for t, output_type in enumerate(output_types)
+            ]
+
+    # decode other outputs one at a time
+    if columns is None:
+        rows = [
+            decode_function_output(
+                encoded_output=encoded_output,
+                output_types=output_types,
+                delist_single_outputs=False,
+            )
+            for encoded_output in encoded_outputs
+        ]
+        columns = [[row[t] for row in rows] for t in range(n_types)]
+
+    if as_arrays:
+        if delist_single_outputs and n_types == 1:
+            return columns[0]
+        else:
+            return columns
+
+    # convert columns to rows
+    python_columns = [
+        column.tolist() if isinstance(column, np.ndarray) else column
+        for column in columns
+    ]
+    if delist_single_outputs and n_types == 1:
+        return python_columns[0]
+    outputs: list[typing.Any] = [list(row) for row in zip(*python_columns)]
+    if n_outputs > 0 and n_types == 0:
+        outputs = [[] for i in range(n_outputs)]
+    if package_named_outputs and n_types > 1:
+        if function_abi is None:
+            raise Exception('must specify function_abi')
+        names = function_abi_parsing.get_function_output_names(function_abi)
+        if all(name is not None for name in names):
+            outputs = [dict(zip(names, output)) for output in outputs]
+    return outputs
+
+
+def _join_static_outputs(
+    encoded_outputs: typing.Sequence[spec.BinaryData], *, n_bytes: int
+) -> bytes | None:
+    """join outputs into one buffer, or None if any output is malformed"""
+
+    n_chars = 2 + 2 * n_bytes
+    if all(
+        isinstance(output, str) and len(output) == n_chars
+        for output in encoded_outputs
+    ):
+        hex_outputs = typing.cast(typing.Sequence[str], encoded_outputs)
+        try:
+            return bytes.fromhex(
+                ''.join([output[2:] for output in hex_outputs])
+            )
+        except ValueError:
+            return None
+    elif all(
+        isinstance(output, bytes) and len(output) == n_bytes
+        for output in encoded_outputs
+    ):
+        return b''.join(typing.cast(typing.Sequence[bytes], encoded_outputs))
+    else:
+        return None
+
+
+def _decode_static_column(
+    words: spec.NumpyArray, output_type: spec.ABIDatumType
+) -> typing.Any:
+    """decode column of 32 byte words, as (n_outputs, 32) uint8 array"""
+    import numpy as np
+
+    if output_type == 'bool':
+        return words[:, 31] != 0
+
+    elif output_type == 'address':
+        hex_data = words[:, 12:].tobytes().hex()
+        return [
+            '0x' + hex_data[i : i + 40] for i in range(0, len(hex_data), 40)
+        ]
+
+    elif output_type.startswith('bytes'):
+        size = int(output_type[5:])
+        data = words[:, :size].tobytes()
+        if size == 32:
+            hex_data = data.hex()
+            return [
+                '0x' + hex_data[i : i + 64] for i in range(0, len(hex_data), 64)
+            ]
+        else:
+            return [data[i : i + size] for i in range(0, len(data), size)]
+
+    else:
+        signed = not output_type.startswith('u')
+        bits = output_type[3:] if signed else output_type[4:]
+        if bits != '' and int(bits) <= 64:
+            dtype = '>i8' if signed else '>u8'
+            native = np.int64 if signed else np.uint64
+            return (
+                np.ascontiguousarray(words[:, 24:])
+                .view(dtype)[:, 0]
+                .astype(native)
+            )
+        data = words.tobytes()
+        return [
+            int.from_bytes(data[i : i + 32], 'big', signed=signed)
+            for i in range(0, len(data), 32)
+        ]
@@ -1,3 +1,4 @@
+from .block_timestamp_index import *
 from .block_to_timestamp import *
 from .block_time_predictions import *
 from .timestamp_to_block import *
@@ -0,0 +1,707 @@
+"""process-level index of block timestamps
+
+the index of each network holds the timestamps of a contiguous range of
+blocks in a monotonic int32 array, so that a whole vector of timestamps is
+converted to blocks using a single np.searchsorted, and blocks are converted
+to timestamps by array indexing
+
+indices are built from the db by async_build_block_timestamp_index() or
+`ctc build-timestamp-index`, which read the db in bounded chunks and save the
+index to disk. lookups load saved indices lazily, starting from an empty index
+if none has been saved. indices are extended as confirmed blocks are intaken,
+and saved to disk off of the event loop after every
+block_timestamp_index_save_interval new blocks and when a cli command exits
+
+networks can also have a memory-mapped block timestamp archive, which is
+consulted for blocks outside of the index. archives load in milliseconds
+and are shared across processes through the page cache
+"""
+
+from __future__ import annotations
+
+import typing
+
+from ctc import spec
+
+if typing.TYPE_CHECKING:
+    import asyncio
+
+    from typing_extensions import Literal
+
+    from ctc.db.management.compression.block_timestamp_compression import (
+        BlockTimestampArchive,
+    )
+
+
+# number of new blocks after which an index is saved to disk
+block_timestamp_index_save_interval = 10_000
+
+# number of blocks read from db per query when building an index
+block_timestamp_index_build_chunk_size = 100_000
+
+_block_timestamp_index_state = {
+    'enabled': True,
+}
+
+# chain id -> index
+_block_timestamp_indices: dict[int, BlockTimestampIndex] = {}
+
+# chain id -> archive, or None if network has no archive
+_block_timestamp_archives: dict[int, BlockTimestampArchive | None] = {}
+
+
+def set_block_timestamp_index_enabled(enabled: bool) -> None:
+    """set whether block timestamp lookups use the in-memory index"""
+    _block_timestamp_index_state['enabled'] = enabled
+
+
+def get_block_timestamp_index_enabled() -> bool:
+    """get whether block timestamp lookups use the in-memory index"""
+    return _block_timestamp_index_state['enabled']
+
+
+def get_block_timestamp_index_path(
+    network: spec.NetworkReference | None = None,
+) -> str:
+    """get path where block timestamp index of network is saved"""
+    import os
+
+    from ctc import config
+    from ... import network_utils
+
+    if network is None:
+        network = config.get_default_network()
+        if network is None:
+            raise Exception('must specify network or configure default network')
+    network_name = network_utils.get_network_name(network, require=True)
+    return os.path.join(
+        config.get_data_dir(),
+        'evm/networks',
+        network_name,
+        'block_timestamp_index.npz',
+    )
+
+
+def clear_block_timestamp_indices() -> None:
+    """remove loaded block timestamp indices and archives from memory
+
+    indices are not saved
+    """
+    _block_timestamp_indices.clear()
+    _block_timestamp_archives.clear()
+
+
+def save_block_timestamp_indices() -> None:
+    """save loaded block timestamp indices that have unsaved blocks"""
+    for index in _block_timestamp_indices.values():
+        if index.n_unsaved > 0 and index.path is not None:
+            index.save()
+
+
+async def async_wait_for_block_timestamp_index_saves() -> None:
+    """wait for background saves of loaded block timestamp indices
+
+    call before save_block_timestamp_indices() so that a slower background
+    save cannot replace a newer file
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    pending = [
+        index._pending_save
+        for index in _block_timestamp_indices.values()
+        if index._pending_save is not None
+        and not index._pending_save.done()
+        and index._pending_save.get_loop() is loop
+    ]
+    if len(pending) > 0:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def get_loaded_block_timestamp_index(
+    network: spec.NetworkReference | None = None,
+) -> BlockTimestampIndex | None:
+    """get block timestamp index of network if already loaded"""
+    if not get_block_timestamp_index_enabled():
+        return None
+    return _block_timestamp_indices.get(_get_chain_id(network))
+
+
+async def async_get_block_timestamp_index(
+    network: spec.NetworkReference | None = None,
+) -> BlockTimestampIndex | None:
+    """get block timestamp index of network, loading it if need be
+
+    returns None if the index is disabled
+    """
+    from ctc.rpc import rpc_coalescing
+
+    if not get_block_timestamp_index_enabled():
+        return None
+    chain_id = _get_chain_id(network)
+    index = _block_timestamp_indices.get(chain_id)
+    if index is None:
+        index = await rpc_coalescing.async_coalesce(
+            chain_id,
+            lambda: _async_load_block_timestamp_index(network),
+            namespace='block_timestamp_index',
+        )
+    return index
+
+
+async def async_build_block_timestamp_index(
+    network: spec.NetworkReference | None = None,
+    *,
+    chunk_size: int | None = None,
+) -> BlockTimestampIndex:
+    """build block timestamp index of network from db and save it to disk
+
+    the index holds the longest contiguous run of blocks in the db, which is
+    read chunk_size blocks at a time
+    """
+    import asyncio
+
+    from ctc import db
+
+    if chunk_size is None:
+        chunk_size = block_timestamp_index_build_chunk_size
+
+    best: BlockTimestampIndex | None = None
+    current: BlockTimestampIndex | None = None
+    max_block = await db.async_query_max_block_number(network=network)
+    if max_block is not None:
+        for start_block in range(0, max_block + 1, chunk_size):
+            rows = await db.async_query_block_timestamp_rows(
+                network=network,
+                start_block=start_block,
+                end_block=start_block + chunk_size - 1,
+            )
+            if rows is None or len(rows) == 0:
+                continue
+            for run_start, timestamps in _split_contiguous_runs(rows):
+                if current is not None:
+                    n_added = current.extend(
+                        block_numbers=range(
+                            run_start, run_start + len(timestamps)
+                        ),
+                        timestamps=timestamps,
+                    )
+                    if n_added == len(timestamps):
+                        continue
+                if current is not None and (
+                    best is None or len(current) > len(best)
+                ):
+                    best = current
+                current = BlockTimestampIndex(
+                    start_block=run_start, timestamps=timestamps
+                )
+    if current is not None and (best is None or len(current) > len(best)):
+        best = current
+    if best is None:
+        best = BlockTimestampIndex(start_block=0, timestamps=[])
+
+    best.path = get_block_timestamp_index_path(network)
+    best.n_unsaved = 0
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, best.save)
+    _block_timestamp_indices[_get_chain_id(network)] = best
+    return best
+
+
+def extend_block_timestamp_index(
+    block_timestamps: typing.Mapping[int, int],
+    *,
+    network: spec.NetworkReference | None = None,
+) -> None:
+    """add confirmed blocks to block timestamp index of network if loaded"""
+    index = get_loaded_block_timestamp_index(network)
+    if index is not None and len(block_timestamps) > 0:
+        index.extend(
+            block_numbers=list(block_timestamps.keys()),
+            timestamps=list(block_timestamps.values()),
+        )
+
+
+def _get_chain_id(network: spec.NetworkReference | None) -> int:
+    from ctc import config
+    from ... import network_utils
+
+    if network is None:
+        network = config.get_default_network()
+        if network is None:
+            raise Exception('must specify network or configure default network')
+    return network_utils.get_network_chain_id(network)
+
+
+def _split_contiguous_runs(
+    rows: typing.Sequence[typing.Sequence[int]],
+) -> list[tuple[int, spec.NumpyArray]]:
+    """split sorted [block_number, timestamp] rows into monotonic runs"""
+    import numpy as np
+
+    array = np.array(rows, dtype=np.int64)
+    block_numbers = array[:, 0]
+    timestamps = array[:, 1]
+    breaks = np.nonzero(
+        (np.diff(block_numbers) != 1) | (np.diff(timestamps) < 0)
+    )[0]
+    starts = np.concatenate([[0], breaks + 1])
+    ends = np.concatenate([breaks + 1, [len(block_numbers)]])
+    return [
+        (int(block_numbers[start]), timestamps[start:end])
+        for start, end in zip(starts, ends)
+    ]
+
+
+async def _async_load_block_timestamp_index(
+    network: spec.NetworkReference | None,
+) -> BlockTimestampIndex:
+    import asyncio
+    import os
+
+    chain_id = _get_chain_id(network)
+    index = _block_timestamp_indices.get(chain_id)
+    if index is not None:
+        return index
+
+    path = get_block_timestamp_index_path(network)
+    if os.path.isfile(path):
+        loop = asyncio.get_running_loop()
+        index = await loop.run_in_executor(None, BlockTimestampIndex.load, path)
+    else:
+        index = BlockTimestampIndex(start_block=0, timestamps=[], path=path)
+
+    _block_timestamp_indices[chain_id] = index
+    return index
+
+
+class BlockTimestampIndex:
+    """timestamps of a contiguous range of blocks"""
+
+    def __init__(
+        self,
+        *,
+        start_block: int,
+        timestamps: typing.Sequence[int] | spec.NumpyArray,
+        path: str | None = None,
+    ) -> None:
+        import numpy as np
+
+        self.start_block = start_block
+        self.path = path
+        self.n_unsaved = 0
+        self._pending_save: asyncio.Future[str] | None = None
+
+        # over-allocated buffer, so that appending blocks is amortized O(1)
+        self._buffer = np.array(timestamps, dtype=np.int32)
+        self._n = len(self._buffer)
+
+    @property
+    def timestamps(self) -> spec.NumpyArray:
+        """timestamps of blocks start_block through end_block"""
+        return self._buffer[: self._n]
+
+    @property
+    def end_block(self) -> int:
+        return self.start_block + self._n - 1
+
+    def __len__(self) -> int:
+        return self._n
+
+    #
+    # # lookups
+    #
+
+    def get_timestamps(
+        self, block_numbers: typing.Sequence[int] | spec.NumpyArray
+    ) -> spec.NumpyArray:
+        """get timestamps of blocks, -1 for blocks outside of index"""
+        import numpy as np
+
+        indices = np.asarray(block_numbers, dtype=np.int64) - self.start_block
+        found = (indices >= 0) & (indices < self._n)
+        output = np.full(len(indices), -1, dtype=np.int64)
+        output[found] = self.timestamps[indices[found]]
+        return output
+
+    def search(
+        self,
+        timestamps: typing.Sequence[int] | spec.NumpyArray,
+        *,
+        mode: Literal['<=', '>=', '=='] = '>=',
+    ) -> spec.NumpyArray:
+        """get blocks of timestamps, -1 where index cannot determine block
+
+        - '>=': first block with timestamp >= given timestamp
+        - '<=': last block with timestamp <= given timestamp
+        - '==': first block with timestamp == given timestamp
+
+        a block is only returned if its neighbor needed to rule out other
+        blocks is also in the index
+        """
+        import numpy as np
+        from .timestamp_to_block import block_time_singular
+
+        # search with the dtype of the index so that it is not copied
+        info = np.iinfo(np.int32)
+        query = np.clip(np.asarray(timestamps), info.min, info.max)
+
+        n = self._n
+        indices = block_time_singular._search_timestamp_array(
+            self.timestamps, query.astype(np.int32), mode=mode
+        )
+
+        # require the neighbor that rules out other blocks to be in index
+        if mode == '<=':
+            indices[indices == n - 1] = -1
+        elif self.start_block > 0:
+            indices[indices == 0] = -1
+
+        return np.where(indices >= 0, indices + self.start_block, -1)
+
+    #
+    # # updates
+    #
+
+    def extend(
+        self,
+        *,
+        block_numbers: typing.Sequence[int] | spec.NumpyArray,
+        timestamps: typing.Sequence[int] | spec.NumpyArray,
+    ) -> int:
+        """add blocks adjacent to index, returning number of blocks added
+
+        blocks that are not contiguous with the index, or that would break
+        its monotonicity, are ignored
+        """
+        import numpy as np
+
+        numbers = np.asarray(block_numbers, dtype=np.int64)
+        values = np.asarray(timestamps, dtype=np.int64)
+        if len(numbers) == 0:
+            return 0
+        numbers, first = np.unique(numbers, return_index=True)
+        values = values[first]
+
+        if self._n == 0:
+            self.start_block = int(numbers[0])
+
+        # append blocks after end of index
+        after = numbers > self.end_block
+        n_appended = _get_contiguous_length(
+            numbers[after],
+            values[after],
+            next_block=self.end_block + 1,
+            previous_timestamp=self.timestamps[-1] if self._n > 0 else None,
+        )
+        if n_appended > 0:
+            self._append(values[after][:n_appended])
+
+        # prepend blocks before start of index
+        before = numbers < self.start_block
+        if before.any():
+            n_prepended = _get_contiguous_length(
+                -numbers[before][::-1],
+                -values[before][::-1],
+                next_block=-self.start_block + 1,
+                previous_timestamp=-self.timestamps[0],
+            )
+        else:
+            n_prepended = 0
+        if n_prepended > 0:
+            prepended = values[before][len(values[before]) - n_prepended :]
+            self._buffer = np.concatenate(
+                [prepended.astype(np.int32), self.timestamps]
+            )
+            self._n = len(self._buffer)
+            self.start_block -= n_prepended
+
+        n_added = n_appended + n_prepended
+        self.n_unsaved += n_added
+        if (
+            self.path is not None
+            and self.n_unsaved >= block_timestamp_index_save_interval
+        ):
+            self._save_in_background()
+        return n_added
+
+    def _append(self, values: spec.NumpyArray) -> None:
+        import numpy as np
+
+        n = self._n + len(values)
+        if n > len(self._buffer):
+            buffer = np.empty(max(n, 2 * len(self._buffer)), dtype=np.int32)
+            buffer[: self._n] = self.timestamps
+            self._buffer = buffer
+        self._buffer[self._n : n] = values
+        self._n = n
+
+    #
+    # # persistence
+    #
+
+    def save(self, path: str | None = None) -> str:
+        """save index to path, replacing any previous file atomically"""
+        if path is None:
+            path = self.path
+            if path is None:
+                raise Exception('must specify path')
+        _write_index_file(
+            path, start_block=self.start_block, timestamps=self.timestamps
+        )
+        if path == self.path:
+            self.n_unsaved = 0
+        return path
+
+    def _save_in_background(self) -> None:
+        """save index to its path in a worker thread of the running loop
+
+        saved timestamps are never modified in place, so the worker writes a
+        view of the buffer while later blocks are appended
+        """
+        import asyncio
+        import functools
+
+        if self.path is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+            return
+        if self._pending_save is not None and not self._pending_save.done():
+            return
+
+        n_saved = self.n_unsaved
+
+        def on_saved(future: asyncio.Future[str]) -> None:
+            # unsuccessful saves are retried after the next extension
+            if not future.cancelled() and future.exception() is None:
+                self.n_unsaved = max(self.n_unsaved - n_saved, 0)
+
+        self._pending_save = loop.run_in_executor(
+            None,
+            functools.partial(
+                _write_index_file,
+                self.path,
+                start_block=self.start_block,
+                timestamps=self.timestamps,
+            ),
+        )
+        self._pending_save.add_done_callback(on_saved)
+
+    @classmethod
+    def load(cls, path: str) -> BlockTimestampIndex:
+        """load index saved to path"""
+        import numpy as np
+
+        with np.load(path) as data:
+            return cls(
+                start_block=int(data['start_block']),
+                timestamps=data['timestamps'],
+                path=path,
+            )
+
+
+def _write_index_file(
+    path: str, *, start_block: int, timestamps: spec.NumpyArray
+) -> str:
+    """write index file, replacing any previous file atomically"""
+    import os
+    import tempfile
+    import numpy as np
+
+    # temporary file is unique, so that concurrent saves do not collide
+    dirname = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dirname, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=dirname, prefix=os.path.basename(path) + '.', suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(
+                f,
+                start_block=np.int64(start_block),
+                timestamps=timestamps,
+            )
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def _get_contiguous_length(
+    numbers: spec.NumpyArray,
+    values: spec.NumpyArray,
+    *,
+    next_block: int,
+    previous_timestamp: int | None,
+) -> int:
+    """get length of sorted blocks that continue from next_block"""
+    import numpy as np
+
+    if len(numbers) == 0:
+        return 0
+    valid = numbers == next_block + np.arange(len(numbers))
+    if previous_timestamp is not None:
+        diffs = np.diff(values, prepend=previous_timestamp)
+    else:
+        diffs = np.diff(values, prepend=values[0])
+    valid &= diffs >= 0
+    invalid = np.nonzero(~valid)[0]
+    if len(invalid) == 0:
+        return len(numbers)
+    return int(invalid[0])
+
+
+#
+# # archives
+#
+
+
+def get_block_timestamp_archives_dir(
+    network: spec.NetworkReference | None = None,
+) -> str:
+    """get directory where block timestamp archive of network is saved"""
+    import os
+
+    index_path = get_block_timestamp_index_path(network)
+    return os.path.join(os.path.dirname(index_path), 'block_timestamp_archives')
+
+
+def get_block_timestamp_archive(
+    network: spec.NetworkReference | None = None,
+) -> BlockTimestampArchive | None:
+    """get memory-mapped block timestamp archive of network, if one exists"""
+    import os
+
+    from ctc.db.management.compression import block_timestamp_compression
+
+    chain_id = _get_chain_id(network)
+    if chain_id in _block_timestamp_archives:
+        return _block_timestamp_archives[chain_id]
+
+    # use archive with the most blocks
+    archive = None
+    archives_dir = get_block_timestamp_archives_dir(network)
+    if os.path.isdir(archives_dir):
+        for name in _list_block_timestamp_archive_names(archives_dir):
+            candidate = (
+                block_timestamp_compression.load_block_timestamp_archive(
+                    os.path.join(archives_dir, name)
+                )
+            )
+            if archive is None or len(candidate) > len(archive):
+                archive = candidate
+
+    _block_timestamp_archives[chain_id] = archive
+    return archive
+
+
+def _list_block_timestamp_archive_names(archives_dir: str) -> list[str]:
+    """list names in archives dir that match the archive name template"""
+    import os
+
+    from ctc.db.management.compression import block_timestamp_compression
+
+    return [
+        name
+        for name in sorted(os.listdir(archives_dir))
+        if block_timestamp_compression.parse_block_timestamp_archive_name(name)
+        is not None
+    ]
+
+
+async def async_save_block_timestamp_archive(
+    network: spec.NetworkReference | None = None,
+    *,
+    checkpoint_interval: int | None = None,
+) -> str | None:
+    """save block timestamp index of network as its archive
+
+    replaces previous archives of network, returns None if index is empty
+    """
+    import os
+    import shutil
+
+    from ctc.db.management.compression import block_timestamp_compression
+
+    index = await async_get_block_timestamp_index(network)
+    if index is None or len(index) == 0:
+        return None
+
+    if checkpoint_interval is None:
+        checkpoint_interval = (
+            block_timestamp_compression.default_checkpoint_interval
+        )
+    archives_dir = get_block_timestamp_archives_dir(network)
+    path = block_timestamp_compression.save_block_timestamp_archive(
+        index.timestamps,
+        start_block=index.start_block,
+        dirname=archives_dir,
+        checkpoint_interval=checkpoint_interval,
+    )
+
+    # remove previous archives
+    _block_timestamp_archives.pop(_get_chain_id(network), None)
+    for name in _list_block_timestamp_archive_names(archives_dir):
+        other_path = os.path.join(archives_dir, name)
+        if os.path.normpath(other_path) != os.path.normpath(path):
+            shutil.rmtree(other_path)
+
+    return path
+
+
+#
+# # lookups across in-memory index and archive
+#
+
+
+async def _async_get_local_block_timestamps(
+    block_numbers: typing.Sequence[int],
+    network: spec.NetworkReference | None,
+) -> spec.NumpyArray:
+    """get timestamps of blocks from index or archive, -1 if unavailable"""
+    import numpy as np
+
+    blocks = np.asarray(block_numbers, dtype=np.int64)
+    output = np.full(len(blocks), -1, dtype=np.int64)
+
+    index = await async_get_block_timestamp_index(network)
+    if index is not None:
+        output = index.get_timestamps(blocks)
+
+    missing = output < 0
+    if missing.any():
+        archive = get_block_timestamp_archive(network)
+        if archive is not None:
+            output[missing] = archive.get_timestamps(blocks[missing])
+
+    return output
+
+
+async def _async_search_local_block_timestamps(
+    timestamps: typing.Sequence[int],
+    network: spec.NetworkReference | None,
+    *,
+    mode: Literal['<=', '>=', '=='],
+) -> spec.NumpyArray:
+    """get blocks of timestamps from index or archive, -1 if unavailable"""
+    import numpy as np
+
+    query = np.asarray(timestamps, dtype=np.int64)
+    output = np.full(len(query), -1, dtype=np.int64)
+
+    index = await async_get_block_timestamp_index(network)
+    if index is not None:
+        output = index.search(query, mode=mode)
+
+    missing = output < 0
+    if missing.any():
+        archive = get_block_timestamp_archive(network)
+        if archive is not None:
+            output[missing] = archive.search(query[missing], mode=mode)
+
+    return output
@@ -6,6 +6,7 @@ from ctc import spec
 
 from .. import block_crud
 from .. import block_normalize
+from . import block_timestamp_index
 
 
 async def async_get_block_timestamp(
@@ -22,6 +23,16 @@ async def async_get_block_timestamp(
         from ctc import db
 
         network = rpc.get_provider_network(provider)
+
+        # in-memory index or archive
+        local_timestamps = (
+            await block_timestamp_index._async_get_local_block_timestamps(
+                [block], network
+            )
+        )
+        if local_timestamps[0] >= 0:
+            return int(local_timestamps[0])
+
         timestamp = await db.async_query_block_timestamp(
             block_number=block,
             network=network,
@@ -50,26 +61,38 @@ async def async_get_block_timestamps(
         provider=provider,
     )
 
-    # get timestamps from db
+    results: dict[int, int | None] = {}
+    remaining_blocks: typing.Sequence[int] = blocks
+
+    # get timestamps from in-memory index or archive
     if use_db:
+        network = rpc.get_provider_network(provider)
+        local_timestamps = (
+            await block_timestamp_index._async_get_local_block_timestamps(
+                blocks, network
+            )
+        )
+        for block, local_timestamp in zip(blocks, local_timestamps.tolist()):
+            if local_timestamp >= 0:
+                results[block] = local_timestamp
+        remaining_blocks = [block for block in blocks if block not in results]
+
+    # get timestamps from db
+    if use_db and len(remaining_blocks) > 0:
         from ctc import db
 
-        network = rpc.get_provider_network(provider)
         db_timestamps = await db.async_query_block_timestamps(
-            block_numbers=blocks,
+            block_numbers=remaining_blocks,
             network=network,
         )
         if db_timestamps is None:
-            db_timestamps = [None for block in blocks]
-        results: dict[int, int | None] = dict(zip(blocks, db_timestamps))
-        remaining_blocks: typing.Sequence[int] = [
+            db_timestamps = [None for block in remaining_blocks]
+        results.update(zip(remaining_blocks, db_timestamps))
+        remaining_blocks = [
             block
-            for block, timestamp in zip(blocks, db_timestamps)
+            for block, timestamp in zip(remaining_blocks, db_timestamps)
             if timestamp is None
         ]
-    else:
-        results = {}
-        remaining_blocks = blocks
 
     # get timestamps from rpc
     if len(remaining_blocks) > 0:
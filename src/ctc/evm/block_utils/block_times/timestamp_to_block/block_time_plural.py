@@ -3,6 +3,7 @@ from __future__ import annotations
 import typing
 
 from ctc import spec
+from .. import block_timestamp_index
 from . import block_time_search
 from . import block_time_singular
 
@@ -29,9 +30,6 @@ async def async_get_blocks_of_timestamps(
     ):
         import numpy as np
 
-        if mode != '>=':
-            raise NotImplementedError()
-
         if block_timestamp_array is None:
             if block_timestamps is None:
                 raise Exception('must specify more arguments')
@@ -41,45 +39,59 @@ async def async_get_blocks_of_timestamps(
                 raise Exception('must specify more arguments')
             block_number_array = np.array(list(block_timestamps.keys()))
 
-        blocks = []
-        for timestamp in timestamps:
-            block = block_time_singular._get_block_of_timestamp_from_arrays(
-                timestamp=timestamp,
-                block_timestamp_array=block_timestamp_array,
-                block_number_array=block_number_array,
-                verbose=False,
-            )
-            blocks.append(block)
-
-        return blocks
+        indices = block_time_singular._search_timestamp_array(
+            block_timestamp_array, timestamps, mode=mode
+        )
+        if (indices < 0).any():
+            raise Exception('timestamps not within range of arrays')
+        return [int(block) for block in block_number_array[indices]]
 
     else:
 
-        # get timestamps form db
+        results: dict[int, int] = {}
+        remaining_timestamps: list[int] = list(timestamps)
+
+        # get timestamps from in-memory index or archive
         if use_db:
-            from ctc import db
             from ctc import rpc
 
             network = rpc.get_provider_network(provider)
+            local_blocks = await block_timestamp_index._async_search_local_block_timestamps(
+                remaining_timestamps, network, mode=mode
+            )
+            for timestamp, local_block in zip(
+                remaining_timestamps, local_blocks.tolist()
+            ):
+                if local_block >= 0:
+                    results[timestamp] = local_block
+            remaining_timestamps = [
+                timestamp
+                for timestamp in remaining_timestamps
+                if timestamp not in results
+            ]
+
+        # get timestamps form db
+        if use_db and len(remaining_timestamps) > 0:
+            from ctc import db
+
             db_blocks = await db.async_query_timestamps_blocks(
                 network=network,
-                timestamps=timestamps,
+                timestamps=remaining_timestamps,
                 mode=mode,
             )
             if db_blocks is None:
-                db_blocks = [None for timestamp in timestamps]
+                db_blocks = [None for timestamp in remaining_timestamps]
 
             # package non-null results
-            results: dict[int, int] = {}
-            remaining_timestamps: list[int] = []
-            for possible_block, timestamp in zip(db_blocks, timestamps):
+            db_remaining_timestamps: list[int] = []
+            for possible_block, timestamp in zip(
+                db_blocks, remaining_timestamps
+            ):
                 if possible_block is None:
-                    remaining_timestamps.append(timestamp)
+                    db_remaining_timestamps.append(timestamp)
                 else:
                     results[timestamp] = possible_block
-        else:
-            remaining_timestamps = list(timestamps)
-            results = {}
+            remaining_timestamps = db_remaining_timestamps
 
         # get timestamps from rpc node
         if len(remaining_timestamps) > 0:
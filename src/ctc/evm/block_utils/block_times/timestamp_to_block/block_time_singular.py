@@ -7,6 +7,7 @@ if typing.TYPE_CHECKING:
 
 from ctc import spec
 from .. import block_crud
+from .. import block_timestamp_index
 from . import block_time_search
 
 
@@ -40,6 +41,7 @@ async def async_get_block_of_timestamp(
             block_number_array=block_number_array,
             block_timestamps=block_timestamps,
             verbose=verbose,
+            mode=mode,
         )
     else:
 
@@ -49,6 +51,14 @@ async def async_get_block_of_timestamp(
             from ctc import rpc
 
             network = rpc.get_provider_network(provider=provider)
+
+            # in-memory index or archive
+            local_blocks = await block_timestamp_index._async_search_local_block_timestamps(
+                [timestamp], network, mode=mode
+            )
+            if local_blocks[0] >= 0:
+                return int(local_blocks[0])
+
             block = await db.async_query_timestamp_block(
                 network=network,
                 timestamp=timestamp,
@@ -76,6 +86,7 @@ def _get_block_of_timestamp_from_arrays(
     block_number_array: spec.NumpyArray | None = None,
     block_timestamps: typing.Mapping[int, int] | None = None,
     verbose: bool = False,
+    mode: typing.Literal['<=', '>=', '=='] = '>=',
 ) -> int:
     import numpy as np
 
@@ -93,11 +104,40 @@ def _get_block_of_timestamp_from_arrays(
 
         timestamp = tooltime.timestamp_to_seconds(timestamp)
 
-    index = np.searchsorted(block_timestamp_array, timestamp)
-    result = block_number_array[index]
-    if not isinstance(result, int):
-        raise Exception('invalid rpc result')
-    return result
+    index = _search_timestamp_array(
+        block_timestamp_array, [timestamp], mode=mode
+    )[0]
+    if index < 0:
+        raise Exception('timestamp not within range of arrays')
+    return int(block_number_array[index])
+
+
+def _search_timestamp_array(
+    block_timestamp_array: spec.NumpyArray,
+    timestamps: typing.Sequence[int] | spec.NumpyArray,
+    *,
+    mode: typing.Literal['<=', '>=', '=='] = '>=',
+) -> spec.NumpyArray:
+    """get indices of timestamps in sorted timestamp array, -1 if absent"""
+    import numpy as np
+
+    n = len(block_timestamp_array)
+    query = np.asarray(timestamps)
+    if n == 0:
+        return np.full(len(query), -1, dtype=np.int64)
+    if mode == '>=' or mode == '==':
+        indices = np.searchsorted(block_timestamp_array, query, side='left')
+        found = indices < n
+        if mode == '==':
+            found &= block_timestamp_array[np.minimum(indices, n - 1)] == query
+    elif mode == '<=':
+        indices = (
+            np.searchsorted(block_timestamp_array, query, side='right') - 1
+        )
+        found = indices >= 0
+    else:
+        raise Exception('unknown mode: ' + str(mode))
+    return np.where(found, indices, -1)
 
 
 async def async_get_block_number_and_time(
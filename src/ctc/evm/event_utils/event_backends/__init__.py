@@ -1,3 +1,4 @@
 from .filesystem_events import *
 from .filesystem_rechunking import *
 from .node_events import *
+from .filesystem_conversion import *
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import typing
+
+from ctc import spec
+
+from . import filesystem_events
+from . import filesystem_formats
+from . import filesystem_manifest
+from ... import abi_utils
+
+if typing.TYPE_CHECKING:
+    from .filesystem_formats import EventsFileFormat
+
+
+async def async_convert_events_file_format(
+    contract_address: spec.Address,
+    file_format: EventsFileFormat,
+    *,
+    event_name: typing.Optional[str] = None,
+    event_hash: typing.Optional[str] = None,
+    event_abi: typing.Optional[spec.EventABI] = None,
+    verbose: bool = True,
+    dry: bool = False,
+    network: spec.NetworkReference = 'mainnet',
+) -> None:
+    """convert saved event chunks to another file format, in place"""
+
+    if not filesystem_formats.is_events_file_format(file_format):
+        raise Exception('unknown events file format: ' + str(file_format))
+
+    # get event abi
+    if event_abi is None:
+        event_abi = await abi_utils.async_get_event_abi(
+            contract_address=contract_address,
+            event_name=event_name,
+            event_hash=event_hash,
+            network=network,
+        )
+    if event_hash is None:
+        event_hash = abi_utils.get_event_hash(event_abi)
+
+    # gather chunks that need converting
+    event_list = filesystem_events.list_events(
+        contract_address=contract_address,
+        event_hash=event_hash,
+        allow_missing_blocks=True,
+        network=network,
+    )
+    if event_list is None:
+        if verbose:
+            print('skipping conversion, no event data found')
+        return
+    original_paths = sorted(
+        path
+        for path in event_list['paths'].keys()
+        if filesystem_formats.get_path_file_format(path) != file_format
+    )
+
+    # print summary
+    if verbose or dry:
+        if dry:
+            print('[DRY RUN -- WILL NOT CHANGE FILES]')
+        print('event file format conversion')
+        print('- contract:', contract_address)
+        print('- event_hash:', event_hash)
+        print('- file_format:', file_format)
+        if len(original_paths) == 0:
+            print('all chunks already use ' + file_format + ', no conversion')
+        else:
+            print('converting', len(original_paths), 'files')
+
+    if dry:
+        print('[DRY RUN -- NO FILES MODIFIED]')
+        return
+
+    # convert each chunk
+    for original_path in original_paths:
+        start_block, end_block = event_list['paths'][original_path]
+        new_path = filesystem_events.get_events_filepath(
+            contract_address=contract_address,
+            event_hash=event_hash,
+            start_block=start_block,
+            end_block=end_block,
+            network=network,
+            file_format=file_format,
+        )
+        events = filesystem_formats.read_events_file(
+            original_path,
+            event_abi=event_abi,
+        )
+
+        # write to hidden temporary file so that readers never see partial data
+        event_dir, new_filename = os.path.split(new_path)
+        tmp_path = os.path.join(event_dir, '.' + new_filename)
+        filesystem_formats.write_events_file(
+            events,
+            path=tmp_path,
+            event_abi=event_abi,
+            file_format=file_format,
+        )
+        os.replace(tmp_path, new_path)
+        os.remove(original_path)
+        filesystem_manifest.update_manifest(event_dir)
+
+        if verbose:
+            print('converted', original_path, 'to', file_format)
+
+
+async def async_convert_all_events_file_format(
+    file_format: EventsFileFormat,
+    network: spec.NetworkReference = 'mainnet',
+    *,
+    verbose: bool = True,
+    dry: bool = False,
+) -> None:
+    """convert all saved event chunks of network to another file format"""
+
+    contracts_events = filesystem_events.list_contracts_events(
+        network=network,
+        allow_missing_blocks=True,
+    )
+    for contract_address, events_data in contracts_events.items():
+        for event_hash in events_data.keys():
+            await async_convert_events_file_format(
+                contract_address=contract_address,
+                event_hash=event_hash,
+                file_format=file_format,
+                verbose=verbose,
+                dry=dry,
+                network=network,
+            )
+            if verbose:
+                print()
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import ast
-import functools
 import os
 import typing
 
@@ -13,24 +11,29 @@ from ctc import spec
 from ctc.toolbox import backend_utils
 from ctc.toolbox import filesystem_utils
 from ... import abi_utils
-from ... import binary_utils
 from ... import block_utils
 from ... import network_utils
+from . import filesystem_formats
+from . import filesystem_manifest
 
 if typing.TYPE_CHECKING:
     from typing_extensions import TypedDict
 
+    from .filesystem_formats import EventsFileFormat
+
     _PathEventsResult = typing.Dict[str, typing.Tuple[int, int]]
 
     class _ListEventsResult(TypedDict):
         paths: _PathEventsResult
-        block_range: spec.NumpyArray
-        block_mask: spec.NumpyArray
-        missing_blocks: spec.NumpyArray
+        # first and last block of saved chunks
+        block_range: typing.Tuple[int, int]
+        # sorted disjoint intervals of blocks covered by saved chunks
+        coverage: typing.List[typing.Tuple[int, int]]
+        missing_blocks: bool
 
 
 filesystem_layout = {
-    'evm_events_path': 'events/contract__{contract_address}/event__{event_hash}/{start_block}__to__{end_block}.csv',
+    'evm_events_path': 'events/contract__{contract_address}/event__{event_hash}/{start_block}__to__{end_block}.{file_format}',
     'evm_contract_abis_path': 'contract_abis/contract__{contract_address}/{name}.json',
     'evm_named_contract_abis_path': '{data_root}/{network}/evm/named_contract_abis',
 }
@@ -88,6 +91,7 @@ def get_events_filepath(
     event_hash: typing.Optional[str] = None,
     event_abi: typing.Optional[spec.EventABI] = None,
     network: typing.Optional[spec.NetworkReference] = None,
+    file_format: EventsFileFormat = 'csv',
 ) -> str:
 
     # create lowercase versions of contract_address and event_hash
@@ -104,6 +108,7 @@ def get_events_filepath(
         event_hash=event_hash,
         start_block=start_block,
         end_block=end_block,
+        file_format=file_format,
     )
 
     # add parent directory
@@ -151,63 +156,41 @@ def list_contract_events(
     else:
         query_event_hash = None
 
-    # compile path data
+    # list event directories
     contract_address = contract_address.lower()
     contract_dir = get_events_contract_dir(contract_address, network=network)
-    paths: dict[str, _PathEventsResult] = {}
     if not os.path.isdir(contract_dir):
         return {}
-    for event_dirname in os.listdir(contract_dir):
+    if query_event_hash is not None:
+        event_dirnames = ['event__' + query_event_hash.lower()]
+    else:
+        event_dirnames = [
+            dirname
+            for dirname in os.listdir(contract_dir)
+            if not dirname.startswith('.')
+        ]
+
+    # gather chunks and coverage of each event from its manifest
+    events: dict[str, _ListEventsResult] = {}
+    for event_dirname in event_dirnames:
         event_dir = os.path.join(contract_dir, event_dirname)
         _, event_hash = event_dirname.split('__')
-        if query_event_hash is not None and event_hash != query_event_hash:
+        chunks = filesystem_manifest.get_event_chunks(event_dir)
+        if len(chunks) == 0:
             continue
-        for filename in os.listdir(event_dir):
-            path = os.path.join(event_dir, filename)
-            start_block_str, _, end_block_str = os.path.splitext(filename)[
-                0
-            ].split('__')
-            paths.setdefault(event_hash, {})
-            paths[event_hash][path] = (int(start_block_str), int(end_block_str))
 
-    import numpy as np
-
-    # create block_range and block_mask
-    events: dict[str, _ListEventsResult] = {}
-    for event_hash in paths.keys():
-
-        # gather start and end blocks
-        start_blocks = []
-        end_blocks = []
-        for path, (start_block, end_block) in paths[event_hash].items():
-            start_blocks.append(start_block)
-            end_blocks.append(end_block)
-
-        # create block_range
-        min_block = min(start_blocks)
-        max_block = max(end_blocks) + 1
-        block_range = np.arange(min_block, max_block)
-
-        # create block_mask
-        n_blocks = block_range.size
-        block_mask = np.zeros(n_blocks)
-        for path, (start_block, end_block) in paths[event_hash].items():
-            start_index = start_block - min_block
-            end_index = n_blocks - (max_block - end_block) + 1
-            block_mask[start_index:end_index] += 1
-        if (block_mask > 1).sum() > 0:
-            raise Exception('overlapping chunks')
-        block_mask = block_mask.astype(bool)
-
-        # check if blocks missing
-        missing_blocks = block_mask.sum() != n_blocks
+        coverage = filesystem_manifest.get_chunks_coverage(chunks)
+        missing_blocks = len(coverage) > 1
         if missing_blocks and not allow_missing_blocks:
             raise Exception('missing blocks')
 
         events[event_hash] = {
-            'paths': paths[event_hash],
-            'block_range': block_range,
-            'block_mask': block_mask,
+            'paths': {
+                os.path.join(event_dir, filename): block_range
+                for filename, block_range in chunks.items()
+            },
+            'block_range': (coverage[0][0], coverage[-1][1]),
+            'coverage': coverage,
             'missing_blocks': missing_blocks,
         }
 
@@ -296,6 +279,7 @@ async def async_save_events_to_filesystem(
     event_name: typing.Optional[str] = None,
     overwrite: bool = False,
     verbose: bool = True,
+    file_format: EventsFileFormat | None = None,
     provider: spec.ProviderReference = None,
     network: typing.Optional[spec.NetworkReference] = None,
 ) -> spec.DataFrame:
@@ -321,6 +305,8 @@ async def async_save_events_to_filesystem(
         )
 
     # compute path
+    if file_format is None:
+        file_format = filesystem_formats.default_events_file_format
     path = get_events_filepath(
         contract_address=contract_address,
         event_hash=event_hash,
@@ -328,16 +314,43 @@ async def async_save_events_to_filesystem(
         start_block=start_block,
         end_block=end_block,
         network=network,
+        file_format=file_format,
     )
-    if os.path.exists(path) and not overwrite:
-        raise Exception('path already exists, use overwrite=True')
+
+    # a chunk of the same block range may exist in any format
+    stem = os.path.splitext(path)[0]
+    existing_paths = [
+        stem + '.' + other_format
+        for other_format in filesystem_formats.events_file_formats
+        if os.path.exists(stem + '.' + other_format)
+    ]
+    if len(existing_paths) > 0 and not overwrite:
+        raise Exception(
+            'path already exists, use overwrite=True: ' + existing_paths[0]
+        )
 
     if verbose:
         print('saving events to file:', path)
 
-    # save
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    events.to_csv(path)
+    # save to hidden temporary file so that readers never see partial data
+    event_dir, filename = os.path.split(path)
+    os.makedirs(event_dir, exist_ok=True)
+    tmp_path = os.path.join(event_dir, '.' + filename)
+    filesystem_formats.write_events_file(
+        events,
+        path=tmp_path,
+        event_abi=event_abi,
+        file_format=file_format,
+    )
+    os.replace(tmp_path, path)
+
+    # remove overwritten chunks of other formats
+    for existing_path in existing_paths:
+        if existing_path != path:
+            os.remove(existing_path)
+
+    # record chunk in manifest
+    filesystem_manifest.update_manifest(event_dir)
 
     return events
 
@@ -351,6 +364,7 @@ async def async_get_events_from_filesystem(
     verbose: bool = True,
     start_block: typing.Optional[spec.BlockNumberReference] = None,
     end_block: typing.Optional[spec.BlockNumberReference] = None,
+    columns: typing.Sequence[str] | None = None,
     provider: spec.ProviderReference = None,
     network: spec.NetworkReference | None = None,
 ) -> spec.DataFrame:
@@ -395,12 +409,13 @@ async def async_get_events_from_filesystem(
         contract_address=contract_address,
         event_abi=event_abi,
         event_hash=event_hash,
+        allow_missing_blocks=True,
         network=network,
     )
     if event_hash not in events or len(events[event_hash]['paths']) == 0:
         raise backend_utils.DataNotFound('no files for event')
 
-    # get paths to load
+    # get paths to load, in block order
     paths_to_load = []
     for path, (path_start, path_end) in events[event_hash]['paths'].items():
         if start_block is not None:
@@ -412,6 +427,9 @@ async def async_get_events_from_filesystem(
         paths_to_load.append(path)
     if len(paths_to_load) == 0:
         raise backend_utils.DataNotFound('no files for event')
+    paths_to_load = sorted(
+        paths_to_load, key=lambda path: events[event_hash]['paths'][path][0]
+    )
 
     # print summary
     if verbose:
@@ -429,35 +447,32 @@ async def async_get_events_from_filesystem(
             for path in paths_to_load:
                 print('-', path)
 
-    import pandas as pd
-
-    # load paths
-    dfs = []
-    for path in paths_to_load:
-        df = pd.read_csv(path, low_memory=False)
-        df = df.set_index(['block_number', 'transaction_index', 'log_index'])
-        dfs.append(df)
-    df = pd.concat(dfs, axis=0)
-    df = df.sort_index()
-
-    # trim unwanted
+    # check that block range is within filesystem contents
     if start_block is not None:
         if start_block < events[event_hash]['block_range'][0]:
             raise backend_utils.DataNotFound(
                 'start_block outside of filesystem contents'
             )
-        mask = df.index.get_level_values(level='block_number') >= start_block
-        df = df[mask]
+    else:
+        start_block = events[event_hash]['block_range'][0]
     if end_block is not None:
         if end_block > events[event_hash]['block_range'][-1]:
             raise backend_utils.DataNotFound(
                 'end_block outside of filesystem contents'
             )
-        mask = df.index.get_level_values(level='block_number') <= end_block
-        df = df[mask]
+    else:
+        end_block = events[event_hash]['block_range'][-1]
+    missing_intervals = filesystem_manifest.get_missing_intervals(
+        events[event_hash]['coverage'],
+        start_block=start_block,
+        end_block=end_block,
+    )
+    if len(missing_intervals) > 0:
+        raise backend_utils.DataNotFound(
+            'block range has gaps in filesystem contents'
+        )
 
-    # convert any bytes
-    prefix = 'arg__'
+    # get event abi, used for decoding stored columns
     if event_abi is None:
         event_abi = await abi_utils.async_get_event_abi(
             contract_address=contract_address,
@@ -465,13 +480,12 @@ async def async_get_events_from_filesystem(
             event_hash=event_hash,
             network=network,
         )
-    for arg in event_abi['inputs']:
-        if arg['type'] in ['bytes32']:
-            column = prefix + arg['name']
-            lam = functools.partial(
-                binary_utils.binary_convert,
-                output_format='prefix_hex',
-            )
-            df[column] = df[column].map(ast.literal_eval).map(lam)
 
-    return df
+    # load paths, only loading requested columns and block range
+    return filesystem_formats.read_events_files(
+        paths_to_load,
+        event_abi=event_abi,
+        columns=columns,
+        start_block=start_block,
+        end_block=end_block,
+    )
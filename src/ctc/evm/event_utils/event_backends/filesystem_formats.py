@@ -0,0 +1,475 @@
+"""file formats for event chunks stored on the filesystem
+
+## Formats
+- csv: human readable, every read reparses the full file
+- parquet: typed columnar storage, supports column projection and block range
+    predicate pushdown, requires `pyarrow`
+- arrow: uncompressed arrow ipc, memory-mapped so that reading a block range
+    only touches the pages of that range, requires `pyarrow`
+
+## Parquet / arrow column types
+- integers of at most 64 bits are stored as native int64 (or uint64)
+- larger integers are stored losslessly as 32-byte big-endian binary
+- bytes are stored as prefix hex strings
+- the abi type of each arg column is recorded in the column metadata
+"""
+
+from __future__ import annotations
+
+import ast
+import os
+import typing
+
+from ctc import spec
+from ... import binary_utils
+
+if typing.TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    import pyarrow  # type: ignore
+
+    EventsFileFormat = Literal['csv', 'parquet', 'arrow']
+
+
+events_file_formats: tuple[EventsFileFormat, ...] = ('csv', 'parquet', 'arrow')
+default_events_file_format: EventsFileFormat = 'csv'
+index_columns = ['block_number', 'transaction_index', 'log_index']
+arg_prefix = 'arg__'
+
+# rows per parquet row group or arrow record batch
+columnar_batch_size = 100_000
+
+
+def get_path_file_format(path: str) -> EventsFileFormat:
+    """get file format of event chunk path, based on its extension"""
+    extension = os.path.splitext(path)[-1][1:].split('__')[0]
+    if extension not in events_file_formats:
+        raise Exception('unknown events file format: ' + str(extension))
+    return extension
+
+
+def is_events_file_format(file_format: typing.Any) -> bool:
+    """return whether input is a supported events file format"""
+    return file_format in events_file_formats
+
+
+def _get_arg_types(
+    event_abi: spec.EventABI | None,
+) -> typing.Mapping[str, spec.ABIDatumType]:
+    if event_abi is None:
+        return {}
+    return {
+        arg_prefix + arg['name']: arg['type'] for arg in event_abi['inputs']
+    }
+
+
+def _get_int_type_bits(abi_type: str) -> tuple[bool, int] | None:
+    """return (signed, n_bits) if abi_type is an integer type"""
+    if abi_type.startswith('uint'):
+        suffix = abi_type[4:]
+        signed = False
+    elif abi_type.startswith('int'):
+        suffix = abi_type[3:]
+        signed = True
+    else:
+        return None
+    if suffix == '':
+        return signed, 256
+    elif suffix.isdigit():
+        return signed, int(suffix)
+    else:
+        return None
+
+
+#
+# # writing
+#
+
+
+def write_events_file(
+    events: spec.DataFrame,
+    *,
+    path: str,
+    event_abi: spec.EventABI | None,
+    file_format: EventsFileFormat | None = None,
+) -> None:
+    """write chunk of events to file"""
+
+    if file_format is None:
+        file_format = get_path_file_format(path)
+
+    if file_format == 'csv':
+        events.to_csv(path)
+    elif file_format == 'parquet':
+        import pyarrow.parquet  # type: ignore
+
+        table = _events_to_arrow_table(events, event_abi=event_abi)
+        if len(events) > 0:
+            row_group_size = columnar_batch_size
+        else:
+            row_group_size = None
+        pyarrow.parquet.write_table(table, path, row_group_size=row_group_size)
+    elif file_format == 'arrow':
+        import pyarrow.ipc  # type: ignore
+
+        table = _events_to_arrow_table(events, event_abi=event_abi)
+        with pyarrow.ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table, max_chunksize=columnar_batch_size)
+    else:
+        raise Exception('unknown events file format: ' + str(file_format))
+
+
+def _events_to_arrow_table(
+    events: spec.DataFrame,
+    *,
+    event_abi: spec.EventABI | None,
+) -> pyarrow.Table:
+
+    import pyarrow
+
+    events = events.sort_index().reset_index()
+    arg_types = _get_arg_types(event_abi)
+
+    arrays = []
+    fields = []
+    for column in events.columns:
+        values = events[column].tolist()
+        abi_type = arg_types.get(column)
+        metadata = None
+        if column in index_columns:
+            arrow_type = pyarrow.int64()
+        elif abi_type is not None:
+            metadata = {'abi_type': abi_type}
+            arrow_type, values = _encode_arg_column(values, abi_type=abi_type)
+        elif events[column].dtype.kind in 'iu':
+            arrow_type = pyarrow.int64()
+        elif events[column].dtype.kind == 'b':
+            arrow_type = pyarrow.bool_()
+        else:
+            arrow_type = pyarrow.string()
+            values = [_to_str(value) for value in values]
+        arrays.append(pyarrow.array(values, type=arrow_type))
+        fields.append(pyarrow.field(column, arrow_type, metadata=metadata))
+
+    return pyarrow.Table.from_arrays(arrays, schema=pyarrow.schema(fields))
+
+
+def _encode_arg_column(
+    values: list[typing.Any],
+    *,
+    abi_type: spec.ABIDatumType,
+) -> tuple[pyarrow.DataType, list[typing.Any]]:
+
+    import pyarrow
+
+    int_type = _get_int_type_bits(abi_type)
+    if int_type is not None:
+        signed, n_bits = int_type
+        if n_bits < 64 or (signed and n_bits == 64):
+            return pyarrow.int64(), [int(value) for value in values]
+        elif n_bits == 64:
+            return pyarrow.uint64(), [int(value) for value in values]
+        else:
+            return pyarrow.binary(32), [
+                int(value).to_bytes(32, 'big', signed=signed)
+                for value in values
+            ]
+    elif abi_type == 'bool':
+        return pyarrow.bool_(), [_to_bool(value) for value in values]
+    elif abi_type.startswith('bytes'):
+        return pyarrow.string(), [_bytes_to_str(value) for value in values]
+    else:
+        return pyarrow.string(), [_to_str(value) for value in values]
+
+
+def _to_bool(value: typing.Any) -> bool:
+    if isinstance(value, str):
+        return value == 'True'
+    return bool(value)
+
+
+def _to_str(value: typing.Any) -> str | None:
+    if value is None:
+        return None
+    elif isinstance(value, bytes):
+        return binary_utils.binary_convert(value, 'prefix_hex')
+    else:
+        return str(value)
+
+
+def _bytes_to_str(value: typing.Any) -> str | None:
+    if isinstance(value, str) and value.startswith("b'"):
+        # bytes that were stringified by a csv roundtrip
+        value = ast.literal_eval(value)
+    return _to_str(value)
+
+
+#
+# # reading
+#
+
+
+def read_events_file(
+    path: str,
+    *,
+    event_abi: spec.EventABI | None,
+    columns: typing.Sequence[str] | None = None,
+    start_block: int | None = None,
+    end_block: int | None = None,
+) -> spec.DataFrame:
+    """read chunk of events from file
+
+    - columns: non-index columns to load, or None to load all columns
+    - start_block / end_block: inclusive block bounds of rows to load
+    """
+    return read_events_files(
+        [path],
+        event_abi=event_abi,
+        columns=columns,
+        start_block=start_block,
+        end_block=end_block,
+    )
+
+
+def read_events_files(
+    paths: typing.Sequence[str],
+    *,
+    event_abi: spec.EventABI | None,
+    columns: typing.Sequence[str] | None = None,
+    start_block: int | None = None,
+    end_block: int | None = None,
+) -> spec.DataFrame:
+    """read chunks of events from files into a single dataframe
+
+    paths should be non-overlapping chunks given in block order
+
+    columnar chunks are memory-mapped and sliced to the requested block range
+    without copying, then converted to a single dataframe, so memory use scales
+    with the size of the requested range rather than the size of the chunks
+    """
+
+    if len(paths) == 0:
+        raise Exception('must specify at least one path')
+
+    file_formats = [get_path_file_format(path) for path in paths]
+    if 'csv' not in file_formats:
+        tables = [
+            _read_events_table(
+                path,
+                columns=columns,
+                start_block=start_block,
+                end_block=end_block,
+            )
+            for path in paths
+        ]
+        df = _tables_to_events(tables)
+    else:
+        import pandas as pd
+
+        dfs = []
+        for path, file_format in zip(paths, file_formats):
+            if file_format == 'csv':
+                chunk = _read_events_csv(
+                    path,
+                    event_abi=event_abi,
+                    columns=columns,
+                    start_block=start_block,
+                    end_block=end_block,
+                )
+            else:
+                table = _read_events_table(
+                    path,
+                    columns=columns,
+                    start_block=start_block,
+                    end_block=end_block,
+                )
+                chunk = _tables_to_events([table])
+            dfs.append(chunk)
+        if len(dfs) == 1:
+            df = dfs[0]
+        else:
+            df = pd.concat(dfs, axis=0)
+
+    # chunks are written in sorted order, only legacy chunks need sorting
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    return df
+
+
+def _read_events_csv(
+    path: str,
+    *,
+    event_abi: spec.EventABI | None,
+    columns: typing.Sequence[str] | None,
+    start_block: int | None,
+    end_block: int | None,
+) -> spec.DataFrame:
+
+    import pandas as pd
+
+    if columns is not None:
+        usecols: list[str] | None = index_columns + list(columns)
+    else:
+        usecols = None
+    df = pd.read_csv(path, low_memory=False, usecols=usecols)
+    df = df.set_index(index_columns)
+
+    # trim rows outside of block range
+    if start_block is not None or end_block is not None:
+        block_numbers = df.index.get_level_values(level='block_number')
+        if start_block is not None and end_block is not None:
+            mask = (block_numbers >= start_block) & (block_numbers <= end_block)
+        elif start_block is not None:
+            mask = block_numbers >= start_block
+        else:
+            mask = block_numbers <= end_block
+        if not mask.all():
+            df = df[mask]
+
+    # convert any bytes
+    for column, abi_type in _get_arg_types(event_abi).items():
+        if abi_type in ['bytes32'] and column in df.columns:
+            df[column] = [_csv_bytes_to_hex(value) for value in df[column]]
+
+    return df
+
+
+def _csv_bytes_to_hex(value: typing.Any) -> typing.Any:
+    if isinstance(value, str) and value.startswith("b'"):
+        # bytes that were stringified when writing the csv
+        return binary_utils.binary_convert(
+            ast.literal_eval(value), 'prefix_hex'
+        )
+    else:
+        # hex written by another format, which literal_eval would make an int
+        return value
+
+
+def _read_events_table(
+    path: str,
+    *,
+    columns: typing.Sequence[str] | None,
+    start_block: int | None,
+    end_block: int | None,
+) -> pyarrow.Table:
+    """read columnar chunk as arrow table, sliced to block range"""
+
+    import pyarrow
+
+    if columns is not None:
+        load_columns: list[str] | None = index_columns + list(columns)
+    else:
+        load_columns = None
+
+    file_format = get_path_file_format(path)
+    if file_format == 'parquet':
+        import pyarrow.parquet
+
+        # row group statistics skip row groups outside of block range
+        filters = []
+        if start_block is not None:
+            filters.append(('block_number', '>=', start_block))
+        if end_block is not None:
+            filters.append(('block_number', '<=', end_block))
+        return pyarrow.parquet.read_table(
+            path,
+            columns=load_columns,
+            filters=(filters if len(filters) > 0 else None),
+            memory_map=True,
+        )
+
+    elif file_format == 'arrow':
+        import pyarrow.ipc
+
+        # buffers of the table point directly into the memory-mapped file
+        source = pyarrow.memory_map(path, 'r')
+        table = pyarrow.ipc.open_file(source).read_all()
+        if load_columns is not None:
+            table = table.select(load_columns)
+        offset, length = _get_block_slice(
+            table,
+            start_block=start_block,
+            end_block=end_block,
+        )
+        if offset != 0 or length != table.num_rows:
+            table = table.slice(offset, length)
+        return table
+
+    else:
+        raise Exception('not a columnar events file format: ' + file_format)
+
+
+def _get_block_slice(
+    table: pyarrow.Table,
+    *,
+    start_block: int | None,
+    end_block: int | None,
+) -> tuple[int, int]:
+    """get (offset, length) of rows within block range of sorted table
+
+    the sorted block_number column acts as the chunk's offset index, binary
+    search only touches a few pages of the memory-mapped column
+    """
+
+    import numpy as np
+
+    if start_block is None and end_block is None:
+        return 0, table.num_rows
+
+    # search each chunk of the column, since they are sorted as a whole, so
+    # that the column is never copied into one contiguous array
+    chunks = [
+        chunk.to_numpy(zero_copy_only=False)
+        for chunk in table.column('block_number').chunks
+    ]
+    if start_block is not None:
+        start_index = sum(
+            int(np.searchsorted(chunk, start_block, 'left')) for chunk in chunks
+        )
+    else:
+        start_index = 0
+    if end_block is not None:
+        end_index = sum(
+            int(np.searchsorted(chunk, end_block, 'right')) for chunk in chunks
+        )
+    else:
+        end_index = table.num_rows
+
+    return start_index, max(end_index - start_index, 0)
+
+
+def _tables_to_events(tables: typing.Sequence[pyarrow.Table]) -> spec.DataFrame:
+    """convert arrow tables of consecutive chunks to a single dataframe"""
+
+    import pyarrow
+
+    if len(tables) == 1:
+        table = tables[0]
+    else:
+        # zero-copy, the combined table references each table's buffers
+        try:
+            table = pyarrow.concat_tables(tables)
+        except pyarrow.ArrowInvalid:
+            # chunks written with different schemas
+            import pandas as pd
+
+            dfs = [_tables_to_events([table]) for table in tables]
+            return pd.concat(dfs, axis=0)
+
+    df = table.to_pandas()
+
+    # decode integers too large for native columns
+    for field in table.schema:
+        if field.metadata is None or field.type != pyarrow.binary(32):
+            continue
+        abi_type = field.metadata.get(b'abi_type', b'').decode()
+        int_type = _get_int_type_bits(abi_type)
+        if int_type is not None:
+            signed, n_bits = int_type
+            df[field.name] = [
+                int.from_bytes(value, 'big', signed=signed)
+                for value in df[field.name].values
+            ]
+
+    return df.set_index(index_columns)
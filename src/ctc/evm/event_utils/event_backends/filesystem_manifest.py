@@ -0,0 +1,202 @@
+"""manifest index of the event chunks saved for each event
+
+each event directory has a manifest stored next to it in the contract
+directory, `contract__<address>/.event__<hash>.manifest.json`, that lists
+the chunk files of the event and the intervals of blocks they cover
+
+the manifest records the modification time of the event directory, so that
+changes made outside of ctc are detected with a single stat() call and the
+manifest is rebuilt by scanning the directory
+"""
+
+from __future__ import annotations
+
+import os
+import typing
+
+from . import filesystem_formats
+
+if typing.TYPE_CHECKING:
+    from typing_extensions import TypedDict
+
+    # chunk filename -> (start_block, end_block)
+    EventChunks = typing.Dict[str, typing.Tuple[int, int]]
+
+    # sorted, disjoint, inclusive intervals of blocks
+    BlockIntervals = typing.List[typing.Tuple[int, int]]
+
+    class EventManifest(TypedDict):
+        version: int
+        event_dir_mtime_ns: int
+        chunks: typing.Dict[str, typing.List[int]]
+        coverage: typing.List[typing.List[int]]
+
+
+manifest_version = 1
+
+
+def get_manifest_path(event_dir: str) -> str:
+    """get path of manifest of event directory"""
+    contract_dir, event_dirname = os.path.split(event_dir.rstrip(os.sep))
+    return os.path.join(contract_dir, '.' + event_dirname + '.manifest.json')
+
+
+def parse_chunk_filename(filename: str) -> tuple[int, int]:
+    """parse (start_block, end_block) from chunk filename"""
+    start_block_str, _, end_block_str = os.path.splitext(filename)[0].split(
+        '__'
+    )
+    return int(start_block_str), int(end_block_str)
+
+
+def is_chunk_filename(filename: str) -> bool:
+    """return whether filename is a complete chunk of a known format
+
+    partially written files start with '.', and original chunks that are
+    being rechunked end with '__OLD'
+    """
+    if filename.startswith('.'):
+        return False
+    extension = os.path.splitext(filename)[1][1:]
+    return extension in filesystem_formats.events_file_formats
+
+
+def scan_event_chunks(event_dir: str) -> EventChunks:
+    """list chunks of event by scanning its directory"""
+    return {
+        filename: parse_chunk_filename(filename)
+        for filename in os.listdir(event_dir)
+        if is_chunk_filename(filename)
+    }
+
+
+def get_event_chunks(event_dir: str) -> EventChunks:
+    """list chunks of event, using manifest if it is up to date"""
+
+    try:
+        mtime_ns = os.stat(event_dir).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    manifest = load_manifest(event_dir)
+    if manifest is not None and manifest['event_dir_mtime_ns'] == mtime_ns:
+        return {
+            filename: (start_block, end_block)
+            for filename, (start_block, end_block) in manifest['chunks'].items()
+        }
+
+    chunks = scan_event_chunks(event_dir)
+    write_manifest(event_dir, chunks=chunks, event_dir_mtime_ns=mtime_ns)
+    return chunks
+
+
+def load_manifest(event_dir: str) -> EventManifest | None:
+    """load manifest of event directory, None if missing or unreadable"""
+    import json
+
+    path = get_manifest_path(event_dir)
+    try:
+        with open(path, 'r') as f:
+            manifest: EventManifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if manifest.get('version') != manifest_version:
+        return None
+    return manifest
+
+
+def write_manifest(
+    event_dir: str,
+    *,
+    chunks: EventChunks,
+    event_dir_mtime_ns: int | None = None,
+) -> None:
+    """write manifest of event directory
+
+    the manifest is written to a temporary file and then moved into place, so
+    readers see either the previous manifest or the new one
+
+    event_dir_mtime_ns should be taken before chunks were listed, so that any
+    modification made after listing invalidates the manifest
+    """
+    import json
+
+    if event_dir_mtime_ns is None:
+        event_dir_mtime_ns = os.stat(event_dir).st_mtime_ns
+
+    coverage = get_chunks_coverage(chunks, allow_overlap=True)
+    manifest: EventManifest = {
+        'version': manifest_version,
+        'event_dir_mtime_ns': event_dir_mtime_ns,
+        'chunks': {
+            filename: [start_block, end_block]
+            for filename, (start_block, end_block) in sorted(
+                chunks.items(), key=lambda item: item[1]
+            )
+        },
+        'coverage': [[start, end] for start, end in coverage],
+    }
+
+    path = get_manifest_path(event_dir)
+    tmp_path = path + '.' + str(os.getpid()) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def update_manifest(event_dir: str) -> EventChunks:
+    """record chunks of event directory in manifest after a modification
+
+    the directory is stat()ed before it is listed, so that a chunk saved by a
+    concurrent writer after the listing invalidates the manifest
+    """
+    mtime_ns = os.stat(event_dir).st_mtime_ns
+    chunks = scan_event_chunks(event_dir)
+    write_manifest(event_dir, chunks=chunks, event_dir_mtime_ns=mtime_ns)
+    return chunks
+
+
+#
+# # block intervals
+#
+
+
+def get_chunks_coverage(
+    chunks: EventChunks,
+    *,
+    allow_overlap: bool = False,
+) -> BlockIntervals:
+    """merge chunks into sorted disjoint intervals of covered blocks"""
+
+    coverage: BlockIntervals = []
+    for start_block, end_block in sorted(chunks.values()):
+        if len(coverage) > 0 and start_block <= coverage[-1][1] + 1:
+            if start_block <= coverage[-1][1] and not allow_overlap:
+                raise Exception('overlapping chunks')
+            coverage[-1] = (coverage[-1][0], max(coverage[-1][1], end_block))
+        else:
+            coverage.append((start_block, end_block))
+    return coverage
+
+
+def get_missing_intervals(
+    coverage: BlockIntervals,
+    *,
+    start_block: int,
+    end_block: int,
+) -> BlockIntervals:
+    """get intervals of [start_block, end_block] not in coverage"""
+
+    missing: BlockIntervals = []
+    cursor = start_block
+    for covered_start, covered_end in coverage:
+        if covered_end < cursor:
+            continue
+        if covered_start > end_block:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start - 1))
+        cursor = covered_end + 1
+    if cursor <= end_block:
+        missing.append((cursor, end_block))
+    return missing
@@ -8,6 +8,8 @@ from ctc import evm
 from ctc import spec
 
 from . import filesystem_events
+from . import filesystem_formats
+from . import filesystem_manifest
 from ... import abi_utils
 
 
@@ -36,6 +38,19 @@ async def async_rechunk_events(
         event_name = abi_utils.get_event_hash(event_abi)
 
     # make sure no leftover files from previous rechunks
+    event_dir = filesystem_events.get_events_event_dir(
+        contract_address=contract_address,
+        event_hash=event_hash,
+        network=network,
+    )
+    if os.path.isdir(event_dir):
+        for filename in os.listdir(event_dir):
+            if filename.endswith('__OLD'):
+                message = (
+                    'there exists <filename>__OLD files from an incomplete'
+                    ' rechunking, remove these files to continue in directory '
+                ) + str(event_dir)
+                raise Exception(message)
     event_list = filesystem_events.list_events(
         contract_address=contract_address,
         event_hash=event_hash,
@@ -45,18 +60,6 @@ async def async_rechunk_events(
         if verbose:
             print('skipping rechunk, no event data found')
         return
-    for path in event_list['paths']:
-        if path.endswith('__OLD'):
-            event_dir = filesystem_events.get_events_event_dir(
-                contract_address=contract_address,
-                event_hash=event_hash,
-                network=network,
-            )
-            message = (
-                'there exists <filename>__OLD files from an incomplete'
-                ' rechunking, remove these files to continue in directory '
-            ) + str(event_dir)
-            raise Exception(message)
 
     # load events
     if start_block is not None:
@@ -142,7 +145,7 @@ async def async_rechunk_events(
     # split into chunks
     if len(original_paths) > 0 and len(events) > 0:
         event_chunks = typing.cast(
-            typing.Sequence[spec.DataFrame],
+            'typing.Sequence[spec.DataFrame]',
             np.array_split(events, n_chunks),
         )
     else:
@@ -169,11 +172,6 @@ async def async_rechunk_events(
     if verbose or dry:
         import toolstr
 
-        event_dir = filesystem_events.get_events_event_dir(
-            contract_address=contract_address,
-            event_hash=event_hash,
-            network=network,
-        )
         if dry:
             print('[DRY RUN -- WILL NOT CHANGE FILES]')
         print('event rechunking')
@@ -201,9 +199,13 @@ async def async_rechunk_events(
     if len(chunk_ranges) == 0:
         return
 
+    # keep format of the latest original chunk
+    file_format = filesystem_formats.get_path_file_format(original_paths[-1])
+
     # rename original files
     for original_path in original_paths:
         os.rename(original_path, original_path + '__OLD')
+    filesystem_manifest.update_manifest(event_dir)
 
     # save chunks
     for event_chunk, chunk_range in zip(event_chunks, chunk_ranges):
@@ -215,11 +217,13 @@ async def async_rechunk_events(
             start_block=chunk_start_block,
             end_block=chunk_end_block,
             network=network,
+            file_format=file_format,
         )
 
     # remove original files
     for original_path in original_paths:
         os.remove(original_path + '__OLD')
+    filesystem_manifest.update_manifest(event_dir)
 
     if verbose:
         print()
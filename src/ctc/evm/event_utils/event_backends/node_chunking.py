@@ -0,0 +1,275 @@
+"""adaptive splitting of eth_getLogs block ranges
+
+providers limit eth_getLogs by number of results, response size, or block
+range, so a fixed chunk size is either wasteful for sparse events or too
+large for dense events. instead, requests start with a large window that is
+bisected whenever the provider rejects a range and grown again after sparse
+responses. the observed density of each event is saved so that later runs
+start from a window that suits the event.
+"""
+
+from __future__ import annotations
+
+import os
+import typing
+
+import ctc.config
+from ctc import spec
+from ... import network_utils
+
+if typing.TYPE_CHECKING:
+    from typing_extensions import TypedDict
+
+    class _LogDensity(TypedDict):
+        n_logs: int
+        n_blocks: int
+
+
+# substrings of provider errors that indicate a range should be split, rate
+# limit errors are not included because they are retried by the transport
+log_range_error_messages = (
+    'query returned more than',
+    'response size exceeded',
+    'response size should not',
+    'response too large',
+    'too many results',
+    'more than 10000 results',
+    'log response size exceeded',
+    'block range is too wide',
+    'block range too large',
+    'exceed maximum block range',
+    'range too large',
+    'block range limit',
+)
+
+min_blocks_per_request = 1
+max_blocks_per_request = 1_000_000
+default_blocks_per_request = 100_000
+target_logs_per_request = 2_000
+default_max_concurrent_requests = 8
+
+
+def is_log_range_error(exception: BaseException) -> bool:
+    """return whether exception indicates that a log range is too large"""
+    message = str(exception).lower()
+    return any(substring in message for substring in log_range_error_messages)
+
+
+def get_blocks_per_request(density: float | None) -> int:
+    """get initial blocks per request for events of given density"""
+    if density is None:
+        return default_blocks_per_request
+    elif density <= 0:
+        return max_blocks_per_request
+    else:
+        blocks = int(target_logs_per_request / density)
+        return max(min_blocks_per_request, min(max_blocks_per_request, blocks))
+
+
+async def async_split_log_requests(
+    fetch_logs: typing.Callable[
+        [int, int],
+        typing.Coroutine[typing.Any, typing.Any, typing.Sequence[spec.RawLog]],
+    ],
+    *,
+    start_block: int,
+    end_block: int,
+    blocks_per_request: int = default_blocks_per_request,
+    max_blocks: int = max_blocks_per_request,
+    max_concurrent_requests: int = default_max_concurrent_requests,
+    verbose: bool | int = False,
+) -> list[spec.RawLog]:
+    """fetch logs of block range, adapting request ranges to responses
+
+    ## Inputs
+    - fetch_logs: coroutine function taking (start_block, end_block)
+    - blocks_per_request: size of the initial window
+    - max_blocks: the window never grows beyond this size
+
+    ## Behavior
+    - ranges rejected by the provider are bisected and retried
+    - the window shrinks after rejected or dense responses
+    - the window doubles after sparse responses
+    """
+    import asyncio
+
+    window = max(min_blocks_per_request, min(blocks_per_request, max_blocks))
+    cursor = start_block
+    split_ranges: list[tuple[int, int]] = []
+    tasks: dict[asyncio.Future[typing.Sequence[spec.RawLog]], tuple[int, int]]
+    tasks = {}
+    results: dict[int, typing.Sequence[spec.RawLog]] = {}
+
+    try:
+        while True:
+
+            # fill open request slots, retrying split ranges first
+            while len(tasks) < max_concurrent_requests:
+                if len(split_ranges) > 0:
+                    block_range = split_ranges.pop()
+                elif cursor <= end_block:
+                    block_range = (cursor, min(cursor + window - 1, end_block))
+                    cursor = block_range[1] + 1
+                else:
+                    break
+                task = asyncio.ensure_future(fetch_logs(*block_range))
+                tasks[task] = block_range
+            if len(tasks) == 0:
+                break
+
+            done, _ = await asyncio.wait(
+                tasks.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                range_start, range_end = tasks.pop(future)
+                n_blocks = range_end - range_start + 1
+                try:
+                    logs = future.result()
+                except spec.RpcException as e:
+                    if not is_log_range_error(e) or n_blocks == 1:
+                        raise
+                    if verbose > 1:
+                        print(
+                            'splitting block range:',
+                            [range_start, range_end],
+                        )
+                    midpoint = (range_start + range_end) // 2
+                    split_ranges.append((midpoint + 1, range_end))
+                    split_ranges.append((range_start, midpoint))
+                    window = max(
+                        min_blocks_per_request, min(window, n_blocks // 2)
+                    )
+                    continue
+
+                results[range_start] = logs
+                if len(logs) > target_logs_per_request:
+                    window = max(
+                        min_blocks_per_request,
+                        min(
+                            window,
+                            n_blocks * target_logs_per_request // len(logs),
+                        ),
+                    )
+                elif len(logs) < target_logs_per_request // 4:
+                    window = min(max_blocks, max(window, n_blocks * 2))
+
+    finally:
+        for future in tasks.keys():
+            future.cancel()
+
+    return [
+        log
+        for range_start in sorted(results.keys())
+        for log in results[range_start]
+    ]
+
+
+#
+# # learned densities
+#
+
+
+# observed densities not yet saved, by path of densities file
+_pending_log_densities: dict[str, dict[str, _LogDensity]] = {}
+
+
+def get_log_densities_path(network: spec.NetworkReference) -> str:
+    """get path of file storing observed log densities of network"""
+    network_name = network_utils.get_network_name(network, require=True)
+    return os.path.join(
+        ctc.config.get_data_dir(),
+        'evm/networks',
+        network_name,
+        'log_densities.json',
+    )
+
+
+def _get_log_density_key(
+    contract_address: spec.Address | None, event_hash: str
+) -> str:
+    if contract_address is None:
+        contract_address = 'any'
+    return contract_address.lower() + '__' + event_hash.lower()
+
+
+def _load_log_densities(
+    network: spec.NetworkReference,
+) -> dict[str, _LogDensity]:
+    import json
+
+    path = get_log_densities_path(network)
+    try:
+        with open(path, 'r') as f:
+            densities: dict[str, _LogDensity] = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return densities
+
+
+def get_log_density(
+    *,
+    contract_address: spec.Address | None,
+    event_hash: str,
+    network: spec.NetworkReference,
+) -> float | None:
+    """get observed logs per block of event, None if never observed"""
+    densities = _load_log_densities(network)
+    key = _get_log_density_key(contract_address, event_hash)
+    path = get_log_densities_path(network)
+    n_logs = 0
+    n_blocks = 0
+    for source in [densities, _pending_log_densities.get(path, {})]:
+        density = source.get(key)
+        if density is not None:
+            n_logs += density['n_logs']
+            n_blocks += density['n_blocks']
+    if n_blocks <= 0:
+        return None
+    return n_logs / n_blocks
+
+
+def record_log_density(
+    *,
+    contract_address: spec.Address | None,
+    event_hash: str,
+    n_logs: int,
+    n_blocks: int,
+    network: spec.NetworkReference,
+    save: bool = True,
+) -> None:
+    """add observed number of logs over number of blocks to saved density
+
+    if save is False, the observation is kept in memory until the next call
+    to save_log_densities(), so that a download of many ranges writes the
+    densities file once
+    """
+    path = get_log_densities_path(network)
+    pending = _pending_log_densities.setdefault(path, {})
+    key = _get_log_density_key(contract_address, event_hash)
+    density = pending.setdefault(key, {'n_logs': 0, 'n_blocks': 0})
+    density['n_logs'] += n_logs
+    density['n_blocks'] += n_blocks
+    if save:
+        save_log_densities(network)
+
+
+def save_log_densities(network: spec.NetworkReference) -> None:
+    """write densities recorded in memory to densities file of network"""
+    import json
+
+    path = get_log_densities_path(network)
+    pending = _pending_log_densities.pop(path, None)
+    if pending is None or len(pending) == 0:
+        return
+
+    densities = _load_log_densities(network)
+    for key, pending_density in pending.items():
+        density = densities.setdefault(key, {'n_logs': 0, 'n_blocks': 0})
+        density['n_logs'] += pending_density['n_logs']
+        density['n_blocks'] += pending_density['n_blocks']
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.' + str(os.getpid()) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(densities, f)
+    os.replace(tmp_path, path)
@@ -7,34 +7,15 @@ from ctc import spec
 
 from ... import abi_utils
 from ... import block_utils
+from . import node_chunking
 
+if typing.TYPE_CHECKING:
+    import concurrent.futures
 
-def _get_chunks_in_range(
-    start_block: int,
-    end_block: int,
-    *,
-    chunk_size: int,
-    trim_excess: bool = False,
-) -> list[list[int]]:
-    """break a range of blocks into chunks of a given chunk size"""
-    chunk_start_block = (start_block // chunk_size) * chunk_size
-    chunk_end_block = ((end_block // chunk_size) + 1) * chunk_size
-    chunk_bounds = list(
-        range(chunk_start_block, chunk_end_block + chunk_size, chunk_size)
-    )
-    chunks = [
-        [start, end - 1]
-        for start, end in zip(chunk_bounds[:-1], chunk_bounds[1:])
-    ]
-
-    if trim_excess:
-        if len(chunks) > 0:
-            if chunks[0][0] < start_block:
-                chunks[0] = [start_block, chunks[0][1]]
-            if chunks[-1][-1] > end_block:
-                chunks[-1] = [chunks[-1][0], end_block]
 
-    return chunks
+# (pid, number of processes) -> pool shared by all decoding in the process
+_decode_pools: dict[tuple[int, int], concurrent.futures.ProcessPoolExecutor]
+_decode_pools = {}
 
 
 async def async_get_events_from_node(
@@ -46,13 +27,30 @@ async def async_get_events_from_node(
     event_abi: spec.EventABI | None = None,
     contract_address: spec.Address | None = None,
     contract_abi: spec.ContractABI | None = None,
-    blocks_per_chunk: int = 2000,
+    blocks_per_chunk: int | None = None,
+    decode_processes: int | None = None,
+    save_log_density: bool = True,
     verbose: bool = True,
     provider: spec.ProviderReference = None,
 ) -> spec.DataFrame:
-    """see fetch_events() for complete kwarg list"""
+    """see fetch_events() for complete kwarg list
 
+    block ranges of requests adapt to the limits of the provider, starting
+    from the previously observed density of the event. if blocks_per_chunk
+    is given, requests never span more than blocks_per_chunk blocks
+
+    if decode_processes is given, the logs of each response are decoded in a
+    pool of that many processes while the remaining requests are fetched.
+    logs are shipped to workers as one list per log key, and decoded columns
+    are shipped back as numpy arrays where possible
+
+    if save_log_density is False, the observed density of the event is kept
+    in memory until node_chunking.save_log_densities() is called
+    """
     import asyncio
+    import concurrent.futures
+    import functools
+
     from ctc import rpc
 
     provider = rpc.get_provider(provider)
@@ -60,7 +58,7 @@ async def async_get_events_from_node(
     if network is None:
         raise Exception('could not determine network')
 
-    # create chunks
+    # resolve block range
     start_block, end_block = await block_utils.async_block_numbers_to_int(
         blocks=[start_block, end_block],
         provider=provider,
@@ -69,16 +67,6 @@ async def async_get_events_from_node(
         print(
             'getting events from node, block range:', [start_block, end_block]
         )
-    blocks_per_chunk = min(1000, blocks_per_chunk)
-    if blocks_per_chunk is not None:
-        chunks = _get_chunks_in_range(
-            start_block=start_block,
-            end_block=end_block,
-            chunk_size=blocks_per_chunk,
-            trim_excess=True,
-        )
-    else:
-        chunks = [[start_block, end_block]]
 
     # gather metadata
     if contract_abi is None and event_abi is None:
@@ -116,22 +104,88 @@ async def async_get_events_from_node(
             raise Exception('must specify event_name, event_abi, or event_hash')
 
     # fetch events
-    coroutines = []
-    for chunk in chunks:
-        coroutine = _async_get_chunk_of_events_from_node(
-            block_range=chunk,
+    density = node_chunking.get_log_density(
+        contract_address=contract_address,
+        event_hash=event_hash,
+        network=network,
+    )
+    if blocks_per_chunk is None:
+        blocks_per_request = node_chunking.get_blocks_per_request(density)
+        max_blocks = node_chunking.max_blocks_per_request
+    else:
+        blocks_per_request = blocks_per_chunk
+        max_blocks = blocks_per_chunk
+
+    # decode logs in processes as they arrive
+    loop = asyncio.get_running_loop()
+    pool: concurrent.futures.ProcessPoolExecutor | None = None
+    decode_log_columns: (
+        typing.Callable[[typing.Any], dict[str, typing.Any]] | None
+    ) = None
+    decoded: dict[int, asyncio.Future[dict[str, typing.Any]]] = {}
+    if decode_processes is not None:
+        if event_abi is None:
+            event_abi = await abi_utils.async_get_event_abi(
+                contract_address=contract_address,
+                contract_abi=contract_abi,
+                event_hash=event_hash,
+                event_name=event_name,
+                network=network,
+            )
+        pool = get_decode_pool(decode_processes)
+        decode_log_columns = functools.partial(
+            _normalize_log_columns, event_abi=event_abi
+        )
+
+    async def fetch_logs(
+        chunk_start_block: int, chunk_end_block: int
+    ) -> typing.Sequence[spec.RawLog]:
+        logs = await _async_get_chunk_of_events_from_node(
+            block_range=[chunk_start_block, chunk_end_block],
             event_hash=event_hash,
             contract_address=contract_address,
             verbose=verbose,
             provider=provider,
         )
-        coroutines.append(coroutine)
-    chunks_entries = await asyncio.gather(*coroutines)
-    entries = [
-        entry for chunk_entries in chunks_entries for entry in chunk_entries
-    ]
+        if decode_log_columns is not None and len(logs) > 0:
+            decoded[chunk_start_block] = loop.run_in_executor(
+                pool,
+                decode_log_columns,
+                abi_utils.compact_logs(logs),
+            )
+        return logs
+
+    try:
+        entries = await node_chunking.async_split_log_requests(
+            fetch_logs,
+            start_block=start_block,
+            end_block=end_block,
+            blocks_per_request=blocks_per_request,
+            max_blocks=max_blocks,
+            verbose=verbose,
+        )
+        decoded_chunks = await asyncio.gather(
+            *[decoded[key] for key in sorted(decoded.keys())]
+        )
+    finally:
+        # the pool is shared, so only this call's pending work is cancelled
+        for future in decoded.values():
+            future.cancel()
+    try:
+        node_chunking.record_log_density(
+            contract_address=contract_address,
+            event_hash=event_hash,
+            n_logs=len(entries),
+            n_blocks=end_block - start_block + 1,
+            network=network,
+            save=save_log_density,
+        )
+    except OSError:
+        pass
 
     # package as dataframe
+    if pool is not None and event_abi is not None:
+        return _package_decoded_events(decoded_chunks, event_abi=event_abi)
     return await _async_package_exported_events(
         entries,
         contract_address=contract_address,
@@ -143,6 +197,37 @@ async def async_get_events_from_node(
     )
 
 
+def get_decode_pool(
+    n_processes: int,
+) -> concurrent.futures.ProcessPoolExecutor:
+    """get pool of n_processes processes shared by decoding in this process"""
+    import concurrent.futures
+    import os
+
+    key = (os.getpid(), n_processes)
+    pool = _decode_pools.get(key)
+    if pool is None:
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=n_processes)
+        _decode_pools[key] = pool
+    return pool
+
+
+def shutdown_decode_pools() -> None:
+    """shut down process pools used for decoding logs"""
+    pools = list(_decode_pools.values())
+    _decode_pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False)
+
+
+def _normalize_log_columns(
+    log_columns: typing.Mapping[str, typing.Sequence[typing.Any]],
+    *,
+    event_abi: spec.EventABI,
+) -> dict[str, typing.Any]:
+    return abi_utils.normalize_log_columns(log_columns, event_abi)
+
+
 async def _async_get_chunk_of_events_from_node(
     block_range: typing.Sequence[spec.BlockNumberReference],
     event_hash: str,
@@ -167,6 +252,8 @@ async def _async_get_chunk_of_events_from_node(
         start_block=start_block,
         end_block=end_block,
         provider=provider,
+        decode_response=False,
+        snake_case_response=False,
     )
 
     return entries
@@ -185,6 +272,7 @@ async def _async_package_exported_events(
 
     if event_abi is None:
         from ctc import rpc
+
         network = rpc.get_provider_network(provider)
         event_abi = await abi_utils.async_get_event_abi(
             contract_address=contract_address,
@@ -197,17 +285,38 @@ async def _async_package_exported_events(
     if len(entries) == 0:
         return create_empty_event_dataframe(event_abi=event_abi)
 
-    formatted_entries = []
-    for entry in entries:
-        formatted_entry = abi_utils.normalize_event(
-            event=entry,
-            event_abi=event_abi,
-        )
-        formatted_entries.append(formatted_entry)
+    columns = abi_utils.normalize_events(entries, event_abi)
 
     import pandas as pd
 
-    df = pd.DataFrame(formatted_entries)
+    df = pd.DataFrame(columns)
+    df = df.set_index(['block_number', 'transaction_index', 'log_index'])
+
+    return df
+
+
+def _package_decoded_events(
+    decoded_chunks: typing.Sequence[typing.Mapping[str, typing.Any]],
+    *,
+    event_abi: spec.EventABI,
+) -> spec.DataFrame:
+    """concatenate columns decoded by abi_utils.normalize_log_columns()"""
+
+    if len(decoded_chunks) == 0:
+        return create_empty_event_dataframe(event_abi=event_abi)
+
+    import numpy as np
+    import pandas as pd
+
+    columns = {}
+    for key in decoded_chunks[0].keys():
+        values = [chunk[key] for chunk in decoded_chunks]
+        if all(isinstance(value, np.ndarray) for value in values):
+            columns[key] = np.concatenate(values)
+        else:
+            columns[key] = [item for value in values for item in value]
+
+    df = pd.DataFrame(columns)
     df = df.set_index(['block_number', 'transaction_index', 'log_index'])
 
     return df
@@ -12,6 +12,8 @@ from .. import abi_utils
 if typing.TYPE_CHECKING:
     import tooltime
 
+    from .event_backends.filesystem_formats import EventsFileFormat
+
 
 def is_event_hash(data: spec.BinaryData) -> bool:
     """return whether input is an event hash"""
@@ -57,11 +59,16 @@ async def async_get_events(
     include_timestamps: bool = False,
     backend_order: typing.Sequence[str] | None = None,
     keep_multiindex: bool = True,
+    decode_processes: int | None = None,
     verbose: bool = True,
     provider: spec.ProviderReference = None,
     **query: typing.Any,
 ) -> spec.DataFrame:
-    """get events matching given inputs"""
+    """get events matching given inputs
+
+    if decode_processes is given, logs fetched from a node are decoded in a
+    pool of that many processes while the remaining logs are fetched
+    """
 
     from ctc.toolbox import backend_utils
 
@@ -88,8 +95,18 @@ async def async_get_events(
     if backend_order is None:
         backend_order = ['filesystem', 'download']
 
+    backend_functions = get_event_backend_functions()['get']
+    if decode_processes is not None:
+        import functools
+
+        backend_functions = dict(backend_functions)
+        for backend in ['download', 'node']:
+            backend_functions[backend] = functools.partial(
+                backend_functions[backend], decode_processes=decode_processes
+            )
+
     events = await backend_utils.async_run_on_backend(
-        get_event_backend_functions()['get'],
+        backend_functions,
         contract_address=contract_address,
         start_block=start_block,
         end_block=end_block,
@@ -163,26 +180,49 @@ async def async_download_events(
     event_abi: spec.EventABI | None = None,
     start_block: spec.BlockNumberReference | None = None,
     end_block: spec.BlockNumberReference | None = None,
+    columns: typing.Sequence[str] | None = None,
+    file_format: EventsFileFormat | None = None,
+    blocks_per_file: int = 100_000,
+    decode_processes: int | None = None,
     provider: spec.ProviderReference = None,
     verbose: bool = True,
 ) -> spec.DataFrame:
+    """download missing events to filesystem, then load them from filesystem
+
+    - only the exact block intervals missing from the filesystem are fetched
+    - each interval is fetched and saved in files of at most blocks_per_file
+        blocks, so an interrupted download resumes from its last saved file
+    - new files are saved using file_format, or if None, using the format of
+        the most recent existing file of the event
+    - if decode_processes is given, logs are decoded in a pool of that many
+        processes while the remaining logs of each file are fetched
+    """
 
     from ctc import rpc
     from .event_backends import filesystem_events
+    from .event_backends import filesystem_formats
+    from .event_backends import filesystem_manifest
+    from .event_backends import node_chunking
+    from .event_backends import node_events
 
     if event_hash is None and event_name is None and event_abi is None:
         raise Exception('must specify either event_hash or event_name')
 
     contract_address = contract_address.lower()
 
-    if start_block is not None and end_block is not None:
-        start_block, end_block = await block_utils.async_block_numbers_to_int(
-            blocks=[start_block, end_block],
+    if start_block is None:
+        start_block = await block_utils.async_get_contract_creation_block(
+            contract_address,
+            provider=provider,
         )
-    elif start_block is not None:
-        start_block = await block_utils.async_block_number_to_int(start_block)
-    elif end_block is not None:
-        end_block = await block_utils.async_block_number_to_int(end_block)
+        if start_block is None:
+            raise Exception('could not determine contract creation block')
+    if end_block is None:
+        end_block = 'latest'
+    start_block, end_block = await block_utils.async_block_numbers_to_int(
+        blocks=[start_block, end_block],
+        provider=provider,
+    )
 
     provider = rpc.get_provider(provider)
     network = provider['network']
@@ -206,44 +246,74 @@ async def async_download_events(
     listed_events = filesystem_events.list_events(
         contract_address=contract_address,
         event_hash=event_hash,
+        allow_missing_blocks=True,
+        network=network,
     )
-    downloads: list[typing.Mapping[str, typing.Any]] = []
     if listed_events is None:
-        download: typing.Mapping[str, typing.Any] = {
-            'start_block': start_block,
-            'end_block': end_block,
-        }
-        downloads.append(download)
+        coverage: list[tuple[int, int]] = []
     else:
+        coverage = listed_events['coverage']
+    missing_intervals = filesystem_manifest.get_missing_intervals(
+        coverage,
+        start_block=start_block,
+        end_block=end_block,
+    )
+    downloads = _plan_event_downloads(
+        missing_intervals,
+        blocks_per_file=blocks_per_file,
+    )
 
-        block_range = listed_events['block_range']
-        if start_block < block_range[0]:
-            download = {
-                'start_block': start_block,
-                'end_block': block_range[0] - 1,
-                'common_kwargs': {'verbose': verbose},
-            }
-            downloads.append(download)
-        if end_block > block_range[-1]:
-            download = {
-                'start_block': block_range[-1] + 1,
-                'end_block': end_block,
-                'common_kwargs': {'verbose': verbose},
-            }
-            downloads.append(download)
-
-    # perform downloads
-    for download in downloads:
-        await async_transfer_events(
-            from_backend='node',
-            to_backend='filesystem',
-            event_hash=event_hash,
-            event_abi=event_abi,
-            contract_address=contract_address,
-            provider=provider,
-            **download,
+    # determine file format of new files
+    if file_format is None:
+        if listed_events is not None and len(listed_events['paths']) > 0:
+            paths = listed_events['paths']
+            latest_path = max(paths.keys(), key=lambda path: paths[path][1])
+            file_format = filesystem_formats.get_path_file_format(latest_path)
+        else:
+            file_format = filesystem_formats.default_events_file_format
+
+    if verbose and len(downloads) > 0:
+        n_blocks = sum(end - start + 1 for start, end in missing_intervals)
+        print(
+            'downloading',
+            n_blocks,
+            'missing blocks of events in',
+            len(downloads),
+            'files',
         )
 
+    # perform downloads, each file is saved before the next one is fetched
+    try:
+        for download_start_block, download_end_block in downloads:
+            events = await node_events.async_get_events_from_node(
+                event_hash=event_hash,
+                event_abi=event_abi,
+                contract_address=contract_address,
+                start_block=download_start_block,
+                end_block=download_end_block,
+                decode_processes=decode_processes,
+                save_log_density=False,
+                verbose=verbose,
+                provider=provider,
+            )
+            await filesystem_events.async_save_events_to_filesystem(
+                events,
+                event_hash=event_hash,
+                event_abi=event_abi,
+                contract_address=contract_address,
+                start_block=download_start_block,
+                end_block=download_end_block,
+                file_format=file_format,
+                verbose=verbose,
+                provider=provider,
+            )
+    finally:
+        # densities observed by the download are saved once
+        try:
+            node_chunking.save_log_densities(network)
+        except OSError:
+            pass
+
     # load from filesystem
     return await filesystem_events.async_get_events_from_filesystem(
         event_hash=event_hash,
@@ -251,11 +321,34 @@ async def async_download_events(
         contract_address=contract_address,
         start_block=start_block,
         end_block=end_block,
+        columns=columns,
         verbose=verbose,
         provider=provider,
     )
 
 
+def _plan_event_downloads(
+    missing_intervals: typing.Sequence[tuple[int, int]],
+    *,
+    blocks_per_file: int,
+) -> list[tuple[int, int]]:
+    """split missing block intervals into files of at most blocks_per_file
+
+    file boundaries are aligned to multiples of blocks_per_file, so that files
+    of repeated downloads line up with each other
+    """
+
+    downloads = []
+    for start_block, end_block in missing_intervals:
+        file_start = start_block
+        while file_start <= end_block:
+            file_end = (file_start // blocks_per_file + 1) * blocks_per_file - 1
+            file_end = min(file_end, end_block)
+            downloads.append((file_start, file_end))
+            file_start = file_end + 1
+    return downloads
+
+
 async def async_get_event_timestamps(
     events: spec.DataFrame,
     provider: spec.ProviderReference = None,
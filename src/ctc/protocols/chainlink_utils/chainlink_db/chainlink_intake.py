@@ -220,13 +220,13 @@ async def async_import_network_to_db(
     if engine is None:
         raise Exception('cannot find db table to import to')
 
-    with engine.begin() as conn:
-
-        await chainlink_statements.async_upsert_feeds(
-            feeds=feeds,
-            network=network,
-            conn=conn,
-        )
+    await db.async_run_with_connection(
+        chainlink_statements.upsert_feeds,
+        engine=engine,
+        begin=True,
+        feeds=feeds,
+        network=network,
+    )
 
     if verbose:
         if indent is None:
@@ -260,14 +260,15 @@ async def async_intake_aggregator_update(
         network=network,
     )
     if engine is not None:
-        with engine.begin() as conn:
-            await chainlink_statements.async_upsert_aggregator_update(
-                feed=feed,
-                aggregator=aggregator,
-                block_number=block_number,
-                network=network,
-                conn=conn,
-            )
+        await db.async_run_with_connection(
+            chainlink_statements.upsert_aggregator_update,
+            engine=engine,
+            begin=True,
+            feed=feed,
+            aggregator=aggregator,
+            block_number=block_number,
+            network=network,
+        )
 
 
 async def async_intake_aggregator_updates(
@@ -280,9 +281,10 @@ async def async_intake_aggregator_updates(
         network=network,
     )
     if engine is not None:
-        with engine.begin() as conn:
-            await chainlink_statements.async_upsert_aggregator_updates(
-                updates=updates,
-                network=network,
-                conn=conn,
-            )
+        await db.async_run_with_connection(
+            chainlink_statements.upsert_aggregator_updates,
+            engine=engine,
+            begin=True,
+            updates=updates,
+            network=network,
+        )
@@ -9,7 +9,7 @@ from ctc import db
 from . import chainlink_schema_defs
 
 
-async def async_upsert_feed(
+def upsert_feed(
     feed: typing.Mapping[typing.Any, typing.Any],
     conn: toolsql.SAConnection,
     *,
@@ -27,7 +27,7 @@ async def async_upsert_feed(
     )
 
 
-async def async_upsert_feeds(
+def upsert_feeds(
     feeds: typing.Sequence[typing.Mapping[str, typing.Any]],
     conn: toolsql.SAConnection,
     *,
@@ -45,7 +45,7 @@ async def async_upsert_feeds(
     )
 
 
-async def async_upsert_aggregator_update(
+def upsert_aggregator_update(
     *,
     feed: spec.Address,
     aggregator: spec.Address,
@@ -68,7 +68,7 @@ async def async_upsert_aggregator_update(
     )
 
 
-async def async_upsert_aggregator_updates(
+def upsert_aggregator_updates(
     *,
     conn: toolsql.SAConnection,
     updates: typing.Sequence[chainlink_schema_defs._FeedAggregatorUpdate],
@@ -93,7 +93,7 @@ async def async_upsert_aggregator_updates(
     )
 
 
-async def async_select_feed(
+def select_feed(
     *,
     network: spec.NetworkReference | None,
     conn: toolsql.SAConnection,
@@ -121,7 +121,7 @@ async def async_select_feed(
     )
 
 
-async def async_select_feeds(
+def select_feeds(
     *,
     network: spec.NetworkReference | None,
     conn: toolsql.SAConnection,
@@ -158,7 +158,7 @@ async def async_select_feeds(
     return result  # type: ignore
 
 
-async def async_select_aggregator_updates(
+def select_aggregator_updates(
     *,
     feed: spec.Address,
     aggregator: spec.Address | None = None,
@@ -193,7 +193,7 @@ async def async_select_aggregator_updates(
     return result  # type: ignore
 
 
-async def async_delete_feed(
+def delete_feed(
     network: spec.NetworkReference | None,
     conn: toolsql.SAConnection,
     *,
@@ -222,7 +222,7 @@ async def async_delete_feed(
     )
 
 
-async def async_delete_aggregator_updates(
+def delete_aggregator_updates(
     network: spec.NetworkReference | None,
     conn: toolsql.SAConnection,
     *,
@@ -249,3 +249,26 @@ async def async_delete_aggregator_updates(
         table=table,
         where_equals=where_equals,
     )
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_upsert_feed = db.create_async_statement(upsert_feed)
+async_upsert_feeds = db.create_async_statement(upsert_feeds)
+async_upsert_aggregator_update = db.create_async_statement(
+    upsert_aggregator_update
+)
+async_upsert_aggregator_updates = db.create_async_statement(
+    upsert_aggregator_updates
+)
+async_select_feed = db.create_async_statement(select_feed)
+async_select_feeds = db.create_async_statement(select_feeds)
+async_select_aggregator_updates = db.create_async_statement(
+    select_aggregator_updates
+)
+async_delete_feed = db.create_async_statement(delete_feed)
+async_delete_aggregator_updates = db.create_async_statement(
+    delete_aggregator_updates
+)
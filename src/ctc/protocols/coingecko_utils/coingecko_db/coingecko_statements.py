@@ -4,10 +4,11 @@ import typing
 
 import toolsql
 
+from ctc import db
 from . import coingecko_schema_defs
 
 
-async def async_upsert_tokens(
+def upsert_tokens(
     *,
     tokens: typing.Sequence[coingecko_schema_defs.CoingeckoToken],
     conn: toolsql.SAConnection,
@@ -24,7 +25,7 @@ async def async_upsert_tokens(
     )
 
 
-async def async_delete_tokens(
+def delete_tokens(
     *,
     ids: typing.Sequence[str],
     conn: toolsql.SAConnection,
@@ -40,7 +41,7 @@ async def async_delete_tokens(
     )
 
 
-async def async_select_token(
+def select_token(
     *,
     conn: toolsql.SAConnection,
     id: str | None = None,
@@ -62,7 +63,7 @@ async def async_select_token(
     return result
 
 
-async def async_select_tokens(
+def select_tokens(
     *,
     symbol_query: str | None = None,
     name_query: str | None = None,
@@ -96,6 +97,7 @@ async def async_select_tokens(
     # combine filters
     if symbol_filter is not None and name_filter is not None:
         import sqlalchemy  # type: ignore
+
         query_filter = sqlalchemy.or_(symbol_filter, name_filter)
         filters = [query_filter]
     elif symbol_filter is not None:
@@ -124,3 +126,13 @@ async def async_select_tokens(
     together: typing.MutableSequence[coingecko_schema_defs.CoingeckoToken] = ranked + unranked
 
     return together
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_upsert_tokens = db.create_async_statement(upsert_tokens)
+async_delete_tokens = db.create_async_statement(delete_tokens)
+async_select_token = db.create_async_statement(select_token)
+async_select_tokens = db.create_async_statement(select_tokens)
@@ -22,11 +22,12 @@ async def async_intake_function_signature(
     )
     if engine is None:
         return
-    with engine.begin() as conn:
-        await fourbyte_statements.async_upsert_function_signature(
-            function_signature=function_signature,
-            conn=conn,
-        )
+    await db.async_run_with_connection(
+        fourbyte_statements.upsert_function_signature,
+        engine=engine,
+        begin=True,
+        function_signature=function_signature,
+    )
 
 
 async def async_intake_function_signatures(
@@ -37,11 +38,12 @@ async def async_intake_function_signatures(
     engine = db.create_engine(schema_name='4byte', network=None)
     if engine is None:
         return
-    with engine.begin() as conn:
-        await fourbyte_statements.async_upsert_function_signatures(
-            function_signatures=function_signatures,
-            conn=conn,
-        )
+    await db.async_run_with_connection(
+        fourbyte_statements.upsert_function_signatures,
+        engine=engine,
+        begin=True,
+        function_signatures=function_signatures,
+    )
 
 
 #
@@ -55,11 +57,12 @@ async def async_intake_event_signature(
     engine = db.create_engine(schema_name='4byte', network=None)
     if engine is None:
         return
-    with engine.begin() as conn:
-        await fourbyte_statements.async_upsert_event_signature(
-            event_signature=event_signature,
-            conn=conn,
-        )
+    await db.async_run_with_connection(
+        fourbyte_statements.upsert_event_signature,
+        engine=engine,
+        begin=True,
+        event_signature=event_signature,
+    )
 
 
 async def async_intake_event_signatures(
@@ -68,8 +71,9 @@ async def async_intake_event_signatures(
     engine = db.create_engine(schema_name='4byte', network=None)
     if engine is None:
         return
-    with engine.begin() as conn:
-        await fourbyte_statements.async_upsert_event_signatures(
-            event_signatures=event_signatures,
-            conn=conn,
-        )
+    await db.async_run_with_connection(
+        fourbyte_statements.upsert_event_signatures,
+        engine=engine,
+        begin=True,
+        event_signatures=event_signatures,
+    )
@@ -4,6 +4,7 @@ import typing
 
 import toolsql
 
+from ctc import db
 from .. import fourbyte_spec
 
 
@@ -12,7 +13,7 @@ from .. import fourbyte_spec
 #
 
 
-async def async_upsert_function_signature(
+def upsert_function_signature(
     function_signature: fourbyte_spec.PartialEntry,
     conn: toolsql.SAConnection,
 ) -> None:
@@ -25,7 +26,7 @@ async def async_upsert_function_signature(
     )
 
 
-async def async_upsert_function_signatures(
+def upsert_function_signatures(
     function_signatures: typing.Sequence[fourbyte_spec.PartialEntry],
     conn: toolsql.SAConnection,
 ) -> None:
@@ -38,7 +39,7 @@ async def async_upsert_function_signatures(
     )
 
 
-async def async_select_function_signatures(
+def select_function_signatures(
     conn: toolsql.SAConnection,
     *,
     hex_signature: str | None = None,
@@ -65,7 +66,7 @@ async def async_select_function_signatures(
     )
 
 
-async def async_delete_function_signatures(
+def delete_function_signatures(
     conn: toolsql.SAConnection,
     *,
     hex_signature: str | None = None,
@@ -94,7 +95,7 @@ async def async_delete_function_signatures(
 #
 
 
-async def async_upsert_event_signature(
+def upsert_event_signature(
     event_signature: fourbyte_spec.PartialEntry,
     conn: toolsql.SAConnection,
 ) -> None:
@@ -107,7 +108,7 @@ async def async_upsert_event_signature(
     )
 
 
-async def async_upsert_event_signatures(
+def upsert_event_signatures(
     event_signatures: typing.Sequence[fourbyte_spec.PartialEntry],
     conn: toolsql.SAConnection,
 ) -> None:
@@ -120,7 +121,7 @@ async def async_upsert_event_signatures(
     )
 
 
-async def async_select_event_signatures(
+def select_event_signatures(
     conn: toolsql.SAConnection,
     *,
     hex_signature: str | None = None,
@@ -147,7 +148,7 @@ async def async_select_event_signatures(
     )
 
 
-async def async_delete_event_signatures(
+def delete_event_signatures(
     conn: toolsql.SAConnection,
     *,
     hex_signature: str | None = None,
@@ -169,3 +170,31 @@ async def async_delete_event_signatures(
         table='event_signatures',
         where_equals=where_equals,
     )
+
+
+#
+# # coroutine versions, for callers already holding a connection
+#
+
+async_upsert_function_signature = db.create_async_statement(
+    upsert_function_signature
+)
+async_upsert_function_signatures = db.create_async_statement(
+    upsert_function_signatures
+)
+async_select_function_signatures = db.create_async_statement(
+    select_function_signatures
+)
+async_delete_function_signatures = db.create_async_statement(
+    delete_function_signatures
+)
+async_upsert_event_signature = db.create_async_statement(upsert_event_signature)
+async_upsert_event_signatures = db.create_async_statement(
+    upsert_event_signatures
+)
+async_select_event_signatures = db.create_async_statement(
+    select_event_signatures
+)
+async_delete_event_signatures = db.create_async_statement(
+    delete_event_signatures
+)
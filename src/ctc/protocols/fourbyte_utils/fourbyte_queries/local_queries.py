@@ -6,13 +6,13 @@ from ..fourbyte_db import fourbyte_statements
 
 
 async_query_local_function_signatures = db.wrap_selector_with_connection(
-    fourbyte_statements.async_select_function_signatures,
+    fourbyte_statements.select_function_signatures,
     '4byte',
     require_network=False,
 )
 
 async_query_local_event_signatures = db.wrap_selector_with_connection(
-    fourbyte_statements.async_select_event_signatures,
+    fourbyte_statements.select_event_signatures,
     '4byte',
     require_network=False,
 )
@@ -4,9 +4,13 @@ from .rpc_digestors import *
 from .rpc_executors import *
 from .rpc_protocols import *
 
+from .rpc_cache import *
+from .rpc_coalescing import *
 from .rpc_format import *
 from .rpc_lifecycle import *
+from .rpc_pool import *
 from .rpc_provider import *
 from .rpc_registry import *
 from .rpc_request import *
+from .rpc_scheduler import *
 from .rpc_spec import *
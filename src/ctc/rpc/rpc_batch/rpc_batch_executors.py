@@ -6,6 +6,7 @@ from ctc import evm
 from ctc import spec
 
 from .. import rpc_provider
+from . import rpc_batch_multicall
 from . import rpc_batch_utils
 
 
@@ -31,8 +32,18 @@ async def async_batch_eth_call(
     provider: spec.ProviderReference = None,
     to_address: spec.Address | None = None,
     to_addresses: typing.Sequence[spec.Address] | None = None,
+    multicall: bool | None = None,
     **kwargs: typing.Any,
 ) -> spec.RpcPluralResponse:
+    """execute batch of eth_calls
+
+    if multicall is True, calls at the same block are packed into Multicall3
+    calls, see rpc_batch_multicall. packed calls see Multicall3 as msg.sender
+    rather than the zero address. defaults to get_batch_multicall_enabled()
+    """
+
+    if multicall is None:
+        multicall = rpc_batch_multicall.get_batch_multicall_enabled()
 
     if function_abi is None:
 
@@ -63,6 +74,7 @@ async def async_batch_eth_call(
         provider=provider,
         to_address=to_address,
         to_addresses=to_addresses,
+        multicall=multicall,
         **kwargs,
     )
 
@@ -0,0 +1,278 @@
+"""execution of eth_call batches through Multicall3
+
+eth_calls at the same block are packed into Multicall3 aggregate3 calls, so
+that a batch of many calls costs only a few requests. calls are packed
+until a multicall reaches its budget of calls or of calldata. each call
+is allowed to fail individually, and failed calls are converted
+to None or raised according to the provider's convert_reverts_to_none
+
+calls that set a sender, value, gas, or gas price, and calls at blocks
+before Multicall3 was deployed, are sent as regular eth_calls
+
+calls without a sender are executed with msg.sender set to the Multicall3
+contract instead of the zero address, so views whose result depends on the
+sender can return different results than unbatched calls. packing is
+therefore opt-in, per batch or through set_batch_multicall_enabled()
+"""
+
+from __future__ import annotations
+
+import typing
+
+from ctc import spec
+from .. import rpc_provider
+from .. import rpc_request
+
+if typing.TYPE_CHECKING:
+    from typing_extensions import TypedDict
+
+    class MulticallBudget(TypedDict):
+        max_calls: int
+        max_calldata_bytes: int
+
+
+# Multicall3 has the same address on every network it is deployed to
+multicall3_address = '0xca11bde05977b3631167028862be2a173976ca11'
+
+# block at which Multicall3 was deployed on each network
+multicall3_deploy_blocks: typing.Mapping[int, int] = {
+    1: 14_353_601,
+    5: 6_507_670,
+    10: 4_286_263,
+    56: 15_921_452,
+    100: 21_022_491,
+    137: 25_770_160,
+    250: 33_001_987,
+    8453: 5_022,
+    42161: 7_654_707,
+    43114: 11_907_934,
+}
+
+multicall_budget: MulticallBudget = {
+    'max_calls': 500,
+    'max_calldata_bytes': 100_000,
+}
+
+aggregate3_function_abi: spec.FunctionABI = {
+    'inputs': [
+        {
+            'components': [
+                {'name': 'target', 'type': 'address'},
+                {'name': 'allowFailure', 'type': 'bool'},
+                {'name': 'callData', 'type': 'bytes'},
+            ],
+            'name': 'calls',
+            'type': 'tuple[]',
+        }
+    ],
+    'name': 'aggregate3',
+    'outputs': [
+        {
+            'components': [
+                {'name': 'success', 'type': 'bool'},
+                {'name': 'returnData', 'type': 'bytes'},
+            ],
+            'name': 'returnData',
+            'type': 'tuple[]',
+        }
+    ],
+    'stateMutability': 'payable',
+    'type': 'function',
+}
+
+_multicall_state = {
+    'enabled': False,
+}
+
+
+def set_batch_multicall_enabled(enabled: bool) -> None:
+    """set whether eth_call batches are sent through Multicall3 by default
+
+    calls packed into a multicall see the Multicall3 contract as msg.sender
+    instead of the zero address, so only enable this for calls whose results
+    do not depend on the sender
+    """
+    _multicall_state['enabled'] = enabled
+
+
+def get_batch_multicall_enabled() -> bool:
+    return _multicall_state['enabled']
+
+
+def set_multicall_budget(
+    *,
+    max_calls: int | None = None,
+    max_calldata_bytes: int | None = None,
+) -> None:
+    """set call and calldata budget of each multicall"""
+    if max_calls is not None:
+        multicall_budget['max_calls'] = max_calls
+    if max_calldata_bytes is not None:
+        multicall_budget['max_calldata_bytes'] = max_calldata_bytes
+
+
+def is_multicall_eligible(
+    subrequest: spec.RpcSingularRequest, network: spec.NetworkReference
+) -> bool:
+    """whether eth_call request can be executed inside a multicall"""
+    from ctc import evm
+
+    call_object, block = subrequest['params']
+    if set(call_object.keys()) != {'to', 'data'}:
+        return False
+    chain_id = evm.get_network_chain_id(network)
+    if chain_id not in multicall3_deploy_blocks:
+        return False
+    if not isinstance(block, str):
+        return False
+    if block.startswith('0x'):
+        return int(block, 16) >= multicall3_deploy_blocks[chain_id]
+    return block == 'latest'
+
+
+def pack_multicalls(
+    request: spec.RpcPluralRequest, network: spec.NetworkReference
+) -> tuple[list[list[int]], list[int]]:
+    """group eth_call subrequests into multicalls
+
+    returns (multicalls, direct), where each multicall is a list of indices
+    into request, and direct holds indices of calls to send individually
+    """
+    from ctc import evm
+
+    max_calls = max(1, multicall_budget['max_calls'])
+    max_calldata_bytes = multicall_budget['max_calldata_bytes']
+    chain_id = evm.get_network_chain_id(network)
+
+    multicalls: list[list[int]] = []
+    direct: list[int] = []
+    open_multicalls: dict[str, tuple[list[int], int]] = {}
+    for index, subrequest in enumerate(request):
+        if not is_multicall_eligible(subrequest, chain_id):
+            direct.append(index)
+            continue
+
+        # each call adds about 4 words of encoding plus its calldata
+        block = subrequest['params'][1]
+        calldata_bytes = (len(subrequest['params'][0]['data']) - 2) // 2
+        n_bytes = 128 + 32 * ((calldata_bytes + 31) // 32)
+
+        multicall, multicall_bytes = open_multicalls.get(block, ([], 0))
+        if len(multicall) > 0 and (
+            len(multicall) >= max_calls
+            or multicall_bytes + n_bytes > max_calldata_bytes
+        ):
+            multicall, multicall_bytes = [], 0
+        if len(multicall) == 0:
+            multicalls.append(multicall)
+        multicall.append(index)
+        open_multicalls[block] = (multicall, multicall_bytes + n_bytes)
+
+    # a multicall of one call saves nothing
+    for multicall in multicalls:
+        if len(multicall) == 1:
+            direct.append(multicall[0])
+    multicalls = [multicall for multicall in multicalls if len(multicall) > 1]
+    direct.sort()
+
+    return multicalls, direct
+
+
+def encode_multicall(
+    request: spec.RpcPluralRequest, indices: typing.Sequence[int]
+) -> spec.RpcSingularRequest:
+    """create aggregate3 eth_call executing subrequests at indices"""
+    from ctc import evm
+
+    calls = []
+    for index in indices:
+        call_object = request[index]['params'][0]
+        call_data = evm.binary_convert(call_object['data'], 'binary')
+        calls.append((call_object['to'], True, call_data))
+    multicall_data = evm.encode_call_data(
+        function_abi=aggregate3_function_abi,
+        parameters=[calls],
+    )
+    block = request[indices[0]]['params'][1]
+    return rpc_request.create(
+        'eth_call',
+        [{'to': multicall3_address, 'data': multicall_data}, block],
+    )
+
+
+def decode_multicall(
+    response: spec.BinaryData,
+) -> list[tuple[bool, str]]:
+    """decode aggregate3 output into (success, return data) of each call"""
+    from ctc import evm
+
+    decoded = evm.decode_function_output(
+        encoded_output=response,
+        function_abi=aggregate3_function_abi,
+    )
+    return [
+        (success, '0x' + return_data.hex()) for success, return_data in decoded
+    ]
+
+
+async def async_send_multicall_batch(
+    request: spec.RpcPluralRequest,
+    provider: spec.ProviderReference = None,
+) -> list[typing.Any]:
+    """send eth_call batch, packing eligible calls into multicalls
+
+    returns raw output of each call, like rpc_request.async_send
+    """
+    import asyncio
+
+    full_provider = rpc_provider.get_provider(provider)
+    multicalls, direct = pack_multicalls(request, full_provider['network'])
+
+    output: list[typing.Any] = [None] * len(request)
+
+    async def async_send_multicall(indices: list[int]) -> list[int]:
+        """send multicall, returning indices of calls to retry directly"""
+        multicall = encode_multicall(request, indices)
+        try:
+            response = await rpc_request.async_send(
+                multicall, provider=full_provider
+            )
+        except spec.RpcException:
+            # e.g. the multicall exceeded the node's gas cap
+            return indices
+        if not isinstance(response, str):
+            # e.g. the multicall reverted and was converted to None
+            return indices
+        try:
+            results = decode_multicall(response)
+        except Exception:
+            return indices
+        for index, (success, return_data) in zip(indices, results):
+            if success:
+                output[index] = return_data
+            elif not full_provider['convert_reverts_to_none']:
+                raise spec.RpcException(
+                    'RPC ERROR: execution reverted in call ' + str(index)
+                )
+        return []
+
+    async def async_send_direct(indices: list[int]) -> None:
+        if len(indices) == 0:
+            return
+        direct_request = [request[index] for index in indices]
+        results = await rpc_request.async_send(
+            direct_request, provider=full_provider
+        )
+        for index, result in zip(indices, results):
+            output[index] = result
+
+    retried = await asyncio.gather(
+        *[async_send_multicall(indices) for indices in multicalls],
+        async_send_direct(direct),
+    )
+    retry = sorted(
+        index for indices in retried if indices is not None for index in indices
+    )
+    await async_send_direct(retry)
+
+    return output
@@ -29,12 +29,67 @@ def batch_construct(
         constructor_kwargs,
         batch_inputs,
     )
+    values = list(values)
+
+    # substitute values directly into a template request if possible
+    slots = batch_parameter_slots.get(method, {})
+    if parameter in slots and len(values) > 0:
+        template = singular_constructor(
+            **{parameter: values[0]}, **other_constructor_kwargs
+        )
+        parameter_lists = [template['params']]
+        for value in values[1:]:
+            if parameter == 'block_number':
+                if type(value) is not int or value < 0:
+                    subrequest = singular_constructor(
+                        **{parameter: value}, **other_constructor_kwargs
+                    )
+                    parameter_lists.append(subrequest['params'])
+                    continue
+                value = hex(value)
+            parameter_lists.append(
+                _substitute_parameter(
+                    template['params'], slot=slots[parameter], value=value
+                )
+            )
+        return rpc_request.create_batch(template['method'], parameter_lists)
+
     return [
         singular_constructor(**{parameter: value}, **other_constructor_kwargs)
         for value in values
     ]
 
 
+# location of each batchable parameter within the params of a request, as
+# (index into params, key into params[index] or None)
+batch_parameter_slots: typing.Mapping[
+    str, typing.Mapping[str, tuple[int, str | None]]
+] = {
+    'eth_call': {'to_address': (0, 'to'), 'block_number': (1, None)},
+    'eth_get_balance': {'address': (0, None), 'block_number': (1, None)},
+    'eth_get_block_by_number': {'block_number': (0, None)},
+    'eth_get_code': {'address': (0, None), 'block_number': (1, None)},
+    'eth_get_storage_at': {'address': (0, None), 'block_number': (2, None)},
+    'eth_get_transaction_by_hash': {'transaction_hash': (0, None)},
+    'eth_get_transaction_receipt': {'transaction_hash': (0, None)},
+}
+
+
+def _substitute_parameter(
+    parameters: list[typing.Any],
+    *,
+    slot: tuple[int, str | None],
+    value: typing.Any,
+) -> list[typing.Any]:
+    index, key = slot
+    parameters = list(parameters)
+    if key is None:
+        parameters[index] = value
+    else:
+        parameters[index] = dict(parameters[index], **{key: value})
+    return parameters
+
+
 def _get_batch_parameter(
     kwargs: typing.Mapping[str, typing.Any],
     batch_inputs: typing.Mapping[str, str],
@@ -79,16 +134,29 @@ async def async_batch_execute(
     method: str,
     *,
     provider: spec.ProviderReference = None,
+    multicall: bool = False,
     **kwargs: typing.Any,
 ) -> spec.RpcPluralResponse:
-    """execute batch rpc call asynchronously"""
+    """execute batch rpc call asynchronously
+
+    if multicall is True, eth_calls are packed into Multicall3 calls
+    """
 
     constructor_kwargs, digestor_kwargs = _separate_execution_kwargs(
         method=method,
         kwargs=kwargs,
     )
     request = batch_construct(method=method, **constructor_kwargs)
-    response = await rpc_request.async_send(request=request, provider=provider)
+    if multicall and method == 'eth_call':
+        from . import rpc_batch_multicall
+
+        response = await rpc_batch_multicall.async_send_multicall_batch(
+            request, provider=provider
+        )
+    else:
+        response = await rpc_request.async_send(
+            request=request, provider=provider
+        )
     return batch_digest(response=response, method=method, **digestor_kwargs)
 
 
@@ -133,9 +201,63 @@ def batch_digest(
     **digestor_kwargs: typing.Any,
 ) -> spec.RpcPluralResponse:
 
+    if method == 'eth_call':
+        return _batch_digest_eth_call(response, **digestor_kwargs)
+
     digestor = rpc_registry.get_digestor(method)
     results = []
     for s, subresponse in enumerate(response):
         result = digestor(subresponse, **digestor_kwargs)
         results.append(result)
     return results
+
+
+def _batch_digest_eth_call(
+    response: spec.RpcPluralResponse,
+    *,
+    function_abi: spec.FunctionABI | None = None,
+    decode_response: bool = True,
+    **digestor_kwargs: typing.Any,
+) -> spec.RpcPluralResponse:
+    """digest eth_call outputs, decoding outputs of the abi together"""
+    from ctc import evm
+
+    digestor = rpc_registry.get_digestor('eth_call')
+    if not decode_response or function_abi is None:
+        return [
+            digestor(
+                subresponse,
+                function_abi=function_abi,
+                decode_response=decode_response,
+                **digestor_kwargs,
+            )
+            for subresponse in response
+        ]
+
+    # outputs that are missing or replaced by empty_token are not decoded
+    fill_empty = digestor_kwargs.get('fill_empty', False)
+    empty_token = digestor_kwargs.get('empty_token')
+    replace_empty = fill_empty or empty_token is not None
+    results: list[typing.Any] = [None] * len(response)
+    indices = []
+    for index, subresponse in enumerate(response):
+        if subresponse is None:
+            continue
+        elif replace_empty and subresponse == '0x':
+            results[index] = empty_token
+        else:
+            indices.append(index)
+
+    decoded = evm.decode_function_outputs(
+        encoded_outputs=[response[index] for index in indices],
+        function_abi=function_abi,
+        delist_single_outputs=digestor_kwargs.get(
+            'delist_single_outputs', True
+        ),
+        package_named_outputs=digestor_kwargs.get(
+            'package_named_outputs', False
+        ),
+    )
+    for index, output in zip(indices, decoded):
+        results[index] = output
+    return results
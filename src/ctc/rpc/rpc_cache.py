@@ -0,0 +1,489 @@
+"""content-addressed cache of responses to immutable rpc requests
+
+requests that reference a fixed historical block, such as eth_call at a
+block number or eth_getLogs over a block range, always return the same
+result once the block is old enough to be safe from reorgs. such results
+are stored in a local sqlite database keyed by a hash of (network, method,
+normalized params), and the least recently used entries are evicted when
+the database exceeds its size limit
+
+requests referencing 'latest', 'pending', or other moving block tags are
+never cached, and results are only stored once their block has at least
+reorg_utils.get_required_confirmations() confirmations
+
+the cache is disabled by default, enable it with enable_rpc_cache()
+
+database i/o runs in a worker thread of the cache so that it does not block
+the event loop, and the recency of cache hits is recorded in memory and
+written in batches instead of in a write transaction per hit
+"""
+
+from __future__ import annotations
+
+import typing
+
+from ctc import spec
+
+if typing.TYPE_CHECKING:
+    import concurrent.futures
+    import sqlite3
+
+
+default_rpc_cache_max_bytes = 2**30
+
+# seconds for which a fetched latest block number is reused
+rpc_cache_latest_block_ttl = 30
+
+# number of cache hits whose recency is buffered before being written
+rpc_cache_access_batch_size = 1000
+
+_T = typing.TypeVar('_T')
+
+_rpc_cache_state: dict[str, typing.Any] = {
+    'cache': None,
+}
+
+# network -> (time fetched, latest block number)
+_latest_blocks: dict[spec.NetworkReference, tuple[float, int]] = {}
+
+
+#
+# # cache management
+#
+
+
+def enable_rpc_cache(
+    *,
+    path: str | None = None,
+    max_bytes: int = default_rpc_cache_max_bytes,
+) -> RpcCache:
+    """enable caching of immutable rpc responses
+
+    path defaults to rpc_cache.db in the ctc data directory
+    """
+    import os
+
+    if path is None:
+        from ctc import config
+
+        path = os.path.join(config.get_data_dir(), 'rpc_cache.db')
+    disable_rpc_cache()
+    cache = RpcCache(path=path, max_bytes=max_bytes)
+    _rpc_cache_state['cache'] = cache
+    return cache
+
+
+def disable_rpc_cache() -> None:
+    cache = _rpc_cache_state['cache']
+    if cache is not None:
+        cache.close()
+    _rpc_cache_state['cache'] = None
+
+
+def get_rpc_cache() -> RpcCache | None:
+    """get active rpc cache, or None if caching is disabled"""
+    cache: RpcCache | None = _rpc_cache_state['cache']
+    return cache
+
+
+class RpcCache:
+    """sqlite store of rpc results with least recently used eviction"""
+
+    def __init__(self, *, path: str, max_bytes: int) -> None:
+        import os
+        import sqlite3
+        import threading
+
+        dirname = os.path.dirname(path)
+        if dirname != '':
+            os.makedirs(dirname, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+        # key -> time of most recent hit not yet written to database
+        self.accessed: dict[bytes, float] = {}
+
+        # the connection is used from the worker thread of the cache
+        self.connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rpc_responses (
+                key BLOB PRIMARY KEY,
+                result BLOB NOT NULL,
+                n_bytes INTEGER NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self.connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS rpc_responses_accessed
+            ON rpc_responses (accessed)
+            """
+        )
+        self.n_bytes = self._query_n_bytes()
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        with self.lock:
+            if len(self.accessed) > 0:
+                with _transaction(self.connection):
+                    self._write_accessed()
+            self.connection.close()
+
+    async def async_get_results(
+        self, keys: typing.Sequence[bytes]
+    ) -> dict[bytes, typing.Any]:
+        """get_results() in the worker thread of the cache"""
+        return await self._async_run(self.get_results, keys)
+
+    async def async_put_results(
+        self, results: typing.Mapping[bytes, typing.Any]
+    ) -> None:
+        """put_results() in the worker thread of the cache"""
+        await self._async_run(self.put_results, results)
+
+    async def _async_run(
+        self, function: typing.Callable[[typing.Any], _T], argument: typing.Any
+    ) -> _T:
+        import asyncio
+        import concurrent.futures
+
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='ctc_rpc_cache'
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, function, argument)
+
+    def _query_n_bytes(self) -> int:
+        cursor = self.connection.execute(
+            'SELECT COALESCE(SUM(n_bytes), 0) FROM rpc_responses'
+        )
+        n_bytes: int = cursor.fetchone()[0]
+        return n_bytes
+
+    def get_results(
+        self, keys: typing.Sequence[bytes]
+    ) -> dict[bytes, typing.Any]:
+        """get cached results of keys, omitting keys that are not cached"""
+        import time
+        from .rpc_protocols import rpc_json_codec
+
+        codec = rpc_json_codec.get_json_codec()
+        results = {}
+        with self.lock:
+            for chunk in _chunk_keys(keys):
+                placeholders = ','.join('?' * len(chunk))
+                cursor = self.connection.execute(
+                    'SELECT key, result FROM rpc_responses WHERE key IN ('
+                    + placeholders
+                    + ')',
+                    chunk,
+                )
+                for key, result in cursor:
+                    results[bytes(key)] = codec.decode(result)
+
+            # buffer recency of hits, writing it once enough have accumulated
+            now = time.time()
+            for key in results.keys():
+                self.accessed[key] = now
+            if len(self.accessed) >= rpc_cache_access_batch_size:
+                with _transaction(self.connection):
+                    self._write_accessed()
+        return results
+
+    def _write_accessed(self) -> None:
+        """write buffered recency of hits, within a transaction"""
+        self.connection.executemany(
+            'UPDATE rpc_responses SET accessed = ? WHERE key = ?',
+            [(accessed, key) for key, accessed in self.accessed.items()],
+        )
+        self.accessed = {}
+
+    def put_results(self, results: typing.Mapping[bytes, typing.Any]) -> None:
+        """store results by key, evicting old entries if over size limit"""
+        import time
+        from .rpc_protocols import rpc_json_codec
+
+        if len(results) == 0:
+            return
+        codec = rpc_json_codec.get_json_codec()
+        now = time.time()
+        rows = []
+        for key, result in results.items():
+            encoded = codec.encode(result)
+            rows.append((key, encoded, len(key) + len(encoded), now))
+        with self.lock:
+            with _transaction(self.connection):
+                self._write_accessed()
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO rpc_responses VALUES (?, ?, ?, ?)',
+                    rows,
+                )
+            self.n_bytes += sum(row[2] for row in rows)
+            if self.n_bytes > self.max_bytes:
+                self._evict()
+
+    def evict(self) -> None:
+        """evict least recently used entries until 90% of size limit"""
+        with self.lock:
+            self._evict()
+
+    def _evict(self) -> None:
+
+        # other processes may share the database, so recount its size
+        self.n_bytes = self._query_n_bytes()
+        target_bytes = int(self.max_bytes * 0.9)
+        if self.n_bytes <= target_bytes:
+            return
+
+        # order by the latest recency of entries
+        if len(self.accessed) > 0:
+            with _transaction(self.connection):
+                self._write_accessed()
+
+        cursor = self.connection.execute(
+            'SELECT key, n_bytes FROM rpc_responses ORDER BY accessed'
+        )
+        evicted = []
+        n_bytes = self.n_bytes
+        for key, entry_bytes in cursor:
+            if n_bytes <= target_bytes:
+                break
+            evicted.append((key,))
+            n_bytes -= entry_bytes
+        cursor.close()
+
+        with _transaction(self.connection):
+            self.connection.executemany(
+                'DELETE FROM rpc_responses WHERE key = ?', evicted
+            )
+        self.n_bytes = n_bytes
+
+
+class _transaction:
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> None:
+        self.connection.execute('BEGIN')
+
+    def __exit__(self, exc_type: typing.Any, *args: typing.Any) -> None:
+        if exc_type is None:
+            self.connection.execute('COMMIT')
+        else:
+            self.connection.execute('ROLLBACK')
+
+
+def _chunk_keys(
+    keys: typing.Sequence[bytes], chunk_size: int = 500
+) -> typing.Iterator[typing.Sequence[bytes]]:
+    for i in range(0, len(keys), chunk_size):
+        yield keys[i : i + chunk_size]
+
+
+#
+# # cacheability
+#
+
+
+def get_rpc_cache_key(
+    request: spec.RpcSingularRequest, network: spec.NetworkReference
+) -> bytes:
+    """hash of (network, method, normalized params)"""
+    import hashlib
+    import json
+
+    normalized = json.dumps(
+        [network, request['method'], _normalize(request['params'])],
+        sort_keys=True,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(normalized.encode()).digest()
+
+
+def _normalize(value: typing.Any) -> typing.Any:
+    """normalize params so that equivalent requests have equal keys"""
+    if isinstance(value, str):
+        if value.startswith(('0x', '0X')):
+            return value.lower()
+        return value
+    elif isinstance(value, dict):
+        return {
+            key: _normalize(subvalue)
+            for key, subvalue in value.items()
+            if subvalue is not None
+        }
+    elif isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    else:
+        return value
+
+
+# index of the block reference within the params of each method
+_block_parameter_index = {
+    'eth_call': 1,
+    'eth_getBalance': 1,
+    'eth_getBlockByNumber': 0,
+    'eth_getBlockTransactionCountByNumber': 0,
+    'eth_getCode': 1,
+    'eth_getStorageAt': 2,
+    'eth_getTransactionByBlockNumberAndIndex': 0,
+    'eth_getTransactionCount': 1,
+    'eth_getUncleCountByBlockNumber': 0,
+    'trace_block': 0,
+}
+
+# methods whose params do not reference a block, for which the block is
+# taken from the result
+_result_block_methods = {
+    'eth_getBlockByHash',
+    'eth_getTransactionByHash',
+    'eth_getTransactionReceipt',
+    'trace_transaction',
+}
+
+
+def is_cacheable_request(request: spec.RpcSingularRequest) -> bool:
+    """whether request could have an immutable result"""
+    method = request['method']
+    params = request['params']
+    if method in _block_parameter_index:
+        index = _block_parameter_index[method]
+        if len(params) <= index:
+            return False
+        return _parse_block(params[index]) is not None
+    elif method == 'eth_getLogs':
+        if len(params) != 1 or not isinstance(params[0], dict):
+            return False
+        return (
+            _parse_block(params[0].get('fromBlock')) is not None
+            and _parse_block(params[0].get('toBlock')) is not None
+        )
+    else:
+        return method in _result_block_methods
+
+
+def _parse_block(block: typing.Any) -> int | None:
+    """parse block reference, None if block tag can move"""
+    if not isinstance(block, str):
+        return None
+    if block == 'earliest':
+        return 0
+    if block.startswith('0x'):
+        try:
+            return int(block, 16)
+        except ValueError:
+            return None
+    return None
+
+
+def get_rpc_result_block(
+    request: spec.RpcSingularRequest, result: typing.Any
+) -> int | None:
+    """get block that result depends on, None if it cannot be determined"""
+    method = request['method']
+    if method in _block_parameter_index:
+        return _parse_block(request['params'][_block_parameter_index[method]])
+    elif method == 'eth_getLogs':
+        return _parse_block(request['params'][0]['toBlock'])
+    elif method in _result_block_methods:
+        if isinstance(result, list):
+            if len(result) == 0:
+                return None
+            result = result[-1]
+        if isinstance(result, dict):
+            block = result.get('blockNumber', result.get('number'))
+            if isinstance(block, int):
+                # traces encode block numbers as integers
+                return block
+            return _parse_block(block)
+        return None
+    else:
+        return None
+
+
+#
+# # sending
+#
+
+
+async def async_get_cached_rpc_results(
+    requests: typing.Sequence[spec.RpcSingularRequest],
+    network: spec.NetworkReference,
+) -> dict[int, typing.Any]:
+    """get cached results of requests, as {index: result}"""
+    cache = get_rpc_cache()
+    if cache is None:
+        return {}
+    keys = {
+        index: get_rpc_cache_key(request, network)
+        for index, request in enumerate(requests)
+        if is_cacheable_request(request)
+    }
+    if len(keys) == 0:
+        return {}
+    cached = await cache.async_get_results(list(keys.values()))
+    return {index: cached[key] for index, key in keys.items() if key in cached}
+
+
+async def async_store_rpc_results(
+    requests: typing.Sequence[spec.RpcSingularRequest],
+    results: typing.Sequence[typing.Any],
+    *,
+    provider: spec.Provider,
+) -> None:
+    """store results whose blocks are safe from reorgs"""
+    cache = get_rpc_cache()
+    if cache is None:
+        return
+
+    candidates = []
+    for request, result in zip(requests, results):
+        if result is None or not is_cacheable_request(request):
+            continue
+        block = get_rpc_result_block(request, result)
+        if block is not None:
+            candidates.append((request, result, block))
+    if len(candidates) == 0:
+        return
+
+    from ctc.db.management import reorg_utils
+
+    network = provider['network']
+    latest_block = await _async_get_latest_block(provider)
+    max_block = latest_block - reorg_utils.get_required_confirmations(network)
+    await cache.async_put_results(
+        {
+            get_rpc_cache_key(request, network): result
+            for request, result, block in candidates
+            if block <= max_block
+        }
+    )
+
+
+async def _async_get_latest_block(provider: spec.Provider) -> int:
+    import time
+    from .rpc_executors import rpc_block_executors
+
+    # a stale latest block only makes the age check more conservative
+    network = provider['network']
+    fetched = _latest_blocks.get(network)
+    if (
+        fetched is not None
+        and time.time() - fetched[0] < rpc_cache_latest_block_ttl
+    ):
+        return fetched[1]
+    latest_block: int = await rpc_block_executors.async_eth_block_number(
+        provider=provider
+    )
+    _latest_blocks[network] = (time.time(), latest_block)
+    return latest_block
@@ -0,0 +1,130 @@
+"""coalescing of concurrent identical requests
+
+while a request is in flight, identical requests wait for its result instead
+of being sent again. hits count the requests served by an in-flight request
+and misses count the requests actually sent, per namespace
+
+rpc_request.async_send coalesces singular requests in the 'rpc' namespace,
+other lookups such as abi retrieval use async_coalesce() directly
+"""
+
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    import asyncio
+
+    _T = typing.TypeVar('_T')
+
+
+# methods with side effects, which are never coalesced
+uncoalesced_methods = {
+    'eth_getFilterChanges',
+    'eth_newBlockFilter',
+    'eth_newFilter',
+    'eth_newPendingTransactionFilter',
+    'eth_sendRawTransaction',
+    'eth_sendTransaction',
+    'eth_sign',
+    'eth_submitHashrate',
+    'eth_submitWork',
+    'eth_uninstallFilter',
+}
+
+_coalescing_state = {
+    'enabled': True,
+}
+
+# key -> (task computing result, number of waiting callers)
+_in_flight: dict[typing.Hashable, list[typing.Any]] = {}
+
+_coalescing_stats: dict[str, dict[str, int]] = {}
+
+
+def set_coalescing_enabled(enabled: bool) -> None:
+    _coalescing_state['enabled'] = enabled
+
+
+def get_coalescing_enabled() -> bool:
+    return _coalescing_state['enabled']
+
+
+def get_coalescing_stats() -> dict[str, dict[str, int]]:
+    """get hit and miss counts of each namespace"""
+    return {
+        namespace: dict(stats) for namespace, stats in _coalescing_stats.items()
+    }
+
+
+def reset_coalescing_stats() -> None:
+    _coalescing_stats.clear()
+
+
+async def async_coalesce(
+    key: typing.Hashable,
+    create_coroutine: typing.Callable[
+        [], typing.Coroutine[typing.Any, typing.Any, _T]
+    ],
+    *,
+    namespace: str,
+) -> _T:
+    """await coroutine, sharing its result with concurrent identical calls
+
+    the coroutine runs in its own task so that cancelling one caller does not
+    cancel the others. callers receive copies of mutable results, except
+    for the last caller, which receives the original
+    """
+    import asyncio
+
+    stats = _coalescing_stats.setdefault(namespace, {'hits': 0, 'misses': 0})
+    full_key = (namespace, key)
+    entry = _in_flight.get(full_key)
+    if entry is None or entry[0].get_loop() is not asyncio.get_running_loop():
+        stats['misses'] += 1
+        task = asyncio.ensure_future(create_coroutine())
+        entry = [task, 0]
+        _in_flight[full_key] = entry
+        task.add_done_callback(lambda task: _remove_in_flight(full_key, task))
+    else:
+        stats['hits'] += 1
+        task = entry[0]
+
+    entry[1] += 1
+    try:
+        result = await asyncio.shield(task)
+    finally:
+        entry[1] -= 1
+    if entry[1] > 0 and isinstance(result, (dict, list)):
+        import copy
+
+        result = copy.deepcopy(result)
+    return result
+
+
+def _remove_in_flight(
+    full_key: typing.Hashable, task: asyncio.Future[typing.Any]
+) -> None:
+    entry = _in_flight.get(full_key)
+    if entry is not None and entry[0] is task:
+        del _in_flight[full_key]
+
+    # retrieve exception so it is not reported if every caller was cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+def get_request_coalescing_key(
+    request: typing.Mapping[str, typing.Any],
+    provider_key: typing.Hashable,
+) -> typing.Hashable | None:
+    """get key of singular request, or None if it should not be coalesced"""
+    import json
+
+    if request['method'] in uncoalesced_methods:
+        return None
+    try:
+        params = json.dumps(request['params'], sort_keys=True)
+    except TypeError:
+        return None
+    return (provider_key, request['method'], params)
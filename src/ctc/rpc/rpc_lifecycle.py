@@ -66,5 +66,19 @@ async def async_execute(
     *,
     digest_kwargs: typing.Optional[dict[typing.Any, typing.Any]] = None,
 ) -> spec.RpcResponse:
+    if isinstance(request, list):
+
+        # digest each subresponse as it arrives
+        def digest_subresult(
+            subresult: typing.Any, subrequest: spec.RpcSingularRequest
+        ) -> typing.Any:
+            return digest(subresult, subrequest, digest_kwargs=digest_kwargs)
+
+        return await rpc_request.async_send(
+            request=request,
+            provider=provider,
+            digest_subresult=digest_subresult,
+        )
+
     response = await rpc_request.async_send(request=request, provider=provider)
     return digest(response, request=request, digest_kwargs=digest_kwargs)
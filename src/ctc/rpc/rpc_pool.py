@@ -0,0 +1,191 @@
+"""load balancing and failover across the members of a provider pool
+
+provider pools are configured under the `provider_pools` config key and are
+referenced by name like any other provider. each request or batch chunk sent
+to a pool goes to one member, picked as the better of two random healthy
+members according to their measured latency and error rate. a member that
+fails repeatedly is ejected for a while, and a failed request is retried on
+another member
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import typing
+
+import ctc.config
+from ctc import spec
+
+
+# weight of newest observation in moving averages of latency and error rate
+health_smoothing = 0.2
+
+# a member failing this many times in a row is ejected
+max_consecutive_failures = 3
+
+# ejection time doubles after each ejection, up to the max
+min_ejection_seconds = 15.0
+max_ejection_seconds = 300.0
+
+# transport attempts of a request to a member before failing over, fewer than
+# those of a standalone provider so that an unhealthy member is left quickly
+member_n_attempts = 2
+
+_pools: dict[str, ProviderPool] = {}
+
+
+class PoolMember:
+    """health state of a provider pool member"""
+
+    def __init__(self, provider: spec.Provider) -> None:
+        self.provider = provider
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.n_ejections = 0
+        self.ejected_until = 0.0
+        self.n_requests = 0
+        self.n_failures = 0
+
+    def get_cost(self) -> float:
+        """estimated cost of sending a request to member, lower is better"""
+        return (self.latency + 0.001) * (1 + 10 * self.error_rate)
+
+    def is_ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def record_success(self, latency: float) -> None:
+        self.n_requests += 1
+        if self.n_requests == 1:
+            self.latency = latency
+        else:
+            self.latency += health_smoothing * (latency - self.latency)
+        self.error_rate -= health_smoothing * self.error_rate
+        self.consecutive_failures = 0
+        self.n_ejections = 0
+
+    def record_failure(self) -> None:
+        self.n_requests += 1
+        self.n_failures += 1
+        self.error_rate += health_smoothing * (1 - self.error_rate)
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= max_consecutive_failures:
+            ejection_seconds = min(
+                max_ejection_seconds,
+                min_ejection_seconds * 2**self.n_ejections,
+            )
+            self.ejected_until = time.monotonic() + ejection_seconds
+            self.n_ejections += 1
+            self.consecutive_failures = 0
+
+
+class ProviderPool:
+    """balance requests across the member providers of a pool"""
+
+    def __init__(self, name: str, members: list[spec.Provider]) -> None:
+        self.name = name
+        self.members = [PoolMember(member) for member in members]
+
+    def select_member(
+        self, exclude: typing.Container[PoolMember] = ()
+    ) -> PoolMember | None:
+        """pick member for next request, None if all members are excluded"""
+
+        candidates = [
+            member for member in self.members if member not in exclude
+        ]
+        if len(candidates) == 0:
+            return None
+
+        # if every candidate is ejected, use the one readmitted soonest
+        now = time.monotonic()
+        healthy = [
+            member for member in candidates if not member.is_ejected(now)
+        ]
+        if len(healthy) == 0:
+            return min(candidates, key=lambda member: member.ejected_until)
+
+        # pick the better of two random members
+        if len(healthy) == 1:
+            return healthy[0]
+        first, second = random.sample(healthy, 2)
+        if first.get_cost() <= second.get_cost():
+            return first
+        else:
+            return second
+
+    async def async_send_raw(
+        self,
+        request: spec.RpcRequest,
+        provider: spec.Provider,
+        *,
+        handle_subresponse: typing.Callable[[typing.Any], None] | None = None,
+    ) -> spec.RpcResponseRaw | None:
+        """send request to a member, failing over to other members"""
+        from . import rpc_request
+
+        tried: list[PoolMember] = []
+        error: Exception | None = None
+        while True:
+            member = self.select_member(exclude=tried)
+            if member is None:
+                raise Exception(
+                    'all providers of provider pool '
+                    + self.name
+                    + ' failed: '
+                    + str(error)
+                )
+            tried.append(member)
+            member_provider = get_member_provider(member.provider, provider)
+            start_time = time.monotonic()
+            try:
+                response = await rpc_request.async_send_raw(
+                    request=request,
+                    provider=member_provider,
+                    handle_subresponse=handle_subresponse,
+                    n_attempts=member_n_attempts,
+                )
+            except spec.RpcException:
+                # errors reported by the node are not failures of the member
+                member.record_success(time.monotonic() - start_time)
+                raise
+            except Exception as e:
+                member.record_failure()
+                error = e
+                continue
+            member.record_success(time.monotonic() - start_time)
+            return response
+
+
+def get_member_provider(
+    member: spec.Provider, pool_provider: spec.Provider
+) -> spec.Provider:
+    """apply request settings of pool provider to member provider"""
+    import copy
+
+    member = copy.copy(member)
+    member['chunk_size'] = pool_provider['chunk_size']
+    member['convert_reverts_to_none'] = pool_provider['convert_reverts_to_none']
+    return member
+
+
+def get_provider_pool(provider: spec.Provider) -> ProviderPool | None:
+    """get provider pool of provider, None if it is not a pool provider
+
+    pool providers are recognized by their pool:// url, so that requests to
+    other providers do not consult the config
+    """
+
+    url = provider.get('url')
+    if not isinstance(url, str) or not url.startswith('pool://'):
+        return None
+    name = url[len('pool://') :]
+    pool = _pools.get(name)
+    if pool is None:
+        if name not in ctc.config.get_provider_pools():
+            return None
+        members = ctc.config.get_provider_pool_members(name)
+        pool = ProviderPool(name=name, members=members)
+        _pools[name] = pool
+    return pool
@@ -1 +1,7 @@
 from .rpc_http_async import async_close_http_session
+from .rpc_http_async import get_http_metrics
+from .rpc_http_async import set_http_rate_limit
+from .rpc_websocket_async import async_close_websocket_connections
+from .rpc_ipc_async import async_close_ipc_connections
+from .rpc_json_codec import get_json_codec
+from .rpc_json_codec import set_json_codec
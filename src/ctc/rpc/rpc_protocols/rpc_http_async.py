@@ -1,60 +1,293 @@
 from __future__ import annotations
 
+import time
 import typing
-import warnings
 
 if typing.TYPE_CHECKING:
     import aiohttp
+    from typing_extensions import Literal
+    from typing_extensions import TypedDict
+
+    HttpOutcome = Literal[
+        'success',
+        'timeout',
+        'connection_error',
+        'rate_limited',
+        'server_error',
+        'client_error',
+    ]
+
+    class RetryPolicy(TypedDict):
+        n_attempts: int
+        base_delay: float
+        max_delay: float
+
 
 from ctc import spec
 from .. import rpc_provider
+from . import rpc_json_codec
+from . import rpc_json_stream
 
 
 _http_sessions: dict[spec.ProviderKey, aiohttp.ClientSession] = {}
+_token_buckets: dict[spec.ProviderKey, TokenBucket] = {}
+_http_metrics: dict[spec.ProviderKey, dict[str, int]] = {}
+
+retry_policies: typing.Mapping[str, RetryPolicy] = {
+    'timeout': {'n_attempts': 3, 'base_delay': 1.0, 'max_delay': 8.0},
+    'connection_error': {'n_attempts': 5, 'base_delay': 0.5, 'max_delay': 8.0},
+    'rate_limited': {'n_attempts': 8, 'base_delay': 1.0, 'max_delay': 30.0},
+    'server_error': {'n_attempts': 5, 'base_delay': 0.5, 'max_delay': 16.0},
+}
+
+retryable_server_statuses = {500, 502, 503, 504}
+
+
+#
+# # sending
+#
 
 
 async def async_send_http(
     request: spec.RpcRequest,
     provider: spec.ProviderReference,
     *,
-    n_attempts: int = 8,
+    n_attempts: int | None = None,
+    handle_subresponse: typing.Callable[[typing.Any], None] | None = None,
 ) -> spec.RpcResponse:
+    """send request over http, retrying according to retry_policies
+
+    attempts are capped per outcome by its retry policy, and in total by
+    the largest n_attempts of any policy. n_attempts, if given, caps both
+
+    if handle_subresponse is given, the response is decoded incrementally
+    and each element of the response is passed to handle_subresponse instead
+    of being returned
+    """
+    import asyncio
+    import aiohttp
+
     provider = rpc_provider.get_provider(provider)
     session = get_async_http_session(provider=provider)
+    key = rpc_provider.get_provider_key(provider)
+    bucket = get_token_bucket(provider)
+    metrics = _http_metrics.setdefault(key, {})
 
-    headers = {'User-Agent': 'ctc'}
-    for attempt in range(n_attempts):
-
-        async with session.post(
-            provider['url'], json=request, headers=headers
-        ) as response:
-            if response.status != 200:
-                import random
-
-                t_sleep = 2 ** attempt + random.random()
-                warnings.warn(
-                    'request failed with code '
-                    + str(response.status)
-                    + ' retrying in '
-                    + str(t_sleep)
-                    + 's'
-                )
-                import asyncio
-
-                await asyncio.sleep(t_sleep)
-                continue
-            return await response.json()
-
+    codec = rpc_json_codec.get_json_codec()
+    data = codec.encode(request)
+    headers = {'User-Agent': 'ctc', 'Content-Type': 'application/json'}
+    attempts: dict[str, int] = {}
+    if n_attempts is not None:
+        max_total_attempts = n_attempts
     else:
-        message = (
-            'http rpc request failed after '
-            + str(n_attempts)
-            + ' retries, status_code = '
-            + str(response.status)
+        max_total_attempts = max(
+            policy['n_attempts'] for policy in retry_policies.values()
         )
-        # logger = logging.getLogger()
-        # logger.info(message)
-        raise Exception(message)
+    while True:
+
+        await bucket.async_take()
+
+        outcome: HttpOutcome
+        retry_after = None
+        try:
+            async with session.post(
+                provider['url'], data=data, headers=headers
+            ) as response:
+                status = response.status
+                if status == 200:
+                    if handle_subresponse is not None:
+                        async for subresponse in (
+                            rpc_json_stream.iterate_json_array(response.content)
+                        ):
+                            handle_subresponse(subresponse)
+                        result = None
+                    else:
+                        result = codec.decode(await response.read())
+                    _count(metrics, 'success')
+                    return result
+                elif status == 429:
+                    outcome = 'rate_limited'
+                    retry_after = parse_retry_after(
+                        response.headers.get('Retry-After')
+                    )
+                elif status in retryable_server_statuses:
+                    outcome = 'server_error'
+                    retry_after = parse_retry_after(
+                        response.headers.get('Retry-After')
+                    )
+                else:
+                    # some nodes report json rpc errors with non-200 statuses
+                    _count(metrics, 'client_error')
+                    try:
+                        result = codec.decode(await response.read())
+                    except ValueError:
+                        result = None
+                    if isinstance(result, (dict, list)):
+                        return result
+                    raise Exception(
+                        'http rpc request failed, status_code = ' + str(status)
+                    )
+        except asyncio.TimeoutError:
+            outcome = 'timeout'
+            status = None
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError):
+            # includes responses whose body was truncated
+            outcome = 'connection_error'
+            status = None
+
+        # decide whether to retry
+        _count(metrics, outcome)
+        policy = retry_policies[outcome]
+        max_attempts = policy['n_attempts']
+        if n_attempts is not None:
+            max_attempts = min(max_attempts, n_attempts)
+        attempt = attempts.get(outcome, 0)
+        attempts[outcome] = attempt + 1
+        total_attempts = sum(attempts.values())
+        if attempt + 1 >= max_attempts or total_attempts >= max_total_attempts:
+            _count(metrics, 'failure')
+            message = (
+                'http rpc request failed after '
+                + str(total_attempts)
+                + ' attempts, '
+                + outcome.replace('_', ' ')
+            )
+            if status is not None:
+                message += ', status_code = ' + str(status)
+            raise Exception(message)
+
+        # wait before retrying
+        _count(metrics, 'retry')
+        t_sleep = get_backoff_delay(attempt, policy=policy)
+        if retry_after is not None:
+            t_sleep = max(t_sleep, min(retry_after, policy['max_delay']))
+        if outcome == 'rate_limited':
+            # pause every request to the provider, not just this one
+            bucket.pause(t_sleep)
+        else:
+            await asyncio.sleep(t_sleep)
+
+
+def get_backoff_delay(attempt: int, *, policy: RetryPolicy) -> float:
+    """get capped exponential backoff delay with jitter"""
+    import random
+
+    delay = min(policy['max_delay'], policy['base_delay'] * 2.0**attempt)
+    return float(delay / 2 + random.random() * delay / 2)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """parse Retry-After header into seconds, as delay or http date"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    import email.utils
+
+    try:
+        retry_time = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_time is None:
+        return None
+    return max(0.0, float(retry_time.timestamp() - time.time()))
+
+
+#
+# # rate limiting
+#
+
+
+class TokenBucket:
+    """token bucket limiting requests to a provider
+
+    a rate of None does not limit requests, but requests still wait while
+    the bucket is paused after the provider signals rate limiting
+    """
+
+    def __init__(self, rate: float | None = None, capacity: float = 1) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    async def async_take(self) -> None:
+        """wait for a token"""
+        import asyncio
+
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            if self.rate is None:
+                return
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """stop handing out tokens for given number of seconds"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def get_token_bucket(provider: spec.Provider) -> TokenBucket:
+    key = rpc_provider.get_provider_key(provider)
+    bucket = _token_buckets.get(key)
+    if bucket is None:
+        bucket = TokenBucket()
+        _token_buckets[key] = bucket
+    return bucket
+
+
+def set_http_rate_limit(
+    provider: spec.ProviderReference = None,
+    *,
+    requests_per_second: float | None,
+    burst: float | None = None,
+) -> None:
+    """set token bucket rate of provider, None means unlimited"""
+    full_provider = rpc_provider.get_provider(provider)
+    key = rpc_provider.get_provider_key(full_provider)
+    if burst is None:
+        burst = max(1.0, requests_per_second or 1.0)
+    _token_buckets[key] = TokenBucket(rate=requests_per_second, capacity=burst)
+
+
+#
+# # metrics
+#
+
+
+def _count(metrics: dict[str, int], name: str) -> None:
+    metrics[name] = metrics.get(name, 0) + 1
+
+
+def get_http_metrics(
+    provider: spec.ProviderReference = None,
+) -> dict[str, int]:
+    """get counts of http request outcomes of provider"""
+    full_provider = rpc_provider.get_provider(provider)
+    key = rpc_provider.get_provider_key(full_provider)
+    return dict(_http_metrics.get(key, {}))
+
+
+def reset_http_metrics() -> None:
+    _http_metrics.clear()
+
+
+#
+# # sessions
+#
 
 
 def get_async_http_session(
@@ -82,10 +315,13 @@ async def async_close_http_session(
         return
 
     if provider is None and len(_http_sessions) == 1:
-        session = list(_http_sessions.values())[0]
+        key = list(_http_sessions.keys())[0]
     else:
         provider = rpc_provider.get_provider(provider)
-        session = get_async_http_session(provider=provider)
+        key = rpc_provider.get_provider_key(provider)
+    session = _http_sessions.pop(key, None)
+    if session is None:
+        return
 
     import asyncio
 
@@ -0,0 +1,212 @@
+"""unix domain socket (ipc) transport for nodes running on the same machine
+
+each provider key has a small pool of persistent socket connections. each
+connection pipelines any number of requests, see rpc_multiplexing, and
+requests go to the connection with the fewest requests in flight
+
+the provider url is the path of the socket, optionally prefixed by ipc://
+"""
+
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    import asyncio
+
+from ctc import spec
+from .. import rpc_provider
+from . import rpc_json_codec
+from . import rpc_multiplexing
+
+
+max_ipc_connections = 4
+ipc_read_size = 2**16
+
+_ipc_pools: dict[spec.ProviderKey, IpcConnectionPool] = {}
+
+
+async def async_send_ipc(
+    request: spec.RpcRequest,
+    provider: spec.Provider,
+    *,
+    n_attempts: int | None = None,
+) -> spec.RpcResponse:
+    """send request over ipc, reconnecting if the connection drops"""
+    pool = get_ipc_connection_pool(provider)
+    return await rpc_multiplexing.async_send_with_reconnects(
+        pool.get_connection,
+        request,
+        n_attempts=n_attempts,
+    )
+
+
+def get_ipc_path(provider: spec.Provider) -> str:
+    url = provider['url']
+    if url.startswith('ipc://'):
+        return url[len('ipc://') :]
+    else:
+        return url
+
+
+class JsonStreamSplitter:
+    """split stream of concatenated json objects and arrays into messages
+
+    each byte is scanned once, tracking the bracket depth and whether it is
+    inside of a string, so the cost of a message is linear in its size no
+    matter how many reads it arrives in. structural characters are ascii, so
+    bytes are scanned without decoding utf-8
+    """
+
+    def __init__(self) -> None:
+        import re
+
+        self.buffer = bytearray()
+        self.position = 0
+        self.message_start = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape_end = 0
+        self.pattern = re.compile(rb'["\\\[\]{}]')
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """add received bytes, returning the messages they complete"""
+        buffer = self.buffer
+        buffer += chunk
+        messages = []
+        consumed = 0
+        for match in self.pattern.finditer(buffer, self.position):
+            index = match.start()
+            if index < self.escape_end:
+                continue
+            token = buffer[index]
+            if self.in_string:
+                if token == ord('\\'):
+                    self.escape_end = index + 2
+                elif token == ord('"'):
+                    self.in_string = False
+            elif token == ord('"'):
+                self.in_string = True
+            elif token in b'[{':
+                if self.depth == 0:
+                    self.message_start = index
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    messages.append(
+                        bytes(buffer[self.message_start : index + 1])
+                    )
+                    consumed = index + 1
+
+        # drop completed messages from buffer
+        del buffer[:consumed]
+        self.position = len(buffer)
+        self.message_start = max(0, self.message_start - consumed)
+        self.escape_end = max(0, self.escape_end - consumed)
+        return messages
+
+
+class IpcConnection(rpc_multiplexing.MultiplexedConnection):
+    """persistent unix socket connection that pipelines requests"""
+
+    def _is_channel_open(
+        self, channel: tuple[asyncio.StreamReader, asyncio.StreamWriter]
+    ) -> bool:
+        reader, writer = channel
+        return not writer.is_closing()
+
+    async def _async_open_channel(
+        self,
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        import asyncio
+
+        return await asyncio.open_unix_connection(get_ipc_path(self.provider))
+
+    async def _async_write(
+        self,
+        channel: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        data: bytes,
+    ) -> None:
+        reader, writer = channel
+        writer.write(data + b'\n')
+        await writer.drain()
+
+    async def _async_iterate_messages(
+        self, channel: tuple[asyncio.StreamReader, asyncio.StreamWriter]
+    ) -> typing.AsyncIterator[typing.Any]:
+        """decode stream of concatenated json values"""
+
+        reader, writer = channel
+        codec = rpc_json_codec.get_json_codec()
+        splitter = JsonStreamSplitter()
+        while True:
+            chunk = await reader.read(ipc_read_size)
+            if chunk == b'':
+                return
+            for message in splitter.feed(chunk):
+                yield codec.decode(message)
+
+    async def _async_close_channel(
+        self, channel: tuple[asyncio.StreamReader, asyncio.StreamWriter]
+    ) -> None:
+        reader, writer = channel
+        writer.close()
+        await writer.wait_closed()
+
+
+class IpcConnectionPool:
+    """pool of ipc connections to a provider"""
+
+    def __init__(
+        self,
+        provider: spec.Provider,
+        max_connections: int = max_ipc_connections,
+    ) -> None:
+        import asyncio
+
+        self.provider = provider
+        self.max_connections = max_connections
+        self.loop = asyncio.get_running_loop()
+        self.connections: list[IpcConnection] = []
+
+    def get_connection(self) -> IpcConnection:
+        """get connection with the fewest requests in flight"""
+        if len(self.connections) > 0:
+            connection = min(
+                self.connections,
+                key=lambda connection: len(connection.pending),
+            )
+            if (
+                len(connection.pending) == 0
+                or len(self.connections) >= self.max_connections
+            ):
+                return connection
+        connection = IpcConnection(self.provider)
+        self.connections.append(connection)
+        return connection
+
+    async def async_close(self) -> None:
+        for connection in self.connections:
+            await connection.async_close()
+        self.connections = []
+
+
+def get_ipc_connection_pool(provider: spec.Provider) -> IpcConnectionPool:
+    """get connection pool of provider in the running event loop"""
+    import asyncio
+
+    key = rpc_provider.get_provider_key(provider)
+    pool = _ipc_pools.get(key)
+    if pool is None or pool.loop is not asyncio.get_running_loop():
+        pool = IpcConnectionPool(provider)
+        _ipc_pools[key] = pool
+    return pool
+
+
+async def async_close_ipc_connections() -> None:
+    """close all ipc connections"""
+    pools = list(_ipc_pools.values())
+    _ipc_pools.clear()
+    for pool in pools:
+        await pool.async_close()
@@ -0,0 +1,124 @@
+"""json codecs used to encode requests and decode responses
+
+codecs encode to bytes and decode from bytes or str. by default the fastest
+installed codec is used, in order of preference orjson, ujson, stdlib
+
+orjson and ujson only encode integers of up to 64 bits, so requests that
+they cannot encode fall back to the stdlib codec. rpc responses encode
+integers as hex strings, so decoding needs no fallback
+"""
+
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    JsonCodecName = Literal['orjson', 'ujson', 'stdlib']
+
+
+json_codec_names: tuple[JsonCodecName, ...] = ('orjson', 'ujson', 'stdlib')
+
+_json_codec: JsonCodec | None = None
+
+
+class JsonCodec:
+    """json codec that encodes to bytes and decodes from bytes or str"""
+
+    def __init__(
+        self,
+        name: JsonCodecName,
+        dumps: typing.Callable[[typing.Any], bytes | str],
+        loads: typing.Callable[[bytes | str], typing.Any],
+        errors: tuple[type[Exception], ...] = (),
+    ) -> None:
+        self.name = name
+        self._dumps = dumps
+        self._loads = loads
+        self._errors = errors
+
+    def encode(self, data: typing.Any) -> bytes:
+        try:
+            encoded = self._dumps(data)
+        except self._errors:
+            encoded = _stdlib_dumps(data)
+        if isinstance(encoded, str):
+            encoded = encoded.encode()
+        return encoded
+
+    def decode(self, data: bytes | str) -> typing.Any:
+        return self._loads(data)
+
+
+def _stdlib_dumps(data: typing.Any) -> bytes:
+    import json
+
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def _stdlib_loads(data: bytes | str) -> typing.Any:
+    import json
+
+    return json.loads(data)
+
+
+def create_json_codec(name: JsonCodecName) -> JsonCodec:
+    """create json codec, raising ImportError if it is not installed"""
+
+    if name == 'orjson':
+        import orjson
+
+        return JsonCodec(
+            name='orjson',
+            dumps=orjson.dumps,
+            loads=orjson.loads,
+            errors=(TypeError,),
+        )
+    elif name == 'ujson':
+        import ujson  # type: ignore
+
+        return JsonCodec(
+            name='ujson',
+            dumps=ujson.dumps,
+            loads=ujson.loads,
+            errors=(OverflowError,),
+        )
+    elif name == 'stdlib':
+        return JsonCodec(
+            name='stdlib', dumps=_stdlib_dumps, loads=_stdlib_loads
+        )
+    else:
+        raise Exception('unknown json codec: ' + str(name))
+
+
+def get_available_json_codecs() -> list[JsonCodecName]:
+    """get names of installed codecs, in order of preference"""
+    available = []
+    for name in json_codec_names:
+        try:
+            create_json_codec(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def get_json_codec() -> JsonCodec:
+    """get codec used by rpc transports"""
+    global _json_codec
+
+    if _json_codec is None:
+        _json_codec = create_json_codec(get_available_json_codecs()[0])
+    return _json_codec
+
+
+def set_json_codec(name: JsonCodecName | None) -> None:
+    """set codec used by rpc transports, None uses fastest installed codec"""
+    global _json_codec
+
+    if name is None:
+        _json_codec = None
+    else:
+        _json_codec = create_json_codec(name)
+
@@ -0,0 +1,145 @@
+"""incremental decoding of json arrays from byte streams
+
+used to process the elements of batch responses as they arrive, so that
+peak memory is bounded by one element rather than by the whole batch
+
+uses ijson if it is installed, and otherwise decodes each element with the
+standard library's json scanner
+"""
+
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from typing_extensions import Protocol
+
+    class _AsyncReadable(Protocol):
+        async def read(self, n: int = -1) -> bytes:
+            ...
+
+
+stream_read_size = 2**16
+
+
+def iterate_json_array(
+    stream: _AsyncReadable,
+) -> typing.AsyncIterator[typing.Any]:
+    """iterate over the elements of a json array read from stream
+
+    if the stream holds a json object instead of an array, the object is
+    yielded as the only element
+    """
+    try:
+        import ijson  # type: ignore
+    except ImportError:
+        return _iterate_json_array_stdlib(stream)
+    else:
+        return _iterate_json_array_ijson(stream, ijson)
+
+
+async def _iterate_json_array_ijson(
+    stream: _AsyncReadable, ijson: typing.Any
+) -> typing.AsyncIterator[typing.Any]:
+
+    # peek at first character to distinguish arrays from objects
+    first = b''
+    while first.strip() == b'':
+        chunk = await stream.read(1)
+        if chunk == b'':
+            raise ValueError('empty json stream')
+        first += chunk
+
+    class _PrefixedStream:
+        def __init__(self) -> None:
+            self.prefix = first
+
+        async def read(self, n: int = -1) -> bytes:
+            if self.prefix != b'':
+                prefix = self.prefix
+                self.prefix = b''
+                return prefix
+            return await stream.read(n)
+
+    prefix = 'item' if first.strip() == b'[' else ''
+    async for item in ijson.items_async(
+        _PrefixedStream(), prefix, use_float=True
+    ):
+        yield item
+
+
+async def _iterate_json_array_stdlib(
+    stream: _AsyncReadable,
+) -> typing.AsyncIterator[typing.Any]:
+    import codecs
+    import json
+
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    eof = False
+
+    # after a failed decode, wait until the buffer doubles before retrying,
+    # so that decoding a large element takes linear rather than quadratic time
+    min_retry_length = 0
+
+    expecting = 'start'
+    while True:
+
+        # skip whitespace, reading more data when buffer is exhausted
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position == len(buffer) or len(buffer) < min_retry_length:
+            if eof:
+                if expecting == 'end':
+                    return
+                raise ValueError('incomplete json array')
+            chunk = await stream.read(stream_read_size)
+            buffer = buffer[position:]
+            min_retry_length -= position
+            position = 0
+            if chunk == b'':
+                eof = True
+                min_retry_length = 0
+            else:
+                buffer += text_decoder.decode(chunk)
+            continue
+
+        character = buffer[position]
+        if expecting == 'start':
+            if character == '[':
+                position += 1
+                expecting = 'first_value'
+            else:
+                expecting = 'object'
+        elif expecting == 'first_value' and character == ']':
+            position += 1
+            expecting = 'end'
+        elif expecting in ('first_value', 'value', 'object'):
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if eof:
+                    raise
+                min_retry_length = position + 2 * (len(buffer) - position)
+                continue
+            min_retry_length = 0
+            position = end
+            yield value
+            if expecting == 'object':
+                expecting = 'end'
+            else:
+                expecting = 'separator'
+        elif expecting == 'separator':
+            if character == ',':
+                expecting = 'value'
+            elif character == ']':
+                expecting = 'end'
+            else:
+                raise ValueError('invalid json array separator')
+            position += 1
+        elif expecting == 'end':
+            raise ValueError('extra data after json value')
+        else:
+            raise Exception('invalid state')
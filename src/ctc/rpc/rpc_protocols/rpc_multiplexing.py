@@ -0,0 +1,246 @@
+"""multiplexing of concurrent requests over a persistent connection
+
+requests are sent with connection-unique ids and responses are routed back
+to their callers by id, so any number of requests can be in flight over the
+same connection. subclasses implement opening, writing to, and reading from
+the underlying channel
+"""
+
+from __future__ import annotations
+
+import abc
+import typing
+
+if typing.TYPE_CHECKING:
+    import asyncio
+
+from ctc import spec
+from . import rpc_json_codec
+
+
+# attempts of a request across reconnections, unless given by the caller
+default_n_attempts = 3
+
+
+class RpcRetryableError(Exception):
+    """request failed in a way that should be retried"""
+
+
+class RpcConnectionLost(RpcRetryableError):
+    """connection dropped before the response of a request arrived"""
+
+
+class RpcUnattributedError(RpcRetryableError):
+    """error response that could not be matched to its request"""
+
+
+class MultiplexedConnection(abc.ABC):
+    """persistent connection that multiplexes requests by id"""
+
+    # errors that indicate that the channel is unusable
+    connection_errors: tuple[typing.Type[BaseException], ...] = (
+        ConnectionError,
+        OSError,
+    )
+
+    def __init__(self, provider: spec.Provider) -> None:
+        import asyncio
+
+        self.provider = provider
+        self.loop = asyncio.get_running_loop()
+        self.lock = asyncio.Lock()
+        self.channel: typing.Any = None
+        self.reader: asyncio.Future[None] | None = None
+        self.next_id = 0
+
+        # wire id -> (response future, original request id, channel)
+        self.pending: dict[
+            int, tuple[asyncio.Future[typing.Any], typing.Any, typing.Any]
+        ] = {}
+
+    #
+    # # channel interface
+    #
+
+    @abc.abstractmethod
+    def _is_channel_open(self, channel: typing.Any) -> bool:
+        ...
+
+    @abc.abstractmethod
+    async def _async_open_channel(self) -> typing.Any:
+        ...
+
+    @abc.abstractmethod
+    async def _async_write(self, channel: typing.Any, data: bytes) -> None:
+        ...
+
+    @abc.abstractmethod
+    def _async_iterate_messages(
+        self, channel: typing.Any
+    ) -> typing.AsyncIterator[typing.Any]:
+        """iterate over decoded json messages received over channel"""
+        ...
+
+    @abc.abstractmethod
+    async def _async_close_channel(self, channel: typing.Any) -> None:
+        ...
+
+    #
+    # # connection
+    #
+
+    def is_connected(self) -> bool:
+        return self.channel is not None and self._is_channel_open(self.channel)
+
+    async def async_connect(self) -> None:
+        """connect if not already connected"""
+        import asyncio
+
+        async with self.lock:
+            if self.is_connected():
+                return
+            self.channel = await self._async_open_channel()
+            self.reader = asyncio.ensure_future(self._async_read(self.channel))
+
+    async def async_close(self) -> None:
+        if self.channel is not None:
+            await self._async_close_channel(self.channel)
+        if self.reader is not None:
+            await self.reader
+
+    #
+    # # requests
+    #
+
+    async def async_send(self, request: spec.RpcRequest) -> spec.RpcResponse:
+        """send singular or batch request and wait for its response"""
+        import asyncio
+
+        try:
+            await self.async_connect()
+        except self.connection_errors as e:
+            raise RpcConnectionLost(str(e))
+        channel = self.channel
+        if channel is None:
+            raise RpcConnectionLost('not connected')
+
+        # replace ids with connection-unique ids
+        futures: list[asyncio.Future[typing.Any]] = []
+        if isinstance(request, dict):
+            payload: typing.Any = self._register(request, futures, channel)
+            wire_ids = [payload['id']]
+        else:
+            payload = [
+                self._register(subrequest, futures, channel)
+                for subrequest in request
+            ]
+            wire_ids = [subpayload['id'] for subpayload in payload]
+
+        try:
+            await self._async_write(
+                channel, rpc_json_codec.get_json_codec().encode(payload)
+            )
+            responses = await asyncio.gather(*futures)
+        except BaseException as e:
+            for wire_id in wire_ids:
+                self.pending.pop(wire_id, None)
+            if isinstance(e, self.connection_errors):
+                raise RpcConnectionLost(str(e))
+            raise
+
+        if isinstance(request, dict):
+            return responses[0]
+        else:
+            return list(responses)
+
+    def _register(
+        self,
+        request: spec.RpcSingularRequest,
+        futures: list[asyncio.Future[typing.Any]],
+        channel: typing.Any,
+    ) -> spec.RpcSingularRequest:
+        self.next_id += 1
+        wire_id = self.next_id
+        future = self.loop.create_future()
+        self.pending[wire_id] = (future, request.get('id'), channel)
+        futures.append(future)
+        return dict(request, id=wire_id)
+
+    async def _async_read(self, channel: typing.Any) -> None:
+        error: Exception
+        try:
+            async for data in self._async_iterate_messages(channel):
+                if isinstance(data, list):
+                    for response in data:
+                        self._resolve(response, channel)
+                else:
+                    self._resolve(data, channel)
+            error = RpcConnectionLost('connection closed')
+        except Exception as e:
+            error = RpcConnectionLost(str(e))
+
+        # fail requests still waiting on this channel so they can retry
+        if self.channel is channel:
+            self.channel = None
+        self._fail_pending(error, channel=channel)
+
+    def _resolve(
+        self,
+        response: typing.Mapping[str, typing.Any],
+        channel: typing.Any,
+    ) -> None:
+        wire_id = response.get('id')
+        if wire_id is None:
+            # an error without id belongs to the only pending request, if
+            # there is one, otherwise every pending request is retried
+            pending_ids = [
+                pending_id
+                for pending_id, (_, _, sent_on) in self.pending.items()
+                if sent_on is channel
+            ]
+            if len(pending_ids) != 1:
+                error = RpcUnattributedError(
+                    'RPC ERROR: ' + str(response.get('error'))
+                )
+                self._fail_pending(error, channel=channel)
+                return
+            wire_id = pending_ids[0]
+        entry = self.pending.pop(wire_id, None)
+        if entry is None:
+            return
+        future, original_id, _ = entry
+        if not future.done():
+            future.set_result(dict(response, id=original_id))
+
+    def _fail_pending(self, error: Exception, *, channel: typing.Any) -> None:
+        for wire_id, (future, _, sent_on) in list(self.pending.items()):
+            if sent_on is channel:
+                del self.pending[wire_id]
+                if not future.done():
+                    future.set_exception(error)
+
+
+async def async_send_with_reconnects(
+    get_connection: typing.Callable[[], MultiplexedConnection],
+    request: spec.RpcRequest,
+    *,
+    n_attempts: int | None = None,
+) -> spec.RpcResponse:
+    """send request, retrying if connections drop or errors are unattributed"""
+    import asyncio
+    import random
+
+    if n_attempts is None:
+        n_attempts = default_n_attempts
+
+    for attempt in range(n_attempts):
+        connection = get_connection()
+        try:
+            return await connection.async_send(request)
+        except RpcRetryableError:
+            if attempt + 1 == n_attempts:
+                raise
+            await asyncio.sleep(
+                min(2**attempt, 8) * (0.5 + random.random() / 2)
+            )
+    raise Exception('request failed')
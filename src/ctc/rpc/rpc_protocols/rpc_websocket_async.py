@@ -1,18 +1,116 @@
+"""websocket transport
+
+each provider key has one long-lived connection shared by all requests,
+see rpc_multiplexing for how concurrent requests are multiplexed. if the
+connection drops, in-flight requests are retried over a new connection
+"""
+
 from __future__ import annotations
 
+import typing
+
+if typing.TYPE_CHECKING:
+    import aiohttp
+
 from ctc import spec
+from .. import rpc_provider
+from . import rpc_json_codec
+from . import rpc_multiplexing
 
-# import websockets
 
-# from .. import rpc_provider
+_websocket_connections: dict[spec.ProviderKey, WebsocketConnection] = {}
 
 
 async def async_send_websocket(
     request: spec.RpcRequest,
     provider: spec.Provider,
+    *,
+    n_attempts: int | None = None,
 ) -> spec.RpcResponse:
-    raise NotImplementedError()
-    # provider = rpc_provider.get_provider(provider)
-    # async with websockets.connect(provider['url']) as websocket:
-    #     await websocket.send(request)
-    #     return await websocket.recv()
+    """send request over websocket, reconnecting if the connection drops"""
+    return await rpc_multiplexing.async_send_with_reconnects(
+        lambda: get_websocket_connection(provider),
+        request,
+        n_attempts=n_attempts,
+    )
+
+
+class WebsocketConnection(rpc_multiplexing.MultiplexedConnection):
+    """persistent websocket connection that multiplexes requests by id"""
+
+    def __init__(self, provider: spec.Provider) -> None:
+        import aiohttp
+
+        super().__init__(provider)
+        self.connection_errors = self.connection_errors + (aiohttp.ClientError,)
+        self.session: aiohttp.ClientSession | None = None
+
+    def _is_channel_open(
+        self, channel: aiohttp.ClientWebSocketResponse
+    ) -> bool:
+        return not channel.closed
+
+    async def _async_open_channel(
+        self,
+    ) -> aiohttp.ClientWebSocketResponse[bool]:
+        import aiohttp
+
+        if self.session is None or self.session.closed:
+            kwargs = self.provider['session_kwargs']
+            if kwargs is None:
+                kwargs = {}
+            self.session = aiohttp.ClientSession(**kwargs)
+        return await self.session.ws_connect(
+            self.provider['url'],
+            headers={'User-Agent': 'ctc'},
+            heartbeat=30,
+            max_msg_size=0,
+        )
+
+    async def _async_write(
+        self, channel: aiohttp.ClientWebSocketResponse, data: bytes
+    ) -> None:
+        await channel.send_str(data.decode())
+
+    async def _async_iterate_messages(
+        self, channel: aiohttp.ClientWebSocketResponse
+    ) -> typing.AsyncIterator[typing.Any]:
+        import aiohttp
+
+        codec = rpc_json_codec.get_json_codec()
+        async for message in channel:
+            if message.type in (
+                aiohttp.WSMsgType.TEXT,
+                aiohttp.WSMsgType.BINARY,
+            ):
+                yield codec.decode(message.data)
+
+    async def _async_close_channel(
+        self, channel: aiohttp.ClientWebSocketResponse
+    ) -> None:
+        await channel.close()
+
+    async def async_close(self) -> None:
+        await super().async_close()
+        if self.session is not None:
+            await self.session.close()
+
+
+def get_websocket_connection(provider: spec.Provider) -> WebsocketConnection:
+    """get connection of provider in the running event loop"""
+    import asyncio
+
+    key = rpc_provider.get_provider_key(provider)
+    connection = _websocket_connections.get(key)
+    if connection is None or connection.loop is not asyncio.get_running_loop():
+        connection = WebsocketConnection(provider)
+        _websocket_connections[key] = connection
+    return connection
+
+
+async def async_close_websocket_connections() -> None:
+    """close all websocket connections"""
+    connections = list(_websocket_connections.values())
+    _websocket_connections.clear()
+    for connection in connections:
+        await connection.async_close()
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
+import itertools
 import math
 import typing
 
 from ctc import config
 from ctc import spec
+from . import rpc_cache
+from . import rpc_coalescing
+from . import rpc_pool
 from . import rpc_provider
+from . import rpc_scheduler
 
 
 _rpc_logger_state = {
     'logger_setup': False,
 }
 
+# request ids increase monotonically within each process, so that ids are
+# unique among all requests in flight
+_request_ids = itertools.count(1)
+
 
 def setup_rpc_logger() -> None:
     import loguru
@@ -84,30 +93,88 @@ def log_rpc_response(
         loguru.logger.info('bulk response\n' + entries)
 
 
-def create(method: str, parameters: list[typing.Any]) -> spec.RpcRequest:
-    import random
-
+def create(
+    method: str, parameters: list[typing.Any]
+) -> spec.RpcSingularRequest:
     return {
         'jsonrpc': '2.0',
         'method': method,
         'params': parameters,
-        'id': random.randint(1, int(1e18)),
+        'id': next(_request_ids),
     }
 
 
+def allocate_request_ids(n: int) -> list[int]:
+    """allocate n unique request ids"""
+    return list(itertools.islice(_request_ids, n))
+
+
+def create_batch(
+    method: str, parameter_lists: typing.Sequence[list[typing.Any]]
+) -> spec.RpcPluralRequest:
+    """create batch request calling method once per parameter list"""
+    ids = allocate_request_ids(len(parameter_lists))
+    return [
+        {
+            'jsonrpc': '2.0',
+            'method': method,
+            'params': parameters,
+            'id': request_id,
+        }
+        for parameters, request_id in zip(parameter_lists, ids)
+    ]
+
+
 async def async_send(
     request: spec.RpcRequest,
     provider: typing.Optional[spec.ProviderReference] = None,
+    *,
+    digest_subresult: typing.Optional[
+        typing.Callable[[typing.Any, spec.RpcSingularRequest], typing.Any]
+    ] = None,
+    coalesce: bool | None = None,
 ) -> spec.RpcResponse:
+    """send request and return its result
+
+    for plural requests, the response is processed one subresponse at a time
+    as it arrives, and each subresult is passed through digest_subresult if
+    it is given
+
+    singular requests identical to a request already in flight share its
+    response, unless coalesce is False, see rpc_coalescing
+    """
     full_provider = rpc_provider.get_provider(provider)
 
+    if coalesce is None:
+        coalesce = rpc_coalescing.get_coalescing_enabled()
+    if coalesce and isinstance(request, dict):
+        key = rpc_coalescing.get_request_coalescing_key(
+            request, rpc_provider.get_provider_key(full_provider)
+        )
+        if key is not None:
+            return await rpc_coalescing.async_coalesce(
+                key,
+                lambda: async_send(request, full_provider, coalesce=False),
+                namespace='rpc',
+            )
+
     try:
         logging_rpc_calls = config.get_log_rpc_calls()
     except Exception:
         logging_rpc_calls = False
 
+    use_cache = rpc_cache.get_rpc_cache() is not None
+
+    output: typing.Any
     if isinstance(request, dict):
 
+        if use_cache:
+            cached = await rpc_cache.async_get_cached_rpc_results(
+                [request], full_provider['network']
+            )
+            if 0 in cached:
+                return cached[0]
+
         if logging_rpc_calls:
             log_rpc_request(request=request, provider=full_provider)
 
@@ -116,17 +183,19 @@ async def async_send(
             if full_provider['convert_reverts_to_none']:
                 output = None
             else:
-                if typing.TYPE_CHECKING:
-                    response = typing.cast(
-                        spec.RpcSingularResponseFailure, response
-                    )
                 raise spec.RpcException(
                     'RPC ERROR: ' + response['error']['message']
                 )
         else:
             if typing.TYPE_CHECKING:
-                response = typing.cast(spec.RpcSingularResponseSuccess, response)
+                response = typing.cast(
+                    spec.RpcSingularResponseSuccess, response
+                )
             output = response['result']
+            if use_cache:
+                await rpc_cache.async_store_rpc_results(
+                    [request], [output], provider=full_provider
+                )
 
         if logging_rpc_calls:
             log_rpc_response(
@@ -137,88 +206,262 @@ async def async_send(
 
     elif isinstance(request, list):
 
+        output = [None] * len(request)
+
+        # use cached subresults, sending only the remaining subrequests
+        if use_cache:
+            cached = await rpc_cache.async_get_cached_rpc_results(
+                request, full_provider['network']
+            )
+            for index, result in cached.items():
+                if digest_subresult is not None:
+                    result = digest_subresult(result, request[index])
+                output[index] = result
+            uncached_indices = [
+                index for index in range(len(request)) if index not in cached
+            ]
+            uncached_request = [request[index] for index in uncached_indices]
+            if len(uncached_request) == 0:
+                return output
+        else:
+            uncached_request = request
+
         # chunk request
-        request_chunks = chunk_request(request=request, provider=full_provider)
+        request_chunks = chunk_request(
+            request=uncached_request, provider=full_provider
+        )
 
         if logging_rpc_calls:
             for request_chunk in request_chunks:
                 log_rpc_request(request=request_chunk, provider=full_provider)
 
+        # place each subresult in output as soon as it arrives
+        if use_cache and digest_subresult is not None:
+            raw_output: list[typing.Any] | None = [None] * len(request)
+        else:
+            raw_output = None
+        received: set[typing.Any] = set()
+        handle_subresponse = _create_subresponse_handler(
+            request=request,
+            output=output,
+            received=received,
+            raw_output=raw_output,
+            convert_reverts_to_none=full_provider['convert_reverts_to_none'],
+            digest_subresult=digest_subresult,
+        )
+
         # send request chunks
         coroutines = []
         for request_chunk in request_chunks:
             coroutine = async_send_raw(
                 request=request_chunk,
                 provider=full_provider,
+                handle_subresponse=handle_subresponse,
             )
             coroutines.append(coroutine)
 
         import asyncio
 
-        response_chunks = await asyncio.gather(*coroutines)
+        await asyncio.gather(*coroutines)
+
+        # a subresponse that never arrived would otherwise be left as None
+        missing_ids = [
+            subrequest['id']
+            for subrequest in uncached_request
+            if subrequest['id'] not in received
+        ]
+        if len(missing_ids) > 0:
+            raise Exception(
+                'no response received for subrequests with ids: '
+                + str(missing_ids)
+            )
+
+        if use_cache:
+            stored_output = output if raw_output is None else raw_output
+            await rpc_cache.async_store_rpc_results(
+                uncached_request,
+                [stored_output[index] for index in uncached_indices],
+                provider=full_provider,
+            )
 
         if logging_rpc_calls:
-            for request_chunk, response_chunk in zip(request_chunks, response_chunks):
+            for request_chunk in request_chunks:
                 log_rpc_response(
-                    response=response_chunk,
+                    response=None,
                     request=request_chunk,
                     provider=provider,
                 )
 
-        # reorder chunks
-        plural_response = reorder_response_chunks(response_chunks, request)
-
-        if full_provider['convert_reverts_to_none']:
-            output = []
-            for subresponse in plural_response:
-                if 'result' in subresponse:
-                    output.append(subresponse['result'])
-                elif 'error' in subresponse:
-                    output.append(None)
-                else:
-                    raise Exception('could not process response')
-        else:
-            output = [subresponse['result'] for subresponse in plural_response]
-
     else:
         raise Exception('unknown request type: ' + str(type(request)))
 
     return output
 
 
+def _create_subresponse_handler(
+    *,
+    request: spec.RpcPluralRequest,
+    output: list[typing.Any],
+    received: set[typing.Any],
+    raw_output: list[typing.Any] | None = None,
+    convert_reverts_to_none: bool,
+    digest_subresult: typing.Optional[
+        typing.Callable[[typing.Any, spec.RpcSingularRequest], typing.Any]
+    ],
+) -> typing.Callable[[typing.Any], None]:
+    """create function that stores each subresponse in output
+
+    the id of each subresponse is added to received. if raw_output is given,
+    undigested subresults are also stored in it
+    """
+
+    # a request may appear multiple times in a plural request
+    positions: dict[typing.Any, list[int]] = {}
+    for index, subrequest in enumerate(request):
+        positions.setdefault(subrequest['id'], []).append(index)
+
+    def handle_subresponse(subresponse: typing.Any) -> None:
+        if 'result' in subresponse:
+            indices = positions.get(subresponse.get('id'))
+            if indices is None:
+                raise Exception('could not process response')
+            received.add(subresponse['id'])
+            result = subresponse['result']
+            for index in indices:
+                if raw_output is not None:
+                    raw_output[index] = result
+                if digest_subresult is not None:
+                    output[index] = digest_subresult(result, request[index])
+                else:
+                    output[index] = result
+        elif 'error' in subresponse:
+            if not convert_reverts_to_none or subresponse.get('id') is None:
+                raise spec.RpcException(
+                    'RPC ERROR: ' + str(subresponse['error'].get('message'))
+                )
+            received.add(subresponse['id'])
+        else:
+            raise Exception('could not process response')
+
+    return handle_subresponse
+
+
 @typing.overload
 async def async_send_raw(
-    request: spec.RpcSingularRequest, provider: spec.Provider
+    request: spec.RpcSingularRequest,
+    provider: spec.Provider,
+    *,
+    handle_subresponse: None = None,
+    n_attempts: int | None = None,
 ) -> spec.RpcSingularResponseRaw:
     ...
 
 
 @typing.overload
 async def async_send_raw(
-    request: spec.RpcPluralRequest, provider: spec.Provider
+    request: spec.RpcPluralRequest,
+    provider: spec.Provider,
+    *,
+    handle_subresponse: None = None,
+    n_attempts: int | None = None,
 ) -> spec.RpcPluralResponseRaw:
     ...
 
 
+@typing.overload
+async def async_send_raw(
+    request: spec.RpcPluralRequest,
+    provider: spec.Provider,
+    *,
+    handle_subresponse: typing.Callable[[typing.Any], None],
+    n_attempts: int | None = None,
+) -> None:
+    ...
+
+
+@typing.overload
+async def async_send_raw(
+    request: spec.RpcRequest,
+    provider: spec.Provider,
+    *,
+    handle_subresponse: typing.Callable[[typing.Any], None] | None = None,
+    n_attempts: int | None = None,
+) -> spec.RpcResponseRaw | None:
+    ...
+
+
 async def async_send_raw(
     request: spec.RpcRequest,
     provider: spec.Provider,
-) -> spec.RpcResponseRaw:
+    *,
+    handle_subresponse: typing.Callable[[typing.Any], None] | None = None,
+    n_attempts: int | None = None,
+) -> spec.RpcResponseRaw | None:
+    """send request to provider and return raw response
+
+    if handle_subresponse is given, each element of the response is passed to
+    handle_subresponse as it is decoded and None is returned
+
+    n_attempts, if given, caps the attempts made by the transport
+    """
+
+    pool = rpc_pool.get_provider_pool(provider)
+    if pool is not None:
+        return await pool.async_send_raw(
+            request=request,
+            provider=provider,
+            handle_subresponse=handle_subresponse,
+        )
+
+    scheduler = rpc_scheduler.get_scheduler(provider)
+    compute_units = rpc_scheduler.get_request_compute_units(request)
+    await scheduler.async_acquire(compute_units)
+    try:
+        return await _async_send_raw_unscheduled(
+            request=request,
+            provider=provider,
+            handle_subresponse=handle_subresponse,
+            n_attempts=n_attempts,
+        )
+    finally:
+        scheduler.release()
+
+
+async def _async_send_raw_unscheduled(
+    request: spec.RpcRequest,
+    provider: spec.Provider,
+    *,
+    handle_subresponse: typing.Callable[[typing.Any], None] | None = None,
+    n_attempts: int | None = None,
+) -> spec.RpcResponseRaw | None:
 
     if provider['protocol'] == 'http':
         from .rpc_protocols import rpc_http_async
 
+        # http responses can be decoded while they are being received
         return await rpc_http_async.async_send_http(
             request=request,
             provider=provider,
+            handle_subresponse=handle_subresponse,
+            n_attempts=n_attempts,
         )
 
     elif provider['protocol'] == 'wss':
         from .rpc_protocols import rpc_websocket_async
 
-        return await rpc_websocket_async.async_send_websocket(
+        response = await rpc_websocket_async.async_send_websocket(
+            request=request,
+            provider=provider,
+            n_attempts=n_attempts,
+        )
+
+    elif provider['protocol'] == 'ipc':
+        from .rpc_protocols import rpc_ipc_async
+
+        response = await rpc_ipc_async.async_send_ipc(
             request=request,
             provider=provider,
+            n_attempts=n_attempts,
         )
 
     else:
@@ -226,18 +469,15 @@ async def async_send_raw(
             'unknown provider protocol: ' + str(provider['protocol'])
         )
 
-
-def reorder_response_chunks(
-    response_chunks: list[spec.RpcPluralResponseRaw],
-    request: spec.RpcPluralRequest,
-) -> spec.RpcPluralResponse:
-
-    responses_by_id = {
-        response['id']: response
-        for response_chunk in response_chunks
-        for response in response_chunk
-    }
-    return [responses_by_id[subrequest['id']] for subrequest in request]
+    if handle_subresponse is not None:
+        if isinstance(response, list):
+            for subresponse in response:
+                handle_subresponse(subresponse)
+        else:
+            handle_subresponse(response)
+        return None
+    else:
+        return response
 
 
 #
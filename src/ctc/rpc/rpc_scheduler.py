@@ -0,0 +1,176 @@
+"""per-provider scheduling of rpc requests
+
+every request sent by rpc_request.async_send_raw waits for a slot from the
+scheduler of its provider, which bounds
+- the number of requests in flight
+- the number of requests per second
+- the number of compute units per second
+
+limits are process-wide and can be changed with set_scheduler_limits()
+"""
+
+from __future__ import annotations
+
+import typing
+
+from ctc import spec
+from . import rpc_provider
+
+if typing.TYPE_CHECKING:
+    import asyncio
+
+    from typing_extensions import TypedDict
+
+    class RpcSchedulerLimits(TypedDict, total=False):
+        max_in_flight: typing.Optional[int]
+        requests_per_second: typing.Optional[float]
+        compute_units_per_second: typing.Optional[float]
+
+
+default_scheduler_limits: RpcSchedulerLimits = {
+    'max_in_flight': 64,
+    'requests_per_second': None,
+    'compute_units_per_second': None,
+}
+
+# compute units of each method, as commonly billed by hosted providers
+method_compute_units = {
+    'eth_blockNumber': 10,
+    'eth_call': 26,
+    'eth_chainId': 0,
+    'eth_estimateGas': 87,
+    'eth_feeHistory': 10,
+    'eth_gasPrice': 19,
+    'eth_getBalance': 19,
+    'eth_getBlockByHash': 21,
+    'eth_getBlockByNumber': 16,
+    'eth_getCode': 19,
+    'eth_getLogs': 75,
+    'eth_getStorageAt': 17,
+    'eth_getTransactionByHash': 17,
+    'eth_getTransactionCount': 26,
+    'eth_getTransactionReceipt': 15,
+    'net_version': 0,
+    'trace_block': 24,
+    'trace_replayTransaction': 2983,
+    'trace_transaction': 26,
+}
+default_method_compute_units = 20
+
+_provider_limits: dict[spec.ProviderKey, RpcSchedulerLimits] = {}
+_schedulers: dict[spec.ProviderKey, RpcScheduler] = {}
+
+
+class RpcScheduler:
+    """bound in-flight requests and request rates of a provider"""
+
+    def __init__(self, limits: RpcSchedulerLimits) -> None:
+        import asyncio
+
+        self.limits = limits
+        self.loop = asyncio.get_running_loop()
+        max_in_flight = limits.get('max_in_flight')
+        self.semaphore: asyncio.Semaphore | None
+        if max_in_flight is not None:
+            self.semaphore = asyncio.Semaphore(max_in_flight)
+        else:
+            self.semaphore = None
+        self.next_request_time = 0.0
+        self.next_compute_units_time = 0.0
+        self.n_in_flight = 0
+        self.n_waiting = 0
+
+    async def async_acquire(self, compute_units: int = 0) -> None:
+        """wait until a request of given compute units can be sent"""
+        import asyncio
+
+        self.n_waiting += 1
+        acquired = False
+        try:
+            if self.semaphore is not None:
+                await self.semaphore.acquire()
+                acquired = True
+
+            # reserve the earliest start time allowed by the rate limits
+            now = self.loop.time()
+            start_time = now
+            requests_per_second = self.limits.get('requests_per_second')
+            if requests_per_second is not None:
+                start_time = max(start_time, self.next_request_time)
+                self.next_request_time = start_time + 1 / requests_per_second
+            compute_units_per_second = self.limits.get(
+                'compute_units_per_second'
+            )
+            if compute_units_per_second is not None and compute_units > 0:
+                start_time = max(start_time, self.next_compute_units_time)
+                self.next_compute_units_time = (
+                    start_time + compute_units / compute_units_per_second
+                )
+            if start_time > now:
+                await asyncio.sleep(start_time - now)
+
+        except BaseException:
+            if acquired and self.semaphore is not None:
+                self.semaphore.release()
+            raise
+        finally:
+            self.n_waiting -= 1
+
+        self.n_in_flight += 1
+
+    def release(self) -> None:
+        """mark a request as finished"""
+        self.n_in_flight -= 1
+        if self.semaphore is not None:
+            self.semaphore.release()
+
+
+def get_request_compute_units(request: spec.RpcRequest) -> int:
+    """estimate compute units of request, summed over batch requests"""
+    if isinstance(request, dict):
+        return method_compute_units.get(
+            request['method'], default_method_compute_units
+        )
+    else:
+        return sum(
+            method_compute_units.get(
+                subrequest['method'], default_method_compute_units
+            )
+            for subrequest in request
+        )
+
+
+def set_scheduler_limits(
+    provider: spec.ProviderReference = None,
+    *,
+    max_in_flight: int | None = None,
+    requests_per_second: float | None = None,
+    compute_units_per_second: float | None = None,
+) -> None:
+    """set scheduling limits of provider, None means unlimited"""
+    full_provider = rpc_provider.get_provider(provider)
+    key = rpc_provider.get_provider_key(full_provider)
+    _provider_limits[key] = {
+        'max_in_flight': max_in_flight,
+        'requests_per_second': requests_per_second,
+        'compute_units_per_second': compute_units_per_second,
+    }
+    _schedulers.pop(key, None)
+
+
+def get_scheduler_limits(provider: spec.Provider) -> RpcSchedulerLimits:
+    """get scheduling limits of provider"""
+    key = rpc_provider.get_provider_key(provider)
+    return _provider_limits.get(key, default_scheduler_limits)
+
+
+def get_scheduler(provider: spec.Provider) -> RpcScheduler:
+    """get scheduler of provider in the running event loop"""
+    import asyncio
+
+    key = rpc_provider.get_provider_key(provider)
+    scheduler = _schedulers.get(key)
+    if scheduler is None or scheduler.loop is not asyncio.get_running_loop():
+        scheduler = RpcScheduler(get_scheduler_limits(provider))
+        _schedulers[key] = scheduler
+    return scheduler
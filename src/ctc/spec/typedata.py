@@ -10,6 +10,7 @@ config_keys = (
     'config_spec_version',
     'data_dir',
     'providers',
+    'provider_pools',
     'networks',
     'default_network',
     'default_providers',
@@ -18,6 +19,9 @@ config_keys = (
     'log_sql_queries',
 )
 
+# config keys that may be omitted from config files
+optional_config_keys = ('provider_pools',)
+
 block_keys = (
     'base_fee_per_gas',
     'difficulty',
@@ -121,6 +125,8 @@ transaction_keys_standardized = {
 # # providers
 #
 
+provider_pool_keys = ['name', 'network', 'providers']
+
 provider_keys = [
     'url',
     'name',
@@ -14,6 +14,9 @@ class PartialConfig(TypedDict, total=False):
     config_spec_version: str
     data_dir: str
     providers: typing.Mapping[rpc_types.ProviderName, rpc_types.Provider]
+    provider_pools: typing.Mapping[
+        rpc_types.ProviderName, rpc_types.ProviderPool
+    ]
     networks: typing.Mapping[
         network_types.ChainId, network_types.NetworkMetadata
     ]
@@ -31,6 +34,9 @@ class Config(TypedDict):
     config_spec_version: str
     data_dir: str
     providers: typing.Mapping[rpc_types.ProviderName, rpc_types.Provider]
+    provider_pools: typing.Mapping[
+        rpc_types.ProviderName, rpc_types.ProviderPool
+    ]
     networks: typing.Mapping[
         network_types.ChainId, network_types.NetworkMetadata
     ]
@@ -49,6 +55,9 @@ class JsonConfig(TypedDict):
     config_spec_version: str
     data_dir: str
     providers: typing.Mapping[rpc_types.ProviderName, rpc_types.Provider]
+    provider_pools: typing.Mapping[
+        rpc_types.ProviderName, rpc_types.ProviderPool
+    ]
     networks: typing.Mapping[str, network_types.NetworkMetadata]
     default_network: network_types.ChainId | None
     default_providers: typing.Mapping[str, rpc_types.ProviderName]
@@ -74,6 +74,12 @@ class Provider(TypedDict, total=True):
     convert_reverts_to_none: bool
 
 
+class ProviderPool(TypedDict, total=True):
+    name: ProviderName
+    network: network_types.ChainId
+    providers: typing.List[ProviderName]
+
+
 ProviderShortcut = str
 ProviderReference = typing.Union[
     ProviderShortcut, PartialProvider, Provider, None
@@ -87,7 +87,7 @@ def transfer_backends(
 
     if save_kwargs is None:
         save_kwargs = {}
-    save_kwargs = dict(common_kwargs, **get_kwargs)
+    save_kwargs = dict(get_kwargs, **save_kwargs)
 
     return save(result, backend=to_backend, **save_kwargs)
 
@@ -114,6 +114,6 @@ async def async_transfer_backends(
 
     if save_kwargs is None:
         save_kwargs = {}
-    save_kwargs = dict(common_kwargs, **get_kwargs)
+    save_kwargs = dict(get_kwargs, **save_kwargs)
 
     return await save(result, backend=to_backend, **save_kwargs)
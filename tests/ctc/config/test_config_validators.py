@@ -51,7 +51,19 @@ valid_values = {
                 'convert_reverts_to_none': False,
             },
         },
+        {
+            'test_provider': {
+                'name': 'test_provider',
+                'url': 'wss://some_url.com',
+                'network': 1,
+                'protocol': 'wss',
+                'session_kwargs': {},
+                'chunk_size': None,
+                'convert_reverts_to_none': False,
+            },
+        },
     ],
+    'provider_pools': [{}],
     'default_network': [1],
     'default_providers': [{}],
     'db_configs': [default_db_configs],
@@ -103,6 +115,16 @@ invalid_values = {
             },
         },
     ],
+    'provider_pools': [
+        {'test_pool': {'name': 'test_pool', 'network': 1, 'providers': []}},
+        {
+            'test_pool': {
+                'name': 'test_pool',
+                'network': 1,
+                'providers': ['missing_provider'],
+            },
+        },
+    ],
     'default_network': [888, 'mainnet'],
     'default_providers': [{888: None}, {'mainnet': None}],
     'db_configs': [
@@ -152,3 +174,20 @@ def test_validate_invalid_config_values(item):
         if validator is not None:
             with pytest.raises(spec.ConfigInvalid):
                 validator(value, default_config)
+
+
+def test_validate_provider_pool_members():
+    config = dict(
+        config_defaults.get_default_config(),
+        providers=valid_values['providers'][0],
+    )
+    pool = {'name': 'test_pool', 'network': 1, 'providers': ['test_provider']}
+    config['provider_pools'] = {'test_pool': pool}
+    config_validate.validate_provider_pools(config['provider_pools'], config)
+    config_validate.validate_default_providers({1: 'test_pool'}, config)
+
+    with pytest.raises(spec.ConfigInvalid):
+        other_network_pool = dict(pool, network=5)
+        config_validate.validate_provider_pools(
+            {'test_pool': other_network_pool}, config
+        )
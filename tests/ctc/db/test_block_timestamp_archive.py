@@ -0,0 +1,98 @@
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from ctc import evm
+from ctc.db.management.compression import block_timestamp_compression
+
+
+def _create_timestamps():
+    # genesis at timestamp 0, so block 1 overflows int16 diffs
+    rng = np.random.default_rng(0)
+    diffs = rng.integers(0, 30, 20_000)
+    return np.concatenate([[0], 1438269988 + np.cumsum(diffs)])
+
+
+@pytest.mark.parametrize('start_block', [0, 100])
+def test_block_timestamp_archive_matches_index(start_block):
+    timestamps = _create_timestamps()[start_block:]
+    path = block_timestamp_compression.save_block_timestamp_archive(
+        timestamps,
+        start_block=start_block,
+        dirname=tempfile.mkdtemp(),
+        checkpoint_interval=1000,
+    )
+    archive = block_timestamp_compression.load_block_timestamp_archive(path)
+    index = evm.BlockTimestampIndex(
+        start_block=start_block, timestamps=timestamps
+    )
+
+    assert archive.timestamp_diffs.dtype == np.int16
+    assert isinstance(archive.timestamp_diffs, np.memmap)
+    assert archive.start_block == start_block
+    assert archive.end_block == index.end_block
+
+    rng = np.random.default_rng(1)
+    block_numbers = rng.integers(-5, index.end_block + 5, 2000)
+    assert (
+        archive.get_timestamps(block_numbers).tolist()
+        == index.get_timestamps(block_numbers).tolist()
+    )
+
+    queries = np.concatenate(
+        [
+            rng.integers(timestamps[1] - 10, timestamps[-1] + 10, 2000),
+            [0, 1, timestamps[5], timestamps[-1]],
+        ]
+    )
+    for mode in ['>=', '<=', '==']:
+        assert (
+            archive.search(queries, mode=mode).tolist()
+            == index.search(queries, mode=mode).tolist()
+        )
+
+
+def test_block_timestamp_archive_replaced_atomically():
+    timestamps = _create_timestamps()[1:1001]
+    dirname = tempfile.mkdtemp()
+    path = block_timestamp_compression.save_block_timestamp_archive(
+        timestamps, start_block=1, dirname=dirname
+    )
+    archive = block_timestamp_compression.load_block_timestamp_archive(path)
+
+    # saving the same range again leaves mapped files of old archive intact
+    new_path = block_timestamp_compression.save_block_timestamp_archive(
+        timestamps + 1, start_block=1, dirname=dirname
+    )
+    assert new_path == path
+    assert archive.get_timestamps([1, 1000]).tolist() == [
+        timestamps[0],
+        timestamps[-1],
+    ]
+    new_archive = block_timestamp_compression.load_block_timestamp_archive(path)
+    assert new_archive.get_timestamps([1]).tolist() == [timestamps[0] + 1]
+    assert os.listdir(dirname) == [os.path.basename(path)]
+
+
+def test_get_block_timestamp_archive_ignores_other_entries(monkeypatch, tmp_path):
+    from ctc import config
+    from ctc.evm.block_utils.block_times import block_timestamp_index
+
+    monkeypatch.setattr(config, 'get_data_dir', lambda: str(tmp_path))
+    archives_dir = block_timestamp_index.get_block_timestamp_archives_dir(1)
+    os.makedirs(os.path.join(archives_dir, '.tmp__partial'))
+    with open(os.path.join(archives_dir, 'notes.txt'), 'w') as f:
+        f.write('')
+    block_timestamp_compression.save_block_timestamp_archive(
+        _create_timestamps()[1:101], start_block=1, dirname=archives_dir
+    )
+
+    block_timestamp_index.clear_block_timestamp_indices()
+    try:
+        archive = block_timestamp_index.get_block_timestamp_archive(1)
+    finally:
+        block_timestamp_index.clear_block_timestamp_indices()
+    assert archive is not None
+    assert (archive.start_block, archive.end_block) == (1, 100)
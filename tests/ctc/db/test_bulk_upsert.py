@@ -0,0 +1,233 @@
+import os
+import tempfile
+
+import pytest
+import toolsql
+
+from ctc import db
+
+
+def _create_engine():
+    path = os.path.join(tempfile.mkdtemp(), 'example.db')
+    return toolsql.create_engine(dbms='sqlite', path=path)
+
+
+def test_bulk_upsert_rows_sqlite():
+    engine = _create_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            'CREATE TABLE example (number INTEGER PRIMARY KEY, value TEXT)'
+        )
+        conn.exec_driver_sql("INSERT INTO example VALUES (1, 'old')")
+        cache_size = conn.exec_driver_sql('PRAGMA cache_size').scalar()
+
+        n_rows = db.bulk_upsert_rows(
+            conn,
+            table='example',
+            columns=['number', 'value'],
+            rows=[(1, 'new'), (2, 'a'), (3, None), (2, 'b')],
+            primary_key=['number'],
+        )
+
+        assert n_rows == 3
+        assert conn.exec_driver_sql('PRAGMA cache_size').scalar() == cache_size
+
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            'SELECT number, value FROM example ORDER BY number'
+        ).fetchall()
+    assert [tuple(row) for row in rows] == [(1, 'new'), (2, 'b'), (3, None)]
+
+
+def test_bulk_upsert_rows_only_primary_key():
+    engine = _create_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            'CREATE TABLE example (number INTEGER PRIMARY KEY)'
+        )
+        db.bulk_upsert_rows(
+            conn,
+            table='example',
+            columns=['number'],
+            rows=[(1,), (2,), (1,)],
+            primary_key=['number'],
+        )
+        count = conn.exec_driver_sql('SELECT COUNT(*) FROM example').scalar()
+    assert count == 2
+
+
+def test_executemany_upsert_rows():
+    from ctc.db import bulk_utils
+
+    engine = _create_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            'CREATE TABLE example (number INTEGER PRIMARY KEY, value TEXT)'
+        )
+        conn.exec_driver_sql("INSERT INTO example VALUES (1, 'old')")
+        bulk_utils._executemany_upsert_rows(
+            conn,
+            table='example',
+            columns=['number', 'value'],
+            rows=[(1, 'new'), (2, None)],
+            primary_key=['number'],
+        )
+        rows = conn.exec_driver_sql(
+            'SELECT number, value FROM example ORDER BY number'
+        ).fetchall()
+    assert [tuple(row) for row in rows] == [(1, 'new'), (2, None)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_intake_blocks(monkeypatch):
+    from ctc.db import connect_utils
+    from ctc.db import management
+    from ctc.db import schema_utils
+
+    engine = _create_engine()
+    table = schema_utils.get_table_name('block_timestamps', network=1)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            'CREATE TABLE '
+            + table
+            + ' (block_number INTEGER PRIMARY KEY, timestamp INTEGER)'
+        )
+    monkeypatch.setattr(
+        management,
+        'get_active_schemas',
+        lambda: {'block_timestamps': True},
+    )
+    monkeypatch.setattr(connect_utils, 'create_engine', lambda **kwargs: engine)
+
+    async def async_iterate_blocks():
+        for number in range(100, 125):
+            yield {'number': number, 'timestamp': 1000 + 12 * number}
+
+    stats = await db.async_bulk_intake_blocks(
+        async_iterate_blocks(),
+        network=1,
+        batch_size=10,
+        latest_block_number=1000,
+    )
+
+    assert stats['n_blocks'] == 25
+    assert stats['n_rows'] == 25
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            'SELECT block_number, timestamp FROM ' + table
+        ).fetchall()
+    assert sorted(tuple(row) for row in rows) == [
+        (number, 1000 + 12 * number) for number in range(100, 125)
+    ]
+
+
+def _create_postgres_engine():
+    """create engine of test postgres database, skipping if unavailable"""
+    import sqlalchemy
+
+    url = os.environ.get('CTC_TEST_POSTGRES_URL')
+    if url is None:
+        pytest.skip('CTC_TEST_POSTGRES_URL not set')
+    pytest.importorskip('psycopg2')
+    engine = sqlalchemy.create_engine(url)
+    try:
+        engine.connect().close()
+    except sqlalchemy.exc.OperationalError:
+        pytest.skip('could not connect to postgres')
+    return engine
+
+
+def _create_postgres_table(engine, table):
+    with engine.begin() as conn:
+        conn.exec_driver_sql('DROP TABLE IF EXISTS ' + table)
+        conn.exec_driver_sql(
+            'CREATE TABLE '
+            + table
+            + ' (number INTEGER PRIMARY KEY, value TEXT)'
+        )
+        conn.exec_driver_sql('INSERT INTO ' + table + " VALUES (1, 'old')")
+
+
+def _select_postgres_rows(engine, table):
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            'SELECT number, value FROM ' + table + ' ORDER BY number'
+        ).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def _forbid_executemany(monkeypatch):
+    from ctc.db import bulk_utils
+
+    def raise_executemany(*args, **kwargs):
+        raise Exception('COPY path was not used')
+
+    monkeypatch.setattr(
+        bulk_utils, '_executemany_upsert_rows', raise_executemany
+    )
+
+
+def test_bulk_upsert_rows_postgresql_copy(monkeypatch):
+    engine = _create_postgres_engine()
+    table = 'ctc_test_bulk_upsert'
+    _create_postgres_table(engine, table)
+    _forbid_executemany(monkeypatch)
+    try:
+        with engine.begin() as conn:
+            n_rows = db.bulk_upsert_rows(
+                conn,
+                table=table,
+                columns=['number', 'value'],
+                rows=[(1, 'new'), (2, 'tab\there'), (3, None), (2, 'b')],
+                primary_key=['number'],
+            )
+            assert n_rows == 3
+
+            # staging table is reusable within the same transaction
+            db.bulk_upsert_rows(
+                conn,
+                table=table,
+                columns=['number', 'value'],
+                rows=[(4, 'line\nbreak')],
+                primary_key=['number'],
+            )
+
+        assert _select_postgres_rows(engine, table) == [
+            (1, 'new'),
+            (2, 'b'),
+            (3, None),
+            (4, 'line\nbreak'),
+        ]
+    finally:
+        with engine.begin() as conn:
+            conn.exec_driver_sql('DROP TABLE IF EXISTS ' + table)
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rows_postgresql_copy_asyncpg(monkeypatch):
+    engine = _create_postgres_engine()
+    pytest.importorskip('asyncpg')
+    pytest.importorskip('greenlet')
+    table = 'ctc_test_bulk_upsert_asyncpg'
+    _create_postgres_table(engine, table)
+    _forbid_executemany(monkeypatch)
+
+    def bulk_upsert(*, conn):
+        return db.bulk_upsert_rows(
+            conn,
+            table=table,
+            columns=['number', 'value'],
+            rows=[(1, 'new'), (2, 'a')],
+            primary_key=['number'],
+        )
+
+    try:
+        assert db.get_async_engine(engine) is not None
+        n_rows = await db.async_run_with_connection(
+            bulk_upsert, engine=engine, begin=True
+        )
+        assert n_rows == 2
+        assert _select_postgres_rows(engine, table) == [(1, 'new'), (2, 'a')]
+    finally:
+        with engine.begin() as conn:
+            conn.exec_driver_sql('DROP TABLE IF EXISTS ' + table)
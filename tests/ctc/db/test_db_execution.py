@@ -0,0 +1,134 @@
+import os
+import tempfile
+import threading
+
+import pytest
+import toolsql
+
+from ctc import db
+
+
+def _create_engine():
+    path = os.path.join(tempfile.mkdtemp(), 'example.db')
+    return toolsql.create_engine(dbms='sqlite', path=path)
+
+
+def select_thread(*, conn, value):
+    result = conn.exec_driver_sql('SELECT ' + str(int(value))).scalar()
+    return result, threading.get_ident()
+
+
+def create_example(*, conn):
+    conn.exec_driver_sql('CREATE TABLE example (x INTEGER)')
+    conn.exec_driver_sql('INSERT INTO example VALUES (3)')
+
+
+def sum_example(*, conn):
+    return conn.exec_driver_sql('SELECT SUM(x) FROM example').scalar()
+
+
+@pytest.mark.parametrize('mode', ['auto', 'thread', 'blocking'])
+@pytest.mark.asyncio
+async def test_run_with_connection(mode):
+    engine = _create_engine()
+    db.set_db_execution_mode(mode)
+    try:
+        value, thread = await db.async_run_with_connection(
+            select_thread, engine=engine, value=7
+        )
+    finally:
+        db.set_db_execution_mode('auto')
+    assert value == 7
+    if mode == 'blocking':
+        assert thread == threading.get_ident()
+    elif mode == 'thread':
+        assert thread != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_run_with_connection_commits_transaction():
+    engine = _create_engine()
+    await db.async_run_with_connection(
+        create_example, engine=engine, begin=True
+    )
+    assert await db.async_run_with_connection(sum_example, engine=engine) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_with_connection_uses_async_driver():
+    pytest.importorskip('aiosqlite')
+    pytest.importorskip('greenlet')
+
+    engine = _create_engine()
+    assert db.get_async_engine(engine) is not None
+    await db.async_run_with_connection(
+        create_example, engine=engine, begin=True
+    )
+    assert await db.async_run_with_connection(sum_example, engine=engine) == 3
+
+    # statements run in the event loop thread, without a worker thread
+    value, thread = await db.async_run_with_connection(
+        select_thread, engine=engine, value=7
+    )
+    assert value == 7
+    assert thread == threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_async_statement_uses_given_connection():
+    engine = _create_engine()
+    async_sum_example = db.create_async_statement(sum_example)
+    assert async_sum_example.__name__ == 'async_sum_example'
+    with engine.begin() as conn:
+        create_example(conn=conn)
+        assert await async_sum_example(conn=conn) == 3
+
+
+def test_create_engine_reuses_engines(monkeypatch):
+    from ctc import config
+    from ctc.db import connect_utils
+
+    db_config = {
+        'dbms': 'sqlite',
+        'path': os.path.join(tempfile.mkdtemp(), 'example.db'),
+    }
+    monkeypatch.setattr(
+        config,
+        'get_data_source',
+        lambda **kwargs: {'backend': 'db', 'db_config': db_config},
+    )
+    verified = []
+    monkeypatch.setattr(
+        connect_utils,
+        '_initialize_missing_schema',
+        lambda **kwargs: verified.append(kwargs['schema_name']),
+    )
+    connect_utils.clear_engine_registry()
+    try:
+        engine = db.create_engine(schema_name='blocks', network=1)
+        assert db.create_engine(schema_name='blocks', network=1) is engine
+        assert (
+            db.create_engine(schema_name='erc20_metadata', network=1) is engine
+        )
+        assert verified == ['blocks', 'erc20_metadata']
+
+        connect_utils.clear_engine_registry()
+        assert db.create_engine(schema_name='blocks', network=1) is not engine
+        assert verified == ['blocks', 'erc20_metadata', 'blocks']
+    finally:
+        connect_utils.clear_engine_registry()
+
+
+@pytest.mark.asyncio
+async def test_selector_reuses_given_connection():
+    engine = _create_engine()
+
+    def select_value(*, conn, value):
+        return conn.exec_driver_sql('SELECT ' + str(int(value))).scalar()
+
+    async_query_value = db.wrap_selector_with_connection(
+        select_value, 'blocks', require_network=False
+    )
+    with engine.connect() as conn:
+        assert await async_query_value(conn=conn, value=5) == 5
+    assert await async_query_value(engine=engine, value=6) == 6
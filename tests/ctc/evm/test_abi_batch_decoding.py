@@ -0,0 +1,107 @@
+import random
+
+import numpy as np
+import pytest
+
+from ctc import evm
+
+
+def _random_value(output_type, rng):
+    if output_type == 'address':
+        return '0x' + bytes(rng.getrandbits(8) for i in range(20)).hex()
+    elif output_type == 'bool':
+        return rng.random() < 0.5
+    elif output_type.startswith('bytes'):
+        return bytes(rng.getrandbits(8) for i in range(int(output_type[5:])))
+    elif output_type.startswith('uint'):
+        return rng.getrandbits(int(output_type[4:] or 256))
+    elif output_type.startswith('int'):
+        bits = int(output_type[3:] or 256)
+        return rng.getrandbits(bits) - 2 ** (bits - 1)
+    else:
+        raise Exception('unknown type')
+
+
+output_types_examples = [
+    ['uint256'],
+    ['uint112', 'uint112', 'uint32'],
+    ['int24', 'int256', 'bool', 'address'],
+    ['bytes32', 'bytes4', 'uint64', 'int64', 'uint8'],
+    ['string'],
+    ['uint256', 'uint256[]'],
+]
+
+
+@pytest.mark.parametrize('output_types', output_types_examples)
+def test_decode_function_outputs(output_types):
+    rng = random.Random(0)
+    encoded_outputs = []
+    for i in range(20):
+        if output_types == ['string']:
+            values = ('x' * i,)
+        elif output_types[-1] == 'uint256[]':
+            values = (i, list(range(i)))
+        else:
+            values = tuple(_random_value(t, rng) for t in output_types)
+        encoded = evm.abi_encode(values, '(' + ','.join(output_types) + ')')
+        encoded_outputs.append('0x' + encoded.hex())
+
+    expected = [
+        evm.decode_function_output(
+            encoded_output=encoded_output, output_types=output_types
+        )
+        for encoded_output in encoded_outputs
+    ]
+    actual = evm.decode_function_outputs(
+        encoded_outputs=encoded_outputs, output_types=output_types
+    )
+    assert [
+        list(item) if isinstance(item, tuple) else item for item in expected
+    ] == [list(item) if isinstance(item, tuple) else item for item in actual]
+
+    # bytes inputs decode the same as hex inputs
+    binary_outputs = [bytes.fromhex(output[2:]) for output in encoded_outputs]
+    assert (
+        evm.decode_function_outputs(
+            encoded_outputs=binary_outputs, output_types=output_types
+        )
+        == actual
+    )
+
+
+def test_decode_function_outputs_as_arrays():
+    function_abi = {
+        'name': 'getReserves',
+        'inputs': [],
+        'outputs': [
+            {'name': 'reserve0', 'type': 'uint112'},
+            {'name': 'reserve1', 'type': 'uint112'},
+            {'name': 'blockTimestampLast', 'type': 'uint32'},
+        ],
+        'stateMutability': 'view',
+        'type': 'function',
+    }
+    values = [(2**100 + i, i, 1_650_000_000 + i) for i in range(5)]
+    encoded_outputs = [
+        evm.abi_encode(value, '(uint112,uint112,uint32)') for value in values
+    ]
+
+    reserve0, reserve1, timestamps = evm.decode_function_outputs(
+        encoded_outputs=encoded_outputs,
+        function_abi=function_abi,
+        as_arrays=True,
+    )
+    assert reserve0 == [value[0] for value in values]
+    assert isinstance(timestamps, np.ndarray)
+    assert timestamps.tolist() == [value[2] for value in values]
+
+    named = evm.decode_function_outputs(
+        encoded_outputs=encoded_outputs,
+        function_abi=function_abi,
+        package_named_outputs=True,
+    )
+    assert named[1] == {
+        'reserve0': 2**100 + 1,
+        'reserve1': 1,
+        'blockTimestampLast': 1_650_000_001,
+    }
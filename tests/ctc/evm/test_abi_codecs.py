@@ -0,0 +1,74 @@
+import eth_abi_lite
+import pytest
+
+from ctc import evm
+
+
+examples = [
+    ('uint256', 2**200),
+    ('address', '0x' + '12' * 20),
+    ('(uint256,string)', (7, 'abc')),
+    (('uint256', 'string'), (7, 'abc')),
+    (
+        ('int24', 'bytes32[]', '(bool,address)'),
+        (-5, [b'1' * 32], (True, '0x' + 'ab' * 20)),
+    ),
+]
+
+
+@pytest.mark.parametrize('types,value', examples)
+def test_compiled_codecs_match_eth_abi(types, value):
+    if isinstance(types, str):
+        encoded = eth_abi_lite.encode_single(types, value)
+    else:
+        encoded = eth_abi_lite.encode_abi(types, value)
+    assert evm.abi_encode(value, types) == encoded
+    assert (
+        evm.abi_encode(
+            value, list(types) if not isinstance(types, str) else types
+        )
+        == encoded
+    )
+
+    decoded = evm.abi_decode(encoded, types)
+    assert evm.abi_decode('0x' + encoded.hex(), types) == decoded
+    if isinstance(types, str):
+        assert decoded == eth_abi_lite.decode_single(types, encoded)
+    else:
+        assert decoded == eth_abi_lite.decode_abi(types, encoded)
+
+
+def test_compiled_codecs_are_cached():
+    evm.clear_abi_codec_cache()
+    decoder = evm.get_abi_decoder(('uint256', 'address'))
+    assert evm.get_abi_decoder(('uint256', 'address')) is decoder
+    assert evm.get_abi_decoder.cache_info().hits == 1
+
+    encoder = evm.get_abi_encoder('uint256')
+    assert evm.get_abi_encoder('uint256') is encoder
+
+
+def test_function_coding_roundtrip():
+    function_abi = {
+        'name': 'transfer',
+        'type': 'function',
+        'inputs': [
+            {'name': 'to', 'type': 'address'},
+            {'name': 'amount', 'type': 'uint256'},
+        ],
+        'outputs': [{'name': '', 'type': 'bool'}],
+        'stateMutability': 'nonpayable',
+    }
+    parameters = ['0x' + '34' * 20, 10**18]
+    call_data = evm.encode_call_data(
+        function_abi=function_abi, parameters=parameters
+    )
+    decoded = evm.decode_call_data(call_data, function_abi)
+    assert decoded['parameters'] == parameters
+    assert (
+        evm.decode_function_output(
+            encoded_output=evm.abi_encode([True], ['bool']),
+            function_abi=function_abi,
+        )
+        is True
+    )
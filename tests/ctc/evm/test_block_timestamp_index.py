@@ -0,0 +1,167 @@
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from ctc import evm
+
+
+def _create_index():
+    # block 100 through block 104
+    return evm.BlockTimestampIndex(
+        start_block=100, timestamps=[10, 12, 12, 15, 20]
+    )
+
+
+@pytest.mark.parametrize(
+    'mode,expected',
+    [
+        ('>=', [-1, -1, 101, 101, 103, 103, 104, -1]),
+        ('<=', [-1, 100, 100, 102, 102, 103, -1, -1]),
+        ('==', [-1, -1, -1, 101, -1, 103, 104, -1]),
+    ],
+)
+def test_block_timestamp_index_search(mode, expected):
+    index = _create_index()
+    timestamps = [9, 10, 11, 12, 13, 15, 20, 21]
+    assert index.search(timestamps, mode=mode).tolist() == expected
+
+
+def test_block_timestamp_index_extend():
+    index = _create_index()
+    n_added = index.extend(
+        block_numbers=[106, 105, 99, 98, 97, 110],
+        timestamps=[30, 25, 9, 8, 9, 40],
+    )
+
+    # block 97 breaks monotonicity and block 110 is not contiguous
+    assert n_added == 4
+    assert index.start_block == 98
+    assert index.end_block == 106
+    assert index.timestamps.tolist() == [8, 9, 10, 12, 12, 15, 20, 25, 30]
+    assert index.get_timestamps([97, 98, 106, 107]).tolist() == [-1, 8, 30, -1]
+
+
+def test_block_timestamp_index_save_and_load():
+    path = os.path.join(tempfile.mkdtemp(), 'block_timestamp_index.npz')
+    index = _create_index()
+    index.extend(block_numbers=[105], timestamps=[22])
+    index.save(path)
+
+    loaded = evm.BlockTimestampIndex.load(path)
+    assert loaded.start_block == 100
+    assert loaded.timestamps.tolist() == [10, 12, 12, 15, 20, 22]
+
+
+@pytest.mark.asyncio
+async def test_build_block_timestamp_index_in_chunks(monkeypatch, tmp_path):
+    from ctc import config
+    from ctc import db
+    from ctc.evm.block_utils.block_times import block_timestamp_index
+
+    # blocks 0 through 19, with a gap at block 5 and timestamp drop at block 16
+    rows = [[number, 100 + number] for number in range(20) if number != 5]
+    rows[15][1] = 50
+    queries = []
+
+    async def async_query_max_block_number(*, network):
+        return rows[-1][0]
+
+    async def async_query_block_timestamp_rows(network, start_block, end_block):
+        queries.append((start_block, end_block))
+        return [row for row in rows if start_block <= row[0] <= end_block]
+
+    monkeypatch.setattr(config, 'get_data_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(
+        db, 'async_query_max_block_number', async_query_max_block_number
+    )
+    monkeypatch.setattr(
+        db, 'async_query_block_timestamp_rows', async_query_block_timestamp_rows
+    )
+    try:
+        index = await block_timestamp_index.async_build_block_timestamp_index(
+            network=1, chunk_size=4
+        )
+    finally:
+        block_timestamp_index.clear_block_timestamp_indices()
+
+    assert queries == [(0, 3), (4, 7), (8, 11), (12, 15), (16, 19)]
+    assert index.start_block == 6
+    assert index.timestamps.tolist() == list(range(106, 116))
+    assert index.timestamps.dtype == 'int32'
+    loaded = evm.BlockTimestampIndex.load(index.path)
+    assert loaded.timestamps.tolist() == index.timestamps.tolist()
+
+
+@pytest.mark.asyncio
+async def test_block_timestamp_index_saves_off_event_loop(monkeypatch):
+    import threading
+
+    from ctc.evm.block_utils.block_times import block_timestamp_index
+
+    path = os.path.join(tempfile.mkdtemp(), 'block_timestamp_index.npz')
+    index = _create_index()
+    index.path = path
+    threads = []
+    write_index_file = block_timestamp_index._write_index_file
+
+    def record_thread(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return write_index_file(*args, **kwargs)
+
+    monkeypatch.setattr(
+        block_timestamp_index, 'block_timestamp_index_save_interval', 2
+    )
+    monkeypatch.setattr(
+        block_timestamp_index, '_write_index_file', record_thread
+    )
+    index.extend(block_numbers=[105, 106], timestamps=[22, 23])
+    await index._pending_save
+
+    assert threads != [] and threads[0] != threading.get_ident()
+    assert index.n_unsaved == 0
+    loaded = evm.BlockTimestampIndex.load(path)
+    assert loaded.timestamps.tolist() == [10, 12, 12, 15, 20, 22, 23]
+
+
+def test_concurrent_index_saves_do_not_collide():
+    import concurrent.futures
+
+    from ctc.evm.block_utils.block_times import block_timestamp_index
+
+    tempdir = tempfile.mkdtemp()
+    path = os.path.join(tempdir, 'block_timestamp_index.npz')
+    timestamps = [list(range(n, n + 1000)) for n in range(8)]
+
+    def write(values):
+        return block_timestamp_index._write_index_file(
+            path, start_block=100, timestamps=np.array(values, dtype=np.int32)
+        )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, timestamps))
+
+    assert os.listdir(tempdir) == ['block_timestamp_index.npz']
+    loaded = evm.BlockTimestampIndex.load(path)
+    assert loaded.timestamps.tolist() in timestamps
+
+
+@pytest.mark.asyncio
+async def test_cli_exit_saves_block_timestamp_indices():
+    from ctc.cli import cli_utils
+    from ctc.evm.block_utils.block_times import block_timestamp_index
+
+    path = os.path.join(tempfile.mkdtemp(), 'block_timestamp_index.npz')
+    index = _create_index()
+    index.path = path
+    index.extend(block_numbers=[105], timestamps=[22])
+    block_timestamp_index._block_timestamp_indices[1] = index
+    try:
+        await cli_utils.AsyncContextManager().__aexit__(None, None, None)
+    finally:
+        block_timestamp_index.clear_block_timestamp_indices()
+
+    assert index.n_unsaved == 0
+    loaded = evm.BlockTimestampIndex.load(path)
+    assert loaded.timestamps.tolist() == [10, 12, 12, 15, 20, 22]
@@ -0,0 +1,410 @@
+import os
+
+import pytest
+
+from ctc.evm.event_utils.event_backends import filesystem_formats
+
+
+event_abi = {
+    'name': 'Example',
+    'type': 'event',
+    'anonymous': False,
+    'inputs': [
+        {'name': 'sender', 'type': 'address', 'indexed': True},
+        {'name': 'amount', 'type': 'uint256', 'indexed': False},
+        {'name': 'delta', 'type': 'int128', 'indexed': False},
+        {'name': 'tag', 'type': 'bytes32', 'indexed': False},
+        {'name': 'small', 'type': 'uint8', 'indexed': False},
+    ],
+}
+
+
+def create_events(start_block, n_events):
+    import pandas as pd
+
+    rows = []
+    for i in range(n_events):
+        rows.append(
+            {
+                'block_number': start_block + i,
+                'transaction_index': i % 3,
+                'log_index': i,
+                'transaction_hash': '0x' + '12' * 32,
+                'contract_address': '0x' + '34' * 20,
+                'event_name': 'Example',
+                'arg__sender': '0x' + '56' * 20,
+                'arg__amount': 2**255 + i,
+                'arg__delta': -(2**100) - i,
+                'arg__tag': bytes([i]) * 32,
+                'arg__small': i,
+            }
+        )
+    df = pd.DataFrame(rows)
+    return df.set_index(filesystem_formats.index_columns)
+
+
+def test_parquet_roundtrip(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    events = create_events(100, 10)
+    path = str(tmp_path / '100__to__109.parquet')
+    filesystem_formats.write_events_file(events, path=path, event_abi=event_abi)
+    loaded = filesystem_formats.read_events_file(path, event_abi=event_abi)
+
+    assert len(loaded) == 10
+    assert list(loaded['arg__amount']) == list(events['arg__amount'])
+    assert list(loaded['arg__delta']) == list(events['arg__delta'])
+    assert loaded['arg__tag'].iloc[1] == '0x' + '01' * 32
+    assert list(loaded['arg__small']) == list(range(10))
+
+
+def test_parquet_projection_and_block_range(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    events = create_events(100, 10)
+    path = str(tmp_path / '100__to__109.parquet')
+    filesystem_formats.write_events_file(events, path=path, event_abi=event_abi)
+    loaded = filesystem_formats.read_events_file(
+        path,
+        event_abi=event_abi,
+        columns=['arg__amount'],
+        start_block=103,
+        end_block=105,
+    )
+
+    assert list(loaded.columns) == ['arg__amount']
+    assert list(loaded.index.get_level_values('block_number')) == [
+        103,
+        104,
+        105,
+    ]
+
+
+def test_csv_to_parquet_conversion(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    events = create_events(100, 10)
+    csv_path = str(tmp_path / '100__to__109.csv')
+    parquet_path = str(tmp_path / '100__to__109.parquet')
+    filesystem_formats.write_events_file(
+        events, path=csv_path, event_abi=event_abi
+    )
+    from_csv = filesystem_formats.read_events_file(
+        csv_path, event_abi=event_abi
+    )
+    filesystem_formats.write_events_file(
+        from_csv, path=parquet_path, event_abi=event_abi
+    )
+    from_parquet = filesystem_formats.read_events_file(
+        parquet_path, event_abi=event_abi
+    )
+
+    assert list(from_parquet['arg__amount']) == list(events['arg__amount'])
+    assert list(from_parquet['arg__tag']) == list(from_csv['arg__tag'])
+
+
+@pytest.mark.parametrize(
+    'path,file_format',
+    [
+        ['/data/100__to__200.csv', 'csv'],
+        ['/data/100__to__200.parquet', 'parquet'],
+        ['/data/100__to__200.csv__OLD', 'csv'],
+    ],
+)
+def test_get_path_file_format(path, file_format):
+    assert filesystem_formats.get_path_file_format(path) == file_format
+
+
+def test_arrow_block_range_slice(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    paths = []
+    for start_block in [100, 110, 120]:
+        events = create_events(start_block, 10)
+        path = str(
+            tmp_path / (str(start_block) + '__to__' + str(start_block + 9))
+        )
+        path += '.arrow'
+        filesystem_formats.write_events_file(
+            events, path=path, event_abi=event_abi
+        )
+        paths.append(path)
+
+    loaded = filesystem_formats.read_events_files(
+        paths,
+        event_abi=event_abi,
+        start_block=105,
+        end_block=124,
+    )
+
+    block_numbers = list(loaded.index.get_level_values('block_number'))
+    assert block_numbers == list(range(105, 125))
+    assert loaded['arg__amount'].iloc[0] == 2**255 + 5
+
+
+def test_mixed_format_chunks(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    csv_path = str(tmp_path / '100__to__109.csv')
+    arrow_path = str(tmp_path / '110__to__119.arrow')
+    filesystem_formats.write_events_file(
+        create_events(100, 10), path=csv_path, event_abi=event_abi
+    )
+    filesystem_formats.write_events_file(
+        create_events(110, 10), path=arrow_path, event_abi=event_abi
+    )
+
+    loaded = filesystem_formats.read_events_files(
+        [csv_path, arrow_path],
+        event_abi=event_abi,
+        columns=['arg__tag'],
+        start_block=108,
+        end_block=111,
+    )
+
+    assert list(loaded.index.get_level_values('block_number')) == [
+        108,
+        109,
+        110,
+        111,
+    ]
+    assert list(loaded['arg__tag']) == [
+        '0x' + '08' * 32,
+        '0x' + '09' * 32,
+        '0x' + '00' * 32,
+        '0x' + '01' * 32,
+    ]
+
+
+def test_chunks_coverage():
+    from ctc.evm.event_utils.event_backends import filesystem_manifest
+
+    chunks = {
+        '200__to__299.csv': (200, 299),
+        '100__to__199.csv': (100, 199),
+        '500__to__599.parquet': (500, 599),
+    }
+    coverage = filesystem_manifest.get_chunks_coverage(chunks)
+    assert coverage == [(100, 299), (500, 599)]
+
+    missing = filesystem_manifest.get_missing_intervals(
+        coverage, start_block=50, end_block=700
+    )
+    assert missing == [(50, 99), (300, 499), (600, 700)]
+
+    missing = filesystem_manifest.get_missing_intervals(
+        coverage, start_block=150, end_block=250
+    )
+    assert missing == []
+
+    with pytest.raises(Exception):
+        filesystem_manifest.get_chunks_coverage(
+            dict(chunks, **{'250__to__350.csv': (250, 350)})
+        )
+
+
+def test_manifest_tracks_directory(tmp_path):
+    import os
+
+    from ctc.evm.event_utils.event_backends import filesystem_manifest
+
+    event_dir = str(tmp_path / 'event__0xabc')
+    os.makedirs(event_dir)
+    for filename in ['100__to__199.csv', '200__to__299.csv']:
+        with open(os.path.join(event_dir, filename), 'w') as f:
+            f.write('')
+
+    chunks = filesystem_manifest.get_event_chunks(event_dir)
+    assert chunks == {
+        '100__to__199.csv': (100, 199),
+        '200__to__299.csv': (200, 299),
+    }
+    manifest = filesystem_manifest.load_manifest(event_dir)
+    assert manifest is not None
+    assert manifest['coverage'] == [[100, 299]]
+
+    # modifications made outside of ctc invalidate the manifest
+    os.remove(os.path.join(event_dir, '200__to__299.csv'))
+    chunks = filesystem_manifest.get_event_chunks(event_dir)
+    assert chunks == {'100__to__199.csv': (100, 199)}
+
+
+def test_update_manifest_misses_no_concurrent_chunks(tmp_path, monkeypatch):
+    from ctc.evm.event_utils.event_backends import filesystem_manifest
+
+    event_dir = str(tmp_path / 'event__0xabc')
+    os.makedirs(event_dir)
+    with open(os.path.join(event_dir, '100__to__199.csv'), 'w') as f:
+        f.write('')
+
+    # another writer adds a chunk after the directory has been listed
+    scan_event_chunks = filesystem_manifest.scan_event_chunks
+
+    def scan_then_write(event_dir):
+        chunks = scan_event_chunks(event_dir)
+        with open(os.path.join(event_dir, '200__to__299.csv'), 'w') as f:
+            f.write('')
+        # mtime granularity of the filesystem may be coarser than the test
+        os.utime(event_dir, ns=(1, 1))
+        return chunks
+
+    monkeypatch.setattr(
+        filesystem_manifest, 'scan_event_chunks', scan_then_write
+    )
+    chunks = filesystem_manifest.update_manifest(event_dir)
+    assert chunks == {'100__to__199.csv': (100, 199)}
+    monkeypatch.undo()
+
+    chunks = filesystem_manifest.get_event_chunks(event_dir)
+    assert chunks == {
+        '100__to__199.csv': (100, 199),
+        '200__to__299.csv': (200, 299),
+    }
+
+
+def test_plan_event_downloads():
+    from ctc.evm.event_utils import event_crud
+
+    downloads = event_crud._plan_event_downloads(
+        [(50, 99), (300, 520)],
+        blocks_per_file=100,
+    )
+    assert downloads == [(50, 99), (300, 399), (400, 499), (500, 520)]
+
+
+@pytest.mark.asyncio
+async def test_save_rejects_chunk_of_other_format(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    import ctc.config
+    from ctc.evm.event_utils.event_backends import filesystem_events
+
+    monkeypatch.setattr(ctc.config, 'get_data_dir', lambda: str(tmp_path))
+    kwargs = dict(
+        contract_address='0x' + '34' * 20,
+        event_hash='0x' + 'ab' * 32,
+        event_abi=event_abi,
+        start_block=100,
+        end_block=109,
+        network='mainnet',
+        verbose=False,
+    )
+    events = create_events(100, 10)
+    await filesystem_events.async_save_events_to_filesystem(
+        events, file_format='csv', **kwargs
+    )
+    with pytest.raises(Exception):
+        await filesystem_events.async_save_events_to_filesystem(
+            events, file_format='parquet', **kwargs
+        )
+
+    # overwriting replaces the chunk of the other format
+    await filesystem_events.async_save_events_to_filesystem(
+        events, file_format='parquet', overwrite=True, **kwargs
+    )
+    event_dir = filesystem_events.get_events_event_dir(
+        contract_address=kwargs['contract_address'],
+        event_hash=kwargs['event_hash'],
+        network='mainnet',
+    )
+    assert os.listdir(event_dir) == ['100__to__109.parquet']
+
+
+def test_block_slice_of_chunked_column():
+    pa = pytest.importorskip('pyarrow')
+
+    table = pa.Table.from_batches(
+        [
+            pa.RecordBatch.from_pydict({'block_number': [100, 101, 101]}),
+            pa.RecordBatch.from_pydict({'block_number': [102, 105, 107]}),
+        ]
+    )
+    assert table.column('block_number').num_chunks == 2
+    assert filesystem_formats._get_block_slice(
+        table, start_block=101, end_block=105
+    ) == (1, 4)
+    assert filesystem_formats._get_block_slice(
+        table, start_block=106, end_block=None
+    ) == (5, 1)
+
+
+def test_zero_padded_bytes_across_formats(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    events = create_events(100, 3)
+    padded = '0x' + '00' * 31 + '01'
+    events['arg__tag'] = [padded, bytes(32), bytes([2]) * 32]
+    expected = [padded, '0x' + '00' * 32, '0x' + '02' * 32]
+
+    # csv -> parquet -> arrow -> csv
+    previous = events
+    for file_format in ['csv', 'parquet', 'arrow', 'csv']:
+        path = str(tmp_path / ('100__to__102.' + file_format))
+        filesystem_formats.write_events_file(
+            previous, path=path, event_abi=event_abi
+        )
+        previous = filesystem_formats.read_events_file(
+            path, event_abi=event_abi
+        )
+        assert list(previous['arg__tag']) == expected, file_format
+        os.remove(path)
+
+
+@pytest.mark.asyncio
+async def test_rechunk_with_originals_present(tmp_path, monkeypatch):
+    import ctc.config
+    from ctc.evm.event_utils.event_backends import filesystem_events
+    from ctc.evm.event_utils.event_backends import filesystem_rechunking
+
+    monkeypatch.setattr(ctc.config, 'get_data_dir', lambda: str(tmp_path))
+    kwargs = dict(
+        contract_address='0x' + '34' * 20,
+        event_hash='0x' + 'ab' * 32,
+        network='mainnet',
+    )
+    for start_block in [100, 110, 120]:
+        await filesystem_events.async_save_events_to_filesystem(
+            create_events(start_block, 10),
+            event_abi=event_abi,
+            start_block=start_block,
+            end_block=start_block + 9,
+            verbose=False,
+            **kwargs,
+        )
+
+    async def async_get_event_abi(**abi_kwargs):
+        return event_abi
+
+    monkeypatch.setattr(
+        filesystem_events.abi_utils, 'async_get_event_abi', async_get_event_abi
+    )
+
+    # events stay listable while originals are renamed to __OLD
+    save_events = filesystem_events.async_save_events_to_filesystem
+    listed = []
+
+    async def save_and_list(events, **save_kwargs):
+        await save_events(events, **save_kwargs)
+        listed.append(filesystem_events.list_events(**kwargs))
+
+    monkeypatch.setattr(
+        filesystem_events, 'async_save_events_to_filesystem', save_and_list
+    )
+    await filesystem_rechunking.async_rechunk_events(
+        chunk_target_bytes=10**9, verbose=False, **kwargs
+    )
+
+    assert len(listed) == 1
+    assert list(listed[0]['paths'].values()) == [(100, 129)]
+    event_dir = filesystem_events.get_events_event_dir(**kwargs)
+    assert os.listdir(event_dir) == ['100__to__129.csv']
+
+    # leftover originals of an interrupted rechunk are not listed as chunks
+    os.rename(
+        os.path.join(event_dir, '100__to__129.csv'),
+        os.path.join(event_dir, '100__to__129.csv__OLD'),
+    )
+    assert filesystem_events.list_events(**kwargs) is None
+    with pytest.raises(Exception):
+        await filesystem_rechunking.async_rechunk_events(
+            chunk_target_bytes=10**9, verbose=False, **kwargs
+        )
@@ -0,0 +1,122 @@
+import pytest
+
+from ctc import spec
+from ctc.evm.event_utils.event_backends import node_chunking
+
+
+def _create_fake_node(log_blocks, max_logs):
+    requested = []
+
+    async def fetch_logs(start_block, end_block):
+        requested.append((start_block, end_block))
+        logs = [
+            {'block_number': block}
+            for block in sorted(log_blocks)
+            if start_block <= block <= end_block
+        ]
+        if len(logs) > max_logs:
+            raise spec.RpcException(
+                'RPC ERROR: query returned more than 10000 results'
+            )
+        return logs
+
+    return fetch_logs, requested
+
+
+@pytest.mark.asyncio
+async def test_split_log_requests_bisects_dense_ranges():
+    log_blocks = list(range(1000, 1100)) * 3
+    fetch_logs, requested = _create_fake_node(log_blocks, max_logs=50)
+    logs = await node_chunking.async_split_log_requests(
+        fetch_logs,
+        start_block=0,
+        end_block=9999,
+        blocks_per_request=10000,
+    )
+    assert [log['block_number'] for log in logs] == sorted(log_blocks)
+    assert len(requested) > 1
+
+
+@pytest.mark.asyncio
+async def test_split_log_requests_grows_after_sparse_responses():
+    fetch_logs, requested = _create_fake_node([5, 50_000], max_logs=10)
+    logs = await node_chunking.async_split_log_requests(
+        fetch_logs,
+        start_block=0,
+        end_block=99_999,
+        blocks_per_request=100,
+        max_concurrent_requests=1,
+    )
+    assert [log['block_number'] for log in logs] == [5, 50_000]
+    assert len(requested) < 20
+    sizes = [end - start + 1 for start, end in requested]
+    assert sizes[1] > sizes[0]
+
+
+@pytest.mark.asyncio
+async def test_split_log_requests_raises_other_errors():
+    async def fetch_logs(start_block, end_block):
+        raise spec.RpcException('RPC ERROR: execution reverted')
+
+    with pytest.raises(spec.RpcException):
+        await node_chunking.async_split_log_requests(
+            fetch_logs, start_block=0, end_block=100
+        )
+
+
+def test_get_blocks_per_request():
+    default = node_chunking.default_blocks_per_request
+    assert node_chunking.get_blocks_per_request(None) == default
+    assert (
+        node_chunking.get_blocks_per_request(0)
+        == node_chunking.max_blocks_per_request
+    )
+    target = node_chunking.target_logs_per_request
+    assert node_chunking.get_blocks_per_request(target / 100) == 100
+    assert node_chunking.get_blocks_per_request(1e9) == 1
+
+
+@pytest.mark.parametrize(
+    'message,is_range_error',
+    [
+        ['query returned more than 10000 results', True],
+        ['Log response size exceeded', True],
+        ['block range is too wide', True],
+        ['rate limit exceeded', False],
+        ['daily request limit exceeded', False],
+        ['execution reverted', False],
+    ],
+)
+def test_is_log_range_error(message, is_range_error):
+    exception = spec.RpcException('RPC ERROR: ' + message)
+    assert node_chunking.is_log_range_error(exception) == is_range_error
+
+
+def test_log_densities_saved_once(tmp_path, monkeypatch):
+    import os
+
+    import ctc.config
+
+    monkeypatch.setattr(ctc.config, 'get_data_dir', lambda: str(tmp_path))
+    path = node_chunking.get_log_densities_path('mainnet')
+    for n_logs in [10, 30]:
+        node_chunking.record_log_density(
+            contract_address=None,
+            event_hash='0xabc',
+            n_logs=n_logs,
+            n_blocks=100,
+            network='mainnet',
+            save=False,
+        )
+    assert not os.path.exists(path)
+    density = node_chunking.get_log_density(
+        contract_address=None, event_hash='0xabc', network='mainnet'
+    )
+    assert density == 0.2
+
+    node_chunking.save_log_densities('mainnet')
+    assert os.path.exists(path)
+    density = node_chunking.get_log_density(
+        contract_address=None, event_hash='0xabc', network='mainnet'
+    )
+    assert density == 0.2
@@ -0,0 +1,192 @@
+import random
+
+import numpy as np
+import pytest
+
+from ctc import evm
+from ctc.rpc import rpc_format
+from ctc.rpc import rpc_spec
+
+
+event_abis = [
+    {
+        'name': 'Transfer',
+        'type': 'event',
+        'anonymous': False,
+        'inputs': [
+            {'name': 'from', 'type': 'address', 'indexed': True},
+            {'name': 'to', 'type': 'address', 'indexed': True},
+            {'name': 'amount', 'type': 'uint256', 'indexed': False},
+        ],
+    },
+    {
+        'name': 'Swap',
+        'type': 'event',
+        'anonymous': False,
+        'inputs': [
+            {'name': 'sender', 'type': 'address', 'indexed': True},
+            {'name': 'tick', 'type': 'int24', 'indexed': True},
+            {'name': 'amount0', 'type': 'int256', 'indexed': False},
+            {'name': 'liquidity', 'type': 'uint128', 'indexed': False},
+            {'name': 'fee', 'type': 'uint24', 'indexed': False},
+            {'name': 'flag', 'type': 'bool', 'indexed': False},
+            {'name': 'id', 'type': 'bytes32', 'indexed': False},
+        ],
+    },
+    {
+        'name': 'Named',
+        'type': 'event',
+        'anonymous': False,
+        'inputs': [
+            {'name': 'key', 'type': 'string', 'indexed': True},
+            {'name': 'name', 'type': 'string', 'indexed': False},
+            {'name': 'value', 'type': 'uint256', 'indexed': False},
+        ],
+    },
+]
+
+
+def _random_value(abi_type, rng):
+    if abi_type == 'address':
+        return '0x' + bytes(rng.getrandbits(8) for i in range(20)).hex()
+    elif abi_type == 'bool':
+        return rng.random() < 0.5
+    elif abi_type == 'bytes32':
+        return bytes(rng.getrandbits(8) for i in range(32))
+    elif abi_type == 'string':
+        return 'x' * rng.randrange(40)
+    elif abi_type.startswith('uint'):
+        return rng.getrandbits(int(abi_type[4:]))
+    elif abi_type.startswith('int'):
+        bits = int(abi_type[3:])
+        return rng.getrandbits(bits) - 2 ** (bits - 1)
+    else:
+        raise Exception('unknown type')
+
+
+def _create_raw_logs(event_abi, n_logs, seed=0):
+    rng = random.Random(seed)
+    event_hash = evm.get_event_hash(event_abi)
+    indexed_types = evm.get_event_indexed_types(event_abi)
+    unindexed_types = evm.get_event_unindexed_types(event_abi)
+    logs = []
+    for i in range(n_logs):
+        topics = [event_hash]
+        for indexed_type in indexed_types:
+            value = _random_value(indexed_type, rng)
+            if indexed_type == 'string':
+                topics.append(evm.keccak_text(value))
+            else:
+                encoded = evm.abi_encode(value, indexed_type)
+                topics.append('0x' + encoded.hex())
+        data = [_random_value(item, rng) for item in unindexed_types]
+        logs.append(
+            {
+                'address': '0x' + '12' * 20,
+                'topics': topics,
+                'data': '0x' + evm.abi_encode(data, unindexed_types).hex(),
+                'blockNumber': hex(15_000_000 + i // 3),
+                'transactionHash': '0x' + hex(i)[2:].rjust(64, '0'),
+                'transactionIndex': hex(i % 3),
+                'blockHash': '0x' + hex(i // 3)[2:].rjust(64, '0'),
+                'logIndex': hex(i),
+                'removed': False,
+            }
+        )
+    return logs
+
+
+def _digest(log):
+    decoded = rpc_format.decode_response(log, rpc_spec.rpc_log_quantities)
+    return rpc_format.keys_to_snake_case(decoded)
+
+
+@pytest.mark.parametrize('event_abi', event_abis)
+@pytest.mark.parametrize('digested', [False, True])
+def test_normalize_events_matches_normalize_event(event_abi, digested):
+    raw_logs = _create_raw_logs(event_abi, 20)
+    digested_logs = [_digest(log) for log in raw_logs]
+
+    columns = evm.normalize_events(
+        digested_logs if digested else raw_logs, event_abi
+    )
+    rows = [evm.normalize_event(log, event_abi) for log in digested_logs]
+
+    assert set(columns.keys()) == set(rows[0].keys())
+    for key, column in columns.items():
+        if isinstance(column, np.ndarray):
+            column = column.tolist()
+        assert column == [row[key] for row in rows], key
+
+
+def test_normalize_events_columns_are_arrays():
+    event_abi = event_abis[1]
+    columns = evm.normalize_events(_create_raw_logs(event_abi, 5), event_abi)
+    assert columns['block_number'].dtype == np.int64
+    assert columns['arg__tick'].dtype == np.int64
+    assert columns['arg__fee'].dtype == np.int64
+    assert columns['arg__flag'].dtype == bool
+
+
+@pytest.mark.asyncio
+async def test_get_events_from_node_in_processes(monkeypatch):
+    from ctc.evm.event_utils.event_backends import node_chunking
+    from ctc.evm.event_utils.event_backends import node_events
+
+    event_abi = event_abis[0]
+    raw_logs = _create_raw_logs(event_abi, 300)
+
+    async def fake_get_chunk(block_range, event_hash, **kwargs):
+        start_block, end_block = block_range
+        return [
+            log
+            for log in raw_logs
+            if start_block <= int(log['blockNumber'], 16) <= end_block
+        ]
+
+    monkeypatch.setattr(
+        node_events, '_async_get_chunk_of_events_from_node', fake_get_chunk
+    )
+    monkeypatch.setattr(node_chunking, 'get_log_density', lambda **kwargs: None)
+    monkeypatch.setattr(
+        node_chunking, 'record_log_density', lambda **kwargs: None
+    )
+    provider = {
+        'url': 'http://events.test',
+        'name': None,
+        'network': 1,
+        'protocol': 'http',
+        'session_kwargs': {},
+        'chunk_size': 100,
+        'convert_reverts_to_none': False,
+    }
+
+    results = []
+    for decode_processes in [None, 2]:
+        df = await node_events.async_get_events_from_node(
+            start_block=15_000_000,
+            end_block=15_000_099,
+            event_abi=event_abi,
+            blocks_per_chunk=7,
+            decode_processes=decode_processes,
+            verbose=False,
+            provider=provider,
+        )
+        results.append(df)
+
+    assert len(results[0]) == 300
+    assert results[0].equals(results[1])
+
+    # later downloads reuse the same pool of processes
+    pool = node_events.get_decode_pool(2)
+    await node_events.async_get_events_from_node(
+        start_block=15_000_000,
+        end_block=15_000_099,
+        event_abi=event_abi,
+        blocks_per_chunk=7,
+        decode_processes=2,
+        verbose=False,
+        provider=provider,
+    )
+    assert node_events.get_decode_pool(2) is pool
+    node_events.shutdown_decode_pools()
@@ -0,0 +1,63 @@
+import pytest
+
+from ctc import rpc
+
+
+batch_examples = [
+    (
+        'eth_get_block_by_number',
+        'block_numbers',
+        [0, 15, 'latest', 16_000_000],
+        {},
+    ),
+    (
+        'eth_call',
+        'to_addresses',
+        ['0x' + str(i) * 40 for i in range(3)],
+        {'call_data': '0x313ce567', 'block_number': 15_000_000},
+    ),
+    (
+        'eth_call',
+        'block_numbers',
+        [1, 'latest', 2],
+        {'to_address': '0x' + '1' * 40, 'call_data': '0x313ce567'},
+    ),
+    (
+        'eth_get_balance',
+        'addresses',
+        ['0x' + str(i) * 40 for i in range(3)],
+        {},
+    ),
+    (
+        'eth_get_transaction_receipt',
+        'transaction_hashes',
+        ['0x' + str(i) * 64 for i in range(3)],
+        {},
+    ),
+]
+
+
+@pytest.mark.parametrize('example', batch_examples)
+def test_batch_construct_matches_singular(example):
+    method, plural_name, values, other_kwargs = example
+    parameter = rpc.rpc_constructor_batch_inputs[method][plural_name]
+    constructor = rpc.get_constructor(method)
+
+    batch = rpc.batch_construct(method, **{plural_name: values}, **other_kwargs)
+    singular = [
+        constructor(**{parameter: value}, **other_kwargs) for value in values
+    ]
+    assert [subrequest['params'] for subrequest in batch] == [
+        subrequest['params'] for subrequest in singular
+    ]
+    assert {subrequest['method'] for subrequest in batch} == {
+        singular[0]['method']
+    }
+
+
+def test_request_ids_increase():
+    first = rpc.create('eth_blockNumber', [])
+    batch = rpc.create_batch('eth_blockNumber', [[]] * 5)
+    second = rpc.create('eth_blockNumber', [])
+    ids = [first['id']] + [request['id'] for request in batch] + [second['id']]
+    assert ids == sorted(set(ids))
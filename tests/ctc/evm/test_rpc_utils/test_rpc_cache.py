@@ -0,0 +1,141 @@
+import pytest
+
+from ctc import rpc
+from ctc.rpc import rpc_cache
+
+
+latest_block = 1000
+
+
+def _create_node(monkeypatch):
+    """stub node that records the methods of the requests it receives"""
+    from ctc.rpc.rpc_protocols import rpc_http_async
+
+    sent = []
+
+    def respond(subrequest):
+        sent.append(subrequest['method'])
+        if subrequest['method'] == 'eth_blockNumber':
+            result = hex(latest_block)
+        else:
+            block = subrequest['params'][0]
+            if block == 'latest':
+                block = hex(latest_block)
+            result = {'number': block}
+        return {'jsonrpc': '2.0', 'id': subrequest['id'], 'result': result}
+
+    async def fake_send_http(
+        request, provider, handle_subresponse=None, n_attempts=None
+    ):
+        if isinstance(request, dict):
+            return respond(request)
+        for subrequest in request:
+            handle_subresponse(respond(subrequest))
+
+    monkeypatch.setattr(rpc_http_async, 'async_send_http', fake_send_http)
+    return sent
+
+
+provider = {
+    'url': 'http://caching.test',
+    'name': None,
+    'network': 1,
+    'protocol': 'http',
+    'session_kwargs': {},
+    'chunk_size': None,
+    'convert_reverts_to_none': False,
+}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    rpc_cache._latest_blocks.clear()
+    yield rpc_cache.enable_rpc_cache(path=str(tmp_path / 'rpc_cache.db'))
+    rpc_cache.disable_rpc_cache()
+
+
+@pytest.mark.asyncio
+async def test_rpc_cache_batch(cache, monkeypatch):
+    sent = _create_node(monkeypatch)
+    blocks = [1, 2, latest_block - 10, 'latest']
+
+    async def get_blocks():
+        request = rpc.batch_construct(
+            'eth_get_block_by_number', block_numbers=blocks
+        )
+        return await rpc.async_send(request, provider=provider)
+
+    first = await get_blocks()
+    assert sent.count('eth_getBlockByNumber') == 4
+    sent.clear()
+
+    # only blocks with enough confirmations are cached
+    second = await get_blocks()
+    assert first == second
+    assert sent.count('eth_getBlockByNumber') == 2
+
+
+@pytest.mark.asyncio
+async def test_rpc_cache_singular(cache, monkeypatch):
+    sent = _create_node(monkeypatch)
+    for i in range(3):
+        request = rpc.construct_eth_get_block_by_number(block_number=5)
+        result = await rpc.async_send(request, provider=provider)
+        assert result == {'number': '0x5'}
+    assert sent.count('eth_getBlockByNumber') == 1
+
+
+def test_rpc_cache_keys():
+    call = {'to': '0x' + 'AB' * 20, 'data': '0x313ce567', 'from': None}
+    request = rpc.create('eth_call', [call, '0xa'])
+    equivalent = rpc.create(
+        'eth_call', [{'data': '0x313ce567', 'to': '0x' + 'ab' * 20}, '0xA']
+    )
+    other_block = rpc.create('eth_call', [call, '0xb'])
+    key = rpc_cache.get_rpc_cache_key(request, 1)
+    assert key == rpc_cache.get_rpc_cache_key(equivalent, 1)
+    assert key != rpc_cache.get_rpc_cache_key(other_block, 1)
+    assert key != rpc_cache.get_rpc_cache_key(request, 10)
+
+    assert rpc_cache.is_cacheable_request(request)
+    for block in ['latest', 'pending', 'safe']:
+        assert not rpc_cache.is_cacheable_request(
+            rpc.create('eth_call', [call, block])
+        )
+
+
+def test_rpc_cache_eviction(tmp_path):
+    cache = rpc_cache.RpcCache(path=str(tmp_path / 'cache.db'), max_bytes=2000)
+    try:
+        for i in range(50):
+            cache.put_results({bytes([i]) * 32: 'x' * 100})
+        assert cache.n_bytes <= 2000
+        assert cache.n_bytes == cache._query_n_bytes()
+        assert cache.get_results([bytes([49]) * 32]) == {
+            bytes([49]) * 32: 'x' * 100
+        }
+        assert cache.get_results([bytes([0]) * 32]) == {}
+    finally:
+        cache.close()
+
+
+def test_rpc_cache_buffers_hit_recency(tmp_path):
+    cache = rpc_cache.RpcCache(
+        path=str(tmp_path / 'cache.db'), max_bytes=10**6
+    )
+    try:
+        keys = [bytes([i]) * 32 for i in range(4)]
+        for key in keys[:3]:
+            cache.put_results({key: 'x' * 100})
+
+        # hits are buffered instead of written in their own transaction
+        cache.get_results([keys[0]])
+        assert list(cache.accessed.keys()) == [keys[0]]
+
+        # buffered hits are written with the next write, before eviction
+        cache.max_bytes = 300
+        cache.put_results({keys[3]: 'x' * 100})
+        assert cache.accessed == {}
+        assert set(cache.get_results(keys).keys()) == {keys[0], keys[3]}
+    finally:
+        cache.close()
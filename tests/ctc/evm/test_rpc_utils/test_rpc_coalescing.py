@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from ctc import rpc
+from ctc.rpc import rpc_coalescing
+
+
+provider = {
+    'url': 'http://coalescing.test',
+    'name': None,
+    'network': 1,
+    'protocol': 'http',
+    'session_kwargs': {},
+    'chunk_size': None,
+    'convert_reverts_to_none': False,
+}
+
+
+def _create_node(monkeypatch):
+    from ctc.rpc.rpc_protocols import rpc_http_async
+
+    sent = []
+
+    async def fake_send_http(
+        request, provider, handle_subresponse=None, n_attempts=None
+    ):
+        sent.append(request['method'])
+        await asyncio.sleep(0.01)
+        if request['method'] == 'eth_getBlockByNumber':
+            result = {'number': request['params'][0]}
+        else:
+            result = '0x10'
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+
+    monkeypatch.setattr(rpc_http_async, 'async_send_http', fake_send_http)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_coalesce_identical_requests(monkeypatch):
+    sent = _create_node(monkeypatch)
+    rpc_coalescing.reset_coalescing_stats()
+
+    results = await asyncio.gather(
+        *[
+            rpc.async_send(rpc.create('eth_blockNumber', []), provider=provider)
+            for i in range(10)
+        ],
+        rpc.async_send(rpc.create('eth_chainId', []), provider=provider),
+    )
+    assert results == ['0x10'] * 11
+    assert sent == ['eth_blockNumber', 'eth_chainId']
+    assert rpc.get_coalescing_stats()['rpc'] == {'hits': 9, 'misses': 2}
+
+    # requests that are no longer in flight are sent again
+    await rpc.async_send(rpc.create('eth_blockNumber', []), provider=provider)
+    assert sent.count('eth_blockNumber') == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesced_results_are_independent(monkeypatch):
+    sent = _create_node(monkeypatch)
+    request = rpc.construct_eth_get_block_by_number(block_number=1)
+    results = await asyncio.gather(
+        *[rpc.async_send(request, provider=provider) for i in range(3)]
+    )
+    assert len(sent) == 1
+    assert results == [{'number': '0x1'}] * 3
+    results[0]['number'] = None
+    assert results[1] == results[2] == {'number': '0x1'}
+
+
+@pytest.mark.asyncio
+async def test_coalescing_cancellation_and_errors():
+    async def compute(value):
+        await asyncio.sleep(0.01)
+        if value is None:
+            raise ValueError('no value')
+        return value
+
+    first = asyncio.ensure_future(
+        rpc.async_coalesce('key', lambda: compute(1), namespace='test')
+    )
+    second = asyncio.ensure_future(
+        rpc.async_coalesce('key', lambda: compute(2), namespace='test')
+    )
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == 1
+
+    with pytest.raises(ValueError):
+        await asyncio.gather(
+            *[
+                rpc.async_coalesce(
+                    'error', lambda: compute(None), namespace='test'
+                )
+                for i in range(2)
+            ]
+        )
@@ -0,0 +1,153 @@
+import pytest
+
+from ctc.rpc.rpc_protocols import rpc_http_async
+
+
+async def _create_server(statuses):
+    from aiohttp import web
+    from aiohttp import test_utils
+
+    remaining = list(statuses)
+
+    async def handle(request):
+        payload = await request.json()
+        status = remaining.pop(0) if len(remaining) > 0 else 200
+        if status == 429:
+            return web.Response(status=429, headers={'Retry-After': '0'})
+        elif status != 200:
+            return web.Response(status=status, text='error')
+        return web.json_response(
+            {'jsonrpc': '2.0', 'id': payload['id'], 'result': '0x1'}
+        )
+
+    app = web.Application()
+    app.router.add_post('/', handle)
+    server = test_utils.TestServer(app)
+    await server.start_server()
+    return server
+
+
+def _create_provider(server):
+    return {
+        'url': str(server.make_url('/')),
+        'name': None,
+        'network': 1,
+        'protocol': 'http',
+        'session_kwargs': {},
+        'chunk_size': None,
+        'convert_reverts_to_none': False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_http_retries_rate_limited_and_server_errors():
+    server = await _create_server([429, 502])
+    provider = _create_provider(server)
+    request = {'jsonrpc': '2.0', 'method': 'eth_chainId', 'params': [], 'id': 5}
+    try:
+        response = await rpc_http_async.async_send_http(request, provider)
+        assert response['result'] == '0x1'
+        metrics = rpc_http_async.get_http_metrics(provider)
+        assert metrics['rate_limited'] == 1
+        assert metrics['server_error'] == 1
+        assert metrics['retry'] == 2
+        assert metrics['success'] == 1
+    finally:
+        await rpc_http_async.async_close_http_session(provider)
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_http_does_not_retry_client_errors():
+    server = await _create_server([403])
+    provider = _create_provider(server)
+    request = {'jsonrpc': '2.0', 'method': 'eth_chainId', 'params': [], 'id': 5}
+    try:
+        with pytest.raises(Exception, match='status_code = 403'):
+            await rpc_http_async.async_send_http(request, provider)
+        metrics = rpc_http_async.get_http_metrics(provider)
+        assert metrics['client_error'] == 1
+        assert 'retry' not in metrics
+    finally:
+        await rpc_http_async.async_close_http_session(provider)
+        await server.close()
+
+
+@pytest.mark.parametrize(
+    'test',
+    [
+        [None, None],
+        ['3', 3.0],
+        ['-1', 0.0],
+        ['Wed, 21 Oct 2015 07:28:00 GMT', 0.0],
+        ['soon', None],
+    ],
+)
+def test_parse_retry_after(test):
+    value, target = test
+    assert rpc_http_async.parse_retry_after(value) == target
+
+
+def test_backoff_delay_is_capped():
+    policy = {'n_attempts': 10, 'base_delay': 1.0, 'max_delay': 4.0}
+    for attempt in range(10):
+        delay = rpc_http_async.get_backoff_delay(attempt, policy=policy)
+        assert 0 < delay <= 4.0
+
+
+@pytest.mark.asyncio
+async def test_http_caps_total_attempts(monkeypatch):
+    monkeypatch.setattr(
+        rpc_http_async, 'get_backoff_delay', lambda attempt, policy: 0.0
+    )
+    server = await _create_server([502, 429, 502, 429, 502])
+    provider = _create_provider(server)
+    request = {'jsonrpc': '2.0', 'method': 'eth_chainId', 'params': [], 'id': 5}
+    try:
+        with pytest.raises(Exception, match='after 4 attempts'):
+            await rpc_http_async.async_send_http(
+                request, provider, n_attempts=4
+            )
+        metrics = rpc_http_async.get_http_metrics(provider)
+        assert metrics['server_error'] == 2
+        assert metrics['rate_limited'] == 2
+    finally:
+        await rpc_http_async.async_close_http_session(provider)
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_http_retries_truncated_responses():
+    from aiohttp import web
+    from aiohttp import test_utils
+
+    n_requests = []
+
+    async def handle(request):
+        payload = await request.json()
+        n_requests.append(1)
+        if len(n_requests) == 1:
+            # promise more bytes than are sent
+            response = web.StreamResponse(headers={'Content-Length': '100'})
+            await response.prepare(request)
+            await response.write(b'{"jsonrpc": "2.0"')
+            request.transport.close()
+            return response
+        return web.json_response(
+            {'jsonrpc': '2.0', 'id': payload['id'], 'result': '0x1'}
+        )
+
+    app = web.Application()
+    app.router.add_post('/', handle)
+    server = test_utils.TestServer(app)
+    await server.start_server()
+    provider = _create_provider(server)
+    request = {'jsonrpc': '2.0', 'method': 'eth_chainId', 'params': [], 'id': 5}
+    try:
+        response = await rpc_http_async.async_send_http(request, provider)
+        assert response['result'] == '0x1'
+        metrics = rpc_http_async.get_http_metrics(provider)
+        assert metrics['connection_error'] == 1
+    finally:
+        await rpc_http_async.async_close_http_session(provider)
+        await server.close()
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import sys
+
+import pytest
+
+from ctc import rpc
+from ctc.rpc.rpc_protocols import rpc_ipc_async
+
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == 'win32', reason='unix sockets unavailable'
+)
+
+
+async def _create_server(path):
+    """stub node answering requests of each connection concurrently"""
+
+    state = {'n_connections': 0}
+
+    async def respond(request, writer):
+        await asyncio.sleep(request['params'][0] / 1000)
+        response = {
+            'jsonrpc': '2.0',
+            'id': request['id'],
+            'result': request['params'],
+        }
+        data = json.dumps(response).encode()
+
+        # split responses across writes to exercise stream decoding
+        middle = len(data) // 2
+        writer.write(data[:middle])
+        await writer.drain()
+        writer.write(data[middle:] + b'\n')
+        await writer.drain()
+
+    async def handle(reader, writer):
+        state['n_connections'] += 1
+        decoder = json.JSONDecoder()
+        buffer = ''
+        tasks = []
+        while True:
+            chunk = await reader.read(1024)
+            if chunk == b'':
+                break
+            buffer += chunk.decode()
+            while buffer.strip() != '':
+                try:
+                    data, end = decoder.raw_decode(buffer.lstrip())
+                except ValueError:
+                    break
+                buffer = buffer.lstrip()[end:]
+                if isinstance(data, list):
+                    response = [
+                        {'jsonrpc': '2.0', 'id': item['id'], 'result': 0}
+                        for item in data
+                    ]
+                    writer.write(json.dumps(response).encode())
+                else:
+                    tasks.append(asyncio.ensure_future(respond(data, writer)))
+        writer.close()
+
+    server = await asyncio.start_unix_server(handle, path=path)
+    return server, state
+
+
+def _create_provider(path):
+    return {
+        'url': 'ipc://' + path,
+        'name': None,
+        'network': 1,
+        'protocol': 'ipc',
+        'session_kwargs': {},
+        'chunk_size': None,
+        'convert_reverts_to_none': False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_ipc_pipelines_requests(tmp_path):
+    path = str(tmp_path / 'node.ipc')
+    server, state = await _create_server(path)
+    provider = _create_provider(path)
+    try:
+        requests = [rpc.create('test', [delay]) for delay in [30, 20, 10, 0]]
+        responses = await asyncio.gather(
+            *[
+                rpc_ipc_async.async_send_ipc(request, provider)
+                for request in requests
+            ]
+        )
+        assert [response['result'] for response in responses] == [
+            [30],
+            [20],
+            [10],
+            [0],
+        ]
+        assert [response['id'] for response in responses] == [
+            request['id'] for request in requests
+        ]
+        assert 1 <= state['n_connections'] <= rpc_ipc_async.max_ipc_connections
+
+        # batch request through async_send
+        batch = [rpc.create('test', [i]) for i in range(5)]
+        result = await rpc.async_send(batch, provider=provider)
+        assert result == [0] * 5
+    finally:
+        await rpc_ipc_async.async_close_ipc_connections()
+        server.close()
+        await server.wait_closed()
+
+
+def test_json_stream_splitter():
+    messages = [
+        {'id': 1, 'result': ['0x1', {'a': 'b'}]},
+        {'id': 2, 'result': 'brackets ] } [ { and "quotes" and \\ slashes'},
+        [{'id': 3, 'result': 'café ☃'}, {'id': 4, 'result': None}],
+    ]
+    data = b'\n'.join(
+        json.dumps(message, ensure_ascii=False).encode() for message in messages
+    )
+
+    # every split point, including inside of strings and escapes
+    for size in [1, 2, 3, 7, len(data)]:
+        splitter = rpc_ipc_async.JsonStreamSplitter()
+        decoded = []
+        for start in range(0, len(data), size):
+            for message in splitter.feed(data[start : start + size]):
+                decoded.append(json.loads(message))
+        assert decoded == messages
+        assert len(splitter.buffer) == 0
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from ctc.rpc.rpc_protocols import rpc_json_codec
+
+
+codec_names = rpc_json_codec.get_available_json_codecs()
+
+values = [
+    {'jsonrpc': '2.0', 'id': 1, 'method': 'eth_blockNumber', 'params': []},
+    [{'jsonrpc': '2.0', 'id': i, 'result': 'é' * i} for i in range(10)],
+    {'id': 2, 'params': [2**100, -1, 1.5, None, True]},
+]
+
+
+@pytest.mark.parametrize('name', codec_names)
+@pytest.mark.parametrize('value', values)
+def test_json_codec_roundtrip(name, value):
+    codec = rpc_json_codec.create_json_codec(name)
+    encoded = codec.encode(value)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == value
+    assert codec.decode(encoded) == codec.decode(encoded.decode())
+
+
+def test_default_json_codec():
+    rpc_json_codec.set_json_codec('stdlib')
+    try:
+        assert rpc_json_codec.get_json_codec().name == 'stdlib'
+    finally:
+        rpc_json_codec.set_json_codec(None)
+    assert rpc_json_codec.get_json_codec().name == codec_names[0]
+
+    with pytest.raises(Exception):
+        rpc_json_codec.set_json_codec('not_a_codec')
+
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from ctc import rpc
+from ctc.rpc.rpc_protocols import rpc_json_stream
+
+
+class _ChunkedStream:
+    def __init__(self, data, chunk_size):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    async def read(self, n=-1):
+        chunk = self.data[: self.chunk_size]
+        self.data = self.data[self.chunk_size :]
+        return chunk
+
+
+async def _decode(data, chunk_size):
+    stream = _ChunkedStream(data, chunk_size)
+    return [item async for item in rpc_json_stream.iterate_json_array(stream)]
+
+
+values = [
+    [],
+    [{'id': 1, 'result': '0x1'}],
+    [{'id': i, 'result': {'logs': ['é' * i, '],[}{'] * i}} for i in range(30)],
+]
+
+
+@pytest.mark.parametrize('value', values)
+@pytest.mark.parametrize('chunk_size', [1, 7, 2**16])
+@pytest.mark.asyncio
+async def test_iterate_json_array(value, chunk_size):
+    data = json.dumps(value, indent=1, ensure_ascii=False).encode()
+    assert await _decode(data, chunk_size) == value
+
+
+@pytest.mark.asyncio
+async def test_iterate_json_array_of_object():
+    value = {'jsonrpc': '2.0', 'id': None, 'error': {'message': 'bad batch'}}
+    data = json.dumps(value).encode()
+    assert await _decode(data, 5) == [value]
+
+
+@pytest.mark.asyncio
+async def test_iterate_incomplete_json_array():
+    with pytest.raises(ValueError):
+        await _decode(b'[{"id": 1}, {"id"', 4)
+
+
+@pytest.mark.asyncio
+async def test_send_digests_each_subresult(monkeypatch):
+    from ctc.rpc.rpc_protocols import rpc_http_async
+
+    async def fake_send_http(
+        request, provider, handle_subresponse=None, n_attempts=None
+    ):
+        response = [
+            {'jsonrpc': '2.0', 'id': subrequest['id'], 'result': hex(i)}
+            for i, subrequest in reversed(list(enumerate(request)))
+        ]
+        stream = _ChunkedStream(json.dumps(response).encode(), 10)
+        async for subresponse in rpc_json_stream.iterate_json_array(stream):
+            handle_subresponse(subresponse)
+
+    monkeypatch.setattr(rpc_http_async, 'async_send_http', fake_send_http)
+    provider = {
+        'url': 'http://streaming.test',
+        'name': None,
+        'network': 1,
+        'protocol': 'http',
+        'session_kwargs': {},
+        'chunk_size': 3,
+        'convert_reverts_to_none': False,
+    }
+    request = [rpc.create('eth_blockNumber', []) for i in range(7)]
+    result = await rpc.async_send(
+        request,
+        provider=provider,
+        digest_subresult=lambda subresult, subrequest: int(subresult, 16),
+    )
+    assert result == [0, 1, 2, 0, 1, 2, 0]
+
+
+@pytest.mark.asyncio
+async def test_send_raises_on_missing_subresponse(monkeypatch):
+    from ctc.rpc.rpc_protocols import rpc_http_async
+
+    async def fake_send_http(
+        request, provider, handle_subresponse=None, n_attempts=None
+    ):
+        # the node drops the last subresponse of the batch
+        for subrequest in request[:-1]:
+            handle_subresponse(
+                {'jsonrpc': '2.0', 'id': subrequest['id'], 'result': '0x1'}
+            )
+
+    monkeypatch.setattr(rpc_http_async, 'async_send_http', fake_send_http)
+    provider = {
+        'url': 'http://streaming.test',
+        'name': None,
+        'network': 1,
+        'protocol': 'http',
+        'session_kwargs': {},
+        'chunk_size': None,
+        'convert_reverts_to_none': False,
+    }
+    request = [rpc.create('eth_blockNumber', []) for i in range(3)]
+    with pytest.raises(Exception, match='no response received'):
+        await rpc.async_send(request, provider=provider)
@@ -0,0 +1,146 @@
+import pytest
+
+from ctc import evm
+from ctc import rpc
+from ctc import spec
+from ctc.rpc.rpc_batch import rpc_batch_multicall
+
+
+function_abi = {
+    'inputs': [{'name': 'owner', 'type': 'address'}],
+    'name': 'balanceOf',
+    'outputs': [{'name': '', 'type': 'uint256'}],
+    'stateMutability': 'view',
+    'type': 'function',
+}
+
+token = '0x' + '11' * 20
+reverting_token = '0x' + '22' * 20
+owners = ['0x' + str(i) * 40 for i in range(1, 10)]
+
+
+def _call(target, call_data):
+    """stub contract returning the last byte of the owner as balance"""
+    if target == reverting_token:
+        return False, b''
+    balance = evm.binary_convert(call_data, 'binary')[-1]
+    return True, evm.abi_encode((balance,), '(uint256)')
+
+
+def _create_provider(convert_reverts_to_none):
+    return {
+        'url': 'http://multicall.test',
+        'name': None,
+        'network': 1,
+        'protocol': 'http',
+        'session_kwargs': {},
+        'chunk_size': None,
+        'convert_reverts_to_none': convert_reverts_to_none,
+    }
+
+
+def _create_node(monkeypatch):
+    from ctc.rpc.rpc_protocols import rpc_http_async
+
+    sent = []
+
+    def respond(subrequest):
+        call_object, block = subrequest['params']
+        sent.append(call_object['to'])
+        if call_object['to'] == rpc_batch_multicall.multicall3_address:
+            decoded = evm.decode_call_data(
+                call_object['data'],
+                rpc_batch_multicall.aggregate3_function_abi,
+            )
+            results = [
+                _call(target, call_data)
+                for target, allow_failure, call_data in decoded['parameters'][0]
+            ]
+            output = evm.abi_encode((results,), '((bool,bytes)[])')
+            result = evm.binary_convert(output, 'prefix_hex')
+        else:
+            success, output = _call(call_object['to'], call_object['data'])
+            if not success:
+                return {
+                    'jsonrpc': '2.0',
+                    'id': subrequest['id'],
+                    'error': {'code': 3, 'message': 'execution reverted'},
+                }
+            result = evm.binary_convert(output, 'prefix_hex')
+        return {'jsonrpc': '2.0', 'id': subrequest['id'], 'result': result}
+
+    async def fake_send_http(
+        request, provider, handle_subresponse=None, n_attempts=None
+    ):
+        if isinstance(request, dict):
+            return respond(request)
+        for subrequest in request:
+            handle_subresponse(respond(subrequest))
+
+    monkeypatch.setattr(rpc_http_async, 'async_send_http', fake_send_http)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_batch_eth_call_multicall(monkeypatch):
+    sent = _create_node(monkeypatch)
+    rpc_batch_multicall.set_multicall_budget(max_calls=5)
+    try:
+        balances = await rpc.async_batch_eth_call(
+            to_address=token,
+            function_abi=function_abi,
+            function_parameter_list=[[owner] for owner in owners],
+            block_number=15_000_000,
+            provider=_create_provider(False),
+            multicall=True,
+        )
+    finally:
+        rpc_batch_multicall.set_multicall_budget(max_calls=500)
+    assert balances == [int(owner[-2:], 16) for owner in owners]
+
+    # 9 calls with 5 calls per multicall
+    assert sent == [rpc_batch_multicall.multicall3_address] * 2
+
+
+@pytest.mark.asyncio
+async def test_batch_eth_call_multicall_reverts(monkeypatch):
+    sent = _create_node(monkeypatch)
+    kwargs = dict(
+        to_addresses=[token, reverting_token, token],
+        function_abi=function_abi,
+        function_parameters=[owners[0]],
+        block_number=15_000_000,
+        multicall=True,
+    )
+
+    balances = await rpc.async_batch_eth_call(
+        provider=_create_provider(True), **kwargs
+    )
+    assert balances == [0x11, None, 0x11]
+    assert len(sent) == 1
+
+    with pytest.raises(spec.RpcException):
+        await rpc.async_batch_eth_call(
+            provider=_create_provider(False), **kwargs
+        )
+
+
+def test_pack_multicalls():
+    call = {'to': token, 'data': '0x313ce567'}
+    request = [
+        rpc.create('eth_call', [call, '0x1000000']),
+        rpc.create('eth_call', [call, '0x1']),
+        rpc.create('eth_call', [dict(call, **{'from': token}), '0x1000000']),
+        rpc.create('eth_call', [call, '0x1000001']),
+        rpc.create('eth_call', [call, '0x1000000']),
+        rpc.create('eth_call', [call, 'pending']),
+    ]
+    multicalls, direct = rpc_batch_multicall.pack_multicalls(request, 1)
+    assert multicalls == [[0, 4]]
+    assert direct == [1, 2, 3, 5]
+
+    # networks given by name are resolved to chain ids
+    assert rpc_batch_multicall.pack_multicalls(request, 'mainnet') == (
+        multicalls,
+        direct,
+    )
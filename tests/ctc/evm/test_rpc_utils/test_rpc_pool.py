@@ -0,0 +1,106 @@
+import pytest
+
+from ctc import rpc
+from ctc.rpc.rpc_protocols import rpc_http_async
+
+
+def _create_provider(name):
+    return {
+        'url': 'http://' + name + '.test',
+        'name': name,
+        'network': 1,
+        'protocol': 'http',
+        'session_kwargs': {},
+        'chunk_size': None,
+        'convert_reverts_to_none': False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_pool_fails_over_and_ejects_failing_member(monkeypatch):
+    sent_to = []
+
+    async def fake_send_http(
+        request, provider, handle_subresponse=None, n_attempts=None
+    ):
+        sent_to.append(provider['name'])
+        assert n_attempts == rpc.rpc_pool.member_n_attempts
+        if provider['name'] == 'bad':
+            raise Exception('http rpc request failed')
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': '0x1'}
+
+    monkeypatch.setattr(rpc_http_async, 'async_send_http', fake_send_http)
+
+    members = [_create_provider('bad'), _create_provider('good')]
+    pool = rpc.ProviderPool(name='test_pool', members=members)
+    pool_provider = dict(members[0], name='test_pool')
+    request = rpc.create('eth_chainId', [])
+    for i in range(10):
+        response = await pool.async_send_raw(request, provider=pool_provider)
+        assert response['result'] == '0x1'
+
+    bad, good = pool.members
+    assert good.n_requests == 10
+    assert bad.n_failures == sent_to.count('bad') >= 1
+
+
+def test_pool_ejects_failing_member():
+    members = [_create_provider('bad'), _create_provider('good')]
+    pool = rpc.ProviderPool(name='test_pool', members=members)
+    bad, good = pool.members
+    for i in range(rpc.rpc_pool.max_consecutive_failures):
+        bad.record_failure()
+    assert bad.ejected_until > 0
+    assert all(pool.select_member() is good for i in range(10))
+    assert pool.select_member(exclude=[good]) is bad
+
+
+@pytest.mark.asyncio
+async def test_pool_raises_when_all_members_fail(monkeypatch):
+    async def fake_send_http(
+        request, provider, handle_subresponse=None, n_attempts=None
+    ):
+        raise Exception('http rpc request failed')
+
+    monkeypatch.setattr(rpc_http_async, 'async_send_http', fake_send_http)
+
+    members = [_create_provider('bad1'), _create_provider('bad2')]
+    pool = rpc.ProviderPool(name='test_pool', members=members)
+    request = rpc.create('eth_chainId', [])
+    with pytest.raises(Exception, match='all providers of provider pool'):
+        await pool.async_send_raw(request, provider=members[0])
+
+
+def test_pool_prefers_faster_members():
+    members = [_create_provider('slow'), _create_provider('fast')]
+    pool = rpc.ProviderPool(name='test_pool', members=members)
+    slow, fast = pool.members
+    slow.record_success(1.0)
+    fast.record_success(0.01)
+    assert all(pool.select_member() is fast for i in range(10))
+
+
+def test_pool_provider_has_own_key(monkeypatch):
+    from ctc.config import config_values
+
+    members = [_create_provider('first'), _create_provider('second')]
+    monkeypatch.setattr(
+        config_values, 'get_provider_pool_members', lambda pool_name: members
+    )
+    pool_provider = config_values.get_pool_provider('test_pool')
+    assert pool_provider['name'] == 'test_pool'
+    assert pool_provider['network'] == members[0]['network']
+    assert rpc.get_provider_key(pool_provider) != rpc.get_provider_key(
+        members[0]
+    )
+
+
+def test_get_provider_pool_skips_config_for_other_providers(monkeypatch):
+    import ctc.config
+
+    def get_provider_pools():
+        raise Exception('config should not be consulted')
+
+    monkeypatch.setattr(ctc.config, 'get_provider_pools', get_provider_pools)
+    provider = _create_provider('named')
+    assert rpc.rpc_pool.get_provider_pool(provider) is None
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from ctc import rpc
+
+
+def _create_provider(url):
+    return {
+        'url': url,
+        'name': None,
+        'network': 1,
+        'protocol': 'http',
+        'session_kwargs': {},
+        'chunk_size': None,
+        'convert_reverts_to_none': False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_scheduler_bounds_in_flight_requests():
+    provider = _create_provider('http://scheduler-in-flight.test')
+    rpc.set_scheduler_limits(provider, max_in_flight=3)
+    scheduler = rpc.get_scheduler(provider)
+
+    max_observed = 0
+
+    async def send():
+        nonlocal max_observed
+        await scheduler.async_acquire()
+        try:
+            max_observed = max(max_observed, scheduler.n_in_flight)
+            await asyncio.sleep(0.001)
+        finally:
+            scheduler.release()
+
+    await asyncio.gather(*[send() for i in range(20)])
+    assert max_observed == 3
+    assert scheduler.n_in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_compute_units_per_second():
+    provider = _create_provider('http://scheduler-compute-units.test')
+    rpc.set_scheduler_limits(provider, compute_units_per_second=1000)
+    scheduler = rpc.get_scheduler(provider)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for i in range(5):
+        await scheduler.async_acquire(compute_units=10)
+        scheduler.release()
+    assert loop.time() - start >= 0.035
+
+
+def test_get_request_compute_units():
+    request = rpc.construct_eth_block_number()
+    assert rpc.get_request_compute_units(request) == 10
+    assert rpc.get_request_compute_units([request, request]) == 20
@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+import pytest
+
+from ctc import rpc
+from ctc.rpc.rpc_protocols import rpc_websocket_async
+
+
+async def _create_server(*, drop_first_connection=False, n_null_id_errors=0):
+    from aiohttp import web
+    from aiohttp import test_utils
+
+    state = {'n_connections': 0, 'n_null_id_errors': n_null_id_errors}
+
+    def respond(request):
+        return {
+            'jsonrpc': '2.0',
+            'id': request['id'],
+            'result': request['params'],
+        }
+
+    async def handle(http_request):
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(http_request)
+        state['n_connections'] += 1
+        if drop_first_connection and state['n_connections'] == 1:
+            await websocket.receive()
+            await websocket.close()
+            return websocket
+
+        async for message in websocket:
+            data = json.loads(message.data)
+            if isinstance(data, list):
+                # respond to batch elements in reverse order
+                response = [respond(request) for request in reversed(data)]
+            else:
+                await asyncio.sleep(data['params'][0] / 1000)
+                response = respond(data)
+                if state['n_null_id_errors'] > 0:
+                    state['n_null_id_errors'] -= 1
+                    response = {
+                        'jsonrpc': '2.0',
+                        'id': None,
+                        'error': {'code': -32600, 'message': 'bad request'},
+                    }
+            await websocket.send_str(json.dumps(response))
+        return websocket
+
+    app = web.Application()
+    app.router.add_get('/', handle)
+    server = test_utils.TestServer(app)
+    await server.start_server()
+    return server, state
+
+
+def _create_provider(server):
+    return {
+        'url': str(server.make_url('/')).replace('http', 'ws'),
+        'name': None,
+        'network': 1,
+        'protocol': 'wss',
+        'session_kwargs': {},
+        'chunk_size': None,
+        'convert_reverts_to_none': False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_websocket_multiplexes_concurrent_requests():
+    server, state = await _create_server()
+    provider = _create_provider(server)
+    try:
+        # responses arrive in a different order than requests are sent
+        requests = [
+            {'jsonrpc': '2.0', 'method': 'test', 'params': [delay], 'id': 7}
+            for delay in [30, 20, 10, 0]
+        ]
+        responses = await asyncio.gather(
+            *[
+                rpc_websocket_async.async_send_websocket(request, provider)
+                for request in requests
+            ]
+        )
+        assert [response['result'] for response in responses] == [
+            [30],
+            [20],
+            [10],
+            [0],
+        ]
+        assert all(response['id'] == 7 for response in responses)
+        assert state['n_connections'] == 1
+
+        # batch
+        batch = [rpc.create('test', [i]) for i in range(5)]
+        response = await rpc_websocket_async.async_send_websocket(
+            batch, provider
+        )
+        assert [item['id'] for item in response] == [
+            item['id'] for item in batch
+        ]
+        assert state['n_connections'] == 1
+    finally:
+        await rpc_websocket_async.async_close_websocket_connections()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_websocket_reconnects():
+    server, state = await _create_server(drop_first_connection=True)
+    provider = _create_provider(server)
+    try:
+        request = rpc.create('test', [0])
+        response = await rpc_websocket_async.async_send_websocket(
+            request, provider
+        )
+        assert response['result'] == [0]
+        assert state['n_connections'] == 2
+    finally:
+        await rpc_websocket_async.async_close_websocket_connections()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_websocket_attributes_null_id_errors():
+    server, state = await _create_server(n_null_id_errors=1)
+    provider = _create_provider(server)
+    try:
+        # an error without id belongs to the only pending request
+        request = rpc.create('test', [0])
+        response = await rpc_websocket_async.async_send_websocket(
+            request, provider
+        )
+        assert response['id'] == request['id']
+        assert response['error']['message'] == 'bad request'
+
+        # an error without id among several pending requests is retried
+        state['n_null_id_errors'] = 1
+        requests = [rpc.create('test', [delay]) for delay in [30, 0]]
+        responses = await asyncio.gather(
+            *[
+                rpc_websocket_async.async_send_websocket(request, provider)
+                for request in requests
+            ]
+        )
+        assert [response['result'] for response in responses] == [[30], [0]]
+    finally:
+        await rpc_websocket_async.async_close_websocket_connections()
+        await server.close()